@@ -1,15 +1,20 @@
 # work_scheduler.py
+import time
+_IMPORT_START = time.perf_counter()  # zero point of the --startup-profile breakdown
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog, filedialog, colorchooser
+import atexit
+import bisect
+import gzip
 import json
 import os
+import sqlite3
 import calendar
-import time
+import copy
+import itertools
+import random
+from collections import OrderedDict
 from datetime import datetime, timedelta, date
-from tkcalendar import DateEntry
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-import requests
 import threading
 import zipfile
 import tempfile
@@ -21,93 +26,2844 @@ import sys
 APP_VERSION = "1.0.5"  # Current version of the application
 GITHUB_REPO = "WAM2021/Employee_Scheduler"  # Your actual GitHub repo
 UPDATE_CHECK_URL = f"https://api.github.com/repos/{GITHUB_REPO}/releases/latest"
+UPDATE_CHECK_DELAY_MS = 3000  # the startup update check waits this long after launch
 
 DATA_FILE = "employees.json"
+GZIP_DATA_FILE = DATA_FILE + ".gz"  # snapshot location in the "gzip" storage format
+STORAGE_FORMATS = ("pretty", "compact", "gzip")
+JOURNAL_FILE = "employees.journal"  # append-only change log used by the "journal" storage mode
+JOURNAL_COMPACT_BYTES = 512 * 1024  # fold the journal back into the snapshot past this size
+DB_FILE = "employees.db"  # used by the "sqlite" storage mode
+SAVE_INTERVAL_MS = 500  # the background writer persists at most once per interval
+SAVE_RETRIES = 3  # failed background writes are retried this many times before giving up until the next edit
+QUERY_FLUSH_TIMEOUT = 5  # seconds a SQLite index query waits for pending writes
+SHARD_DIR = "schedule_months"  # one JSON file per "YYYY-MM" plus manifest.json in the "sharded" storage mode
 DATE_FMT = "%Y-%m-%d"
 TIME_FMT = "%I:%M %p"
+STARTUP_BUDGET_MS = 1500  # --startup-profile flags cold starts slower than this
+AUDIT_POLL_MS = 100  # how often the calendar checks for a finished conflict audit
+SCHEMA_VERSION = 2  # shape of the data file; load_data() migrates older files once
+SLOT_MINUTES = 15  # width of one bit in the availability masks
+COVERAGE_SLOT_MINUTES = 30  # width of one staffing requirement / coverage slot
+MIN_AUTO_SHIFT_MINUTES = 3 * 60  # the auto-scheduler never proposes a shorter shift unless the store day is shorter
+DEFAULT_STORE_HOURS = {
+    "monday": ["8:30 AM", "7:00 PM"],
+    "tuesday": ["8:30 AM", "7:00 PM"],
+    "wednesday": ["8:30 AM", "7:00 PM"],
+    "thursday": ["8:30 AM", "7:00 PM"],
+    "friday": ["8:30 AM", "7:00 PM"],
+    "saturday": ["9:00 AM", "3:00 PM"],
+    "sunday": None  # closed
+}
+
+# ANCHOR Startup profile
+class StartupProfile:
+    """Timing breakdown of a cold start, printed when run with --startup-profile."""
+    
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self.last = _IMPORT_START
+        self.marks = []  # (label, seconds since the previous mark)
+    
+    def mark(self, label):
+        """Record the time spent since the previous mark under label."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.marks.append((label, now - self.last))
+        self.last = now
+    
+    def finish(self):
+        """Record the last mark and print the breakdown (called once the UI is idle)."""
+        if not self.enabled:
+            return
+        self.mark("first idle")
+        total_ms = (self.last - _IMPORT_START) * 1000
+        print("Startup profile:")
+        for label, seconds in self.marks:
+            print(f"  {label:<28}{seconds * 1000:9.1f} ms")
+        verdict = "over budget" if total_ms > STARTUP_BUDGET_MS else "within budget"
+        print(f"  {'total':<28}{total_ms:9.1f} ms  ({verdict}, {STARTUP_BUDGET_MS} ms)")
+        sys.stdout.flush()
+
+startup_profile = StartupProfile("--startup-profile" in sys.argv)
+startup_profile.mark("imports")
+
+# SECTION Lazy imports
+# reportlab, tkcalendar and requests are only needed by the PDF export, the date
+# pickers and the update check, and the process pool only by schedule
+# optimization, so they are imported the first time one of those runs.
+def lazy_import(module_name):
+    """Decorator for a loader that imports module_name; times the first import under --startup-profile."""
+    def decorator(loader):
+        def load():
+            if not startup_profile.enabled or module_name in sys.modules:
+                return loader()
+            started = time.perf_counter()
+            result = loader()
+            print(f"Lazy import of {module_name}: {(time.perf_counter() - started) * 1000:.1f} ms")
+            return result
+        return load
+    return decorator
+
+@lazy_import("tkcalendar")
+def load_date_entry():
+    """Return tkcalendar's DateEntry widget class."""
+    from tkcalendar import DateEntry
+    return DateEntry
+
+@lazy_import("reportlab")
+def load_pdf_canvas():
+    """Return reportlab's canvas module and the letter page size."""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+    return canvas, letter
+
+@lazy_import("requests")
+def load_requests():
+    """Return the requests module."""
+    import requests
+    return requests
+
+@lazy_import("multiprocessing")
+def load_multiprocessing():
+    """Return the multiprocessing module."""
+    import multiprocessing
+    return multiprocessing
+#!SECTION
 
 def ensure_data_file():
-    if not os.path.exists(DATA_FILE):
+    if find_snapshot_file() is None:
         template = {
             "employees": [],
             "schedule": {},  # monthly keyed schedule: "YYYY-MM": { "YYYY-MM-DD": [ {employee,start,end}, ... ] }
-            "store_hours": {
-                "monday": ("8:30 AM", "7:00 PM"),
-                "tuesday": ("8:30 AM", "7:00 PM"),
-                "wednesday": ("8:30 AM", "7:00 PM"),
-                "thursday": ("8:30 AM", "7:00 PM"),
-                "friday": ("8:30 AM", "7:00 PM"),
-                "saturday": ("9:00 AM", "3:00 PM"),
-                "sunday": None  # closed
-            }
+            "store_hours": DEFAULT_STORE_HOURS,
+            "schema_version": SCHEMA_VERSION
         }
-        with open(DATA_FILE, "w") as f:
-            json.dump(template, f, indent=4)
+        write_data(template)
 
 def load_data():
-    ensure_data_file()
-    with open(DATA_FILE, "r") as f:
-        data = json.load(f)
+    if os.path.exists(DB_FILE):
+        data = sqlite_store.load()
+    else:
+        ensure_data_file()
+        # Pretty, compact and gzip snapshots are all told apart while reading
+        data = read_json_file(find_snapshot_file())
+        
+        # The format is set first so a compaction started by replay writes
+        # the snapshot the way the user chose
+        change_journal.storage_format = data.get("settings", {}).get("storage_format", "pretty")
+        # Replay edits journaled since the snapshot was last written
+        change_journal.replay(data)
+        # Months of a sharded schedule are only read when first accessed
+        month_shards.attach(data)
+    
+    # Older files are brought up to date once here, so the rest of the app
+    # can rely on the current shape
+    migrate_data(data)
+    return data
+
+# SECTION Schema migrations
+def _migrate_to_v1(data):
+    """Fill in the schedule, store hours and employee colors and turn plain
+    date strings in requested_days_off into full-day entries."""
+    touched = []
+    if "schedule" not in data:
+        data["schedule"] = {}
+        touched.append(("schedule",))
+    if "store_hours" not in data:
+        data["store_hours"] = {day: list(hours) if hours else None for day, hours in DEFAULT_STORE_HOURS.items()}
+        touched.append(("store_hours",))
+    
+    employees_changed = False
+    for emp in data.get("employees", []):
+        if "color" not in emp:
+            emp["color"] = "#000000"
+            employees_changed = True
+        days_off = emp.get("requested_days_off", [])
+        if any(not isinstance(entry, dict) for entry in days_off):
+            emp["requested_days_off"] = [entry if isinstance(entry, dict) else {"date": entry, "type": "full"}
+                                         for entry in days_off]
+            employees_changed = True
+    if employees_changed:
+        touched.append(("employees",))
+    return touched
+
+# SCHEMA_MIGRATIONS[n] upgrades data from schema_version n to n + 1
+def _migrate_to_v2(data):
+    """Give every employee a unique integer id and make shifts reference it
+    through employee_id instead of the name. Shifts whose name matches no
+    employee keep the name."""
+    touched = []
+    employees = data.get("employees", [])
+    used_ids = set()
+    next_id = max([e["id"] for e in employees if isinstance(e.get("id"), int)] + [0]) + 1
+    for emp in employees:
+        if not isinstance(emp.get("id"), int) or emp["id"] in used_ids:
+            emp["id"] = next_id
+            next_id += 1
+            if not touched:
+                touched.append(("employees",))
+        used_ids.add(emp["id"])
+    
+    ids = {}
+    for emp in employees:
+        ids.setdefault(emp.get("name", ""), emp["id"])
+    schedule = data.get("schedule", {})
+    for month_key in list(schedule.keys()):
+        month_changed = False
+        for day_shifts in schedule[month_key].values():
+            for i, shift in enumerate(day_shifts):
+                if "employee_id" not in shift and shift.get("employee") in ids:
+                    day_shifts[i] = dict({"employee_id": ids[shift["employee"]]},
+                                         **{k: v for k, v in shift.items() if k != "employee"})
+                    month_changed = True
+        if month_changed:
+            touched.append(("schedule", month_key))
+    return touched
+
+SCHEMA_MIGRATIONS = [_migrate_to_v1, _migrate_to_v2]
+
+def shift_ref(shift):
+    """What a shift's employee is keyed by: its employee_id, or the stored name
+    for a shift whose employee never matched one (see _migrate_to_v2)."""
+    return shift.get("employee_id", shift.get("employee"))
+
+def migrate_data(data):
+    """Run the migrations data is missing and save the result once.
+
+    Files without a schema_version are version 0. Returns True if data was
+    migrated.
+    """
+    version = data.get("schema_version", 0)
+    if version >= SCHEMA_VERSION:
+        return False
+    touched = [("schema_version",)]
+    for migrate in SCHEMA_MIGRATIONS[version:SCHEMA_VERSION]:
+        touched.extend(migrate(data))
+    data["schema_version"] = SCHEMA_VERSION
+    save_data(data, touched=touched)
+    return True
+#!SECTION
+
+def save_data(data, touched=None):
+    """Mark data as changed; the background writer persists it shortly after.
+
+    touched lists the paths changed since the last save, e.g.
+    ("schedule", "2025-10", "2025-10-27") or ("settings",). None means
+    anything may have changed. Call flush_data() to wait for the write.
+    """
+    schedule = data.get("schedule")
+    mode = data.get("settings", {}).get("storage_mode", "snapshot")
+    if isinstance(schedule, LazySchedule) and schedule.store_mode != mode:
+        # Leaving the layout the months are read from: the writer only sees a
+        # copy, so pull every month into the app's own data first
+        data["schedule"] = schedule.copy()
+        touched = None
+    data_model.invalidate(touched)
+    employee_shifts.invalidate(touched)
+    weekly_hours.invalidate(touched)
+    availability_index.invalidate(touched)
+    data_writer.submit(data, touched)
+    try:
+        schedule_conflicts.invalidate(data, touched)
+    except Exception as e:
+        # Conflict badges are advisory; the edit is already queued for writing
+        print(f"Could not re-validate conflicts: {e}")
+
+def flush_data(timeout=None):
+    """Block until every save_data() call so far has reached the disk.
+
+    Returns False on timeout or once the writer has given up on a failing
+    write; data_writer.last_error then says why.
+    """
+    return data_writer.flush(timeout)
+
+def write_data(data, touched=None):
+    """Write data to disk in the configured storage mode.
+
+    In journal storage mode only the touched paths are appended to the
+    change journal, in sharded mode only the affected month files are
+    rewritten and in sqlite mode only the affected rows; otherwise (or
+    when touched is None) the whole file is rewritten.
+    """
+    mode = data.get("settings", {}).get("storage_mode", "snapshot")
+    storage_format = data.get("settings", {}).get("storage_format", "pretty")
+    if mode == "sqlite":
+        sqlite_store.save(data, touched)
+        return
+    
+    leaving_sqlite = sqlite_store.active
+    if leaving_sqlite:
+        # Pull every month out of the database before writing the new layout
+        schedule = data.get("schedule")
+        if isinstance(schedule, LazySchedule):
+            data["schedule"] = schedule.copy()
+        touched = None
+    
+    if mode == "sharded":
+        month_shards.save(data, touched, storage_format)
+    elif month_shards.active:
+        # Switching away from the sharded layout folds every month back into one snapshot
+        month_shards.detach(data, storage_format)
+    elif touched is not None and mode == "journal":
+        section_cache.invalidate(touched)
+        change_journal.append(data, touched)
+    else:
+        change_journal.write_snapshot(data, touched, storage_format)
+    
+    if leaving_sqlite:
+        sqlite_store.detach()
+
+def _atomic_write(path, payload):
+    """Write bytes to a temp file next to path and rename it into place."""
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp",
+                                    dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def encode_json(obj, storage_format="pretty"):
+    """Encode obj for disk: indented JSON, compact JSON or gzipped compact JSON."""
+    if storage_format == "pretty":
+        payload = json.dumps(obj, indent=4)
+    else:
+        payload = json.dumps(obj, separators=(",", ":"))
+    payload = payload.encode("utf-8")
+    if storage_format == "gzip":
+        payload = gzip.compress(payload, compresslevel=6)
+    return payload
+
+def read_json_file(path):
+    """Read a JSON file in any storage format; gzip is recognised by its magic bytes."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    if raw[:2] == b"\x1f\x8b":
+        raw = gzip.decompress(raw)
+    return json.loads(raw)
+
+def snapshot_file_for(storage_format):
+    return GZIP_DATA_FILE if storage_format == "gzip" else DATA_FILE
+
+def find_snapshot_file():
+    """Return the existing snapshot file (the newer one if both formats exist), or None."""
+    existing = [path for path in (DATA_FILE, GZIP_DATA_FILE) if os.path.exists(path)]
+    if not existing:
+        return None
+    return max(existing, key=os.path.getmtime)
+
+# ANCHOR Snapshot section cache
+class SectionCache:
+    """Encoded JSON for each top-level section and each schedule month.
+
+    Saves only re-encode the sections touched since the previous save and
+    splice the cached text of everything else around them, producing the
+    same output as json.dumps(data, indent=4) (or the compact separators).
+    """
+
+    def __init__(self):
+        self._entries = {}  # ("employees",) / ("schedule", "YYYY-MM") -> (value, text)
+        self._compact = False
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def invalidate(self, touched):
+        """Forget the sections behind the touched paths (all of them for None)."""
+        if touched is None:
+            self._entries.clear()
+            return
+        for path in touched:
+            if path[0] == "schedule" and len(path) > 1:
+                self._entries.pop(("schedule", path[1]), None)
+            elif path[0] == "schedule":
+                for key in [k for k in self._entries if k[0] == "schedule"]:
+                    del self._entries[key]
+            else:
+                self._entries.pop((path[0],), None)
+
+    def encode(self, data, compact=False):
+        if compact != self._compact:
+            # Cached text is specific to one layout
+            self._entries.clear()
+            self._compact = compact
+        return self._join([(key, self._encode_section(key, value, 1)) for key, value in data.items()], 0)
+
+    def _encode_section(self, key, value, level):
+        if key == "schedule" and isinstance(value, dict):
+            return self._join([(month_key, self._encode(("schedule", month_key), month, level + 1))
+                               for month_key, month in value.items()], level)
+        return self._encode((key,), value, level)
+
+    def _join(self, items, level):
+        """Assemble already encoded members into a JSON object at the given nesting level."""
+        if not items:
+            return "{}"
+        if self._compact:
+            return "{" + ",".join(f"{json.dumps(key)}:{text}" for key, text in items) + "}"
+        pad = " " * (4 * (level + 1))
+        return ("{\n" + ",\n".join(f"{pad}{json.dumps(key)}: {text}" for key, text in items)
+                + "\n" + " " * (4 * level) + "}")
+
+    def _encode(self, key, value, level):
+        entry = self._entries.get(key)
+        # The identity check also catches sections that were replaced outright
+        if entry is not None and entry[0] is value:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        if self._compact:
+            text = json.dumps(value, separators=(",", ":"))
+        else:
+            # JSON strings never contain raw newlines, so re-indenting line starts is safe
+            text = json.dumps(value, indent=4).replace("\n", "\n" + " " * (4 * level))
+        self._entries[key] = (value, text)
+        return text
+
+section_cache = SectionCache()
+
+def _lookup_path(data, path):
+    """Return (found, value) for a ("section", key, ...) path into data."""
+    node = data
+    for key in path:
+        if not isinstance(node, dict) or key not in node:
+            return False, None
+        node = node[key]
+    return True, node
+
+# ANCHOR Change journal
+class ChangeJournal:
+    """Append-only log of edits layered on top of the snapshot file.
+
+    Every record carries an increasing sequence number and the snapshot
+    stores the last one folded into it ("journal_seq"), so replaying a
+    journal over a newer snapshot never rolls anything back.
+    """
+
+    def __init__(self, journal_path, compact_bytes=JOURNAL_COMPACT_BYTES):
+        self.storage_format = "pretty"  # format snapshots are written in
+        self.path = journal_path
+        self.compacting_path = journal_path + ".compacting"
+        self.compact_bytes = compact_bytes
+        self.seq = 0            # last sequence number handed out
+        self.snapshot_seq = 0   # last sequence number contained in the snapshot file
+        self._lock = threading.Lock()
+        self._compactor = None
+
+    def replay(self, data):
+        """Apply journaled records newer than the snapshot to data (in place)."""
+        self.snapshot_seq = data.pop("journal_seq", 0)
+        self.seq = self.snapshot_seq
+        for path in (self.compacting_path, self.path):
+            self.seq = max(self.seq, self._replay_file(data, path, self.snapshot_seq))
+        
+        # Pick up compaction that was interrupted or is overdue, in the
+        # format the replayed settings ask for
+        if os.path.exists(self.compacting_path) or self._journal_size() >= self.compact_bytes:
+            self.storage_format = data.get("settings", {}).get("storage_format", self.storage_format)
+            self.start_compaction()
+
+    def append(self, data, touched):
+        """Append the current value of each touched path to the journal."""
+        lines = []
+        for path in touched:
+            self.seq += 1
+            found, value = _lookup_path(data, path)
+            record = {"seq": self.seq, "op": "set" if found else "del", "path": list(path)}
+            if found:
+                record["value"] = value
+            lines.append(json.dumps(record, separators=(",", ":")))
+        
+        with self._lock:
+            with open(self.path, "a") as f:
+                f.write("\n".join(lines) + "\n")
+                size = f.tell()
+        
+        if size >= self.compact_bytes:
+            self.start_compaction()
+
+    def write_snapshot(self, data, touched=None, storage_format=None):
+        """Rewrite the full snapshot and drop the journals it supersedes.
+
+        touched names the sections changed since the last write; the rest
+        are reused from the section cache.
+        """
+        with self._lock:
+            if storage_format:
+                self.storage_format = storage_format
+            snapshot = dict(data)
+            if self.seq:
+                snapshot["journal_seq"] = self.seq
+            section_cache.invalidate(touched)
+            payload = section_cache.encode(snapshot, compact=self.storage_format != "pretty").encode("utf-8")
+            if self.storage_format == "gzip":
+                payload = gzip.compress(payload, compresslevel=6)
+            self._replace_snapshot(payload)
+            self.snapshot_seq = self.seq
+            for path in (self.path, self.compacting_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def _replace_snapshot(self, payload):
+        """Write the snapshot in the current format and drop one left in another format."""
+        path = snapshot_file_for(self.storage_format)
+        _atomic_write(path, payload)
+        for other in (DATA_FILE, GZIP_DATA_FILE):
+            if other != path and os.path.exists(other):
+                os.remove(other)
+
+    def start_compaction(self):
+        """Fold the journal into the snapshot on a background thread."""
+        with self._lock:
+            if self._compactor is not None and self._compactor.is_alive():
+                return
+            # New edits keep going to a fresh journal while the old one is folded in
+            if not os.path.exists(self.compacting_path):
+                if not os.path.exists(self.path):
+                    return
+                os.replace(self.path, self.compacting_path)
+            self._compactor = threading.Thread(target=self._compact, name="journal-compaction")
+            self._compactor.start()
+
+    def _compact(self):
+        try:
+            with self._lock:
+                base_seq = self.snapshot_seq
+                data = read_json_file(find_snapshot_file())
+            data.pop("journal_seq", None)
+            last_seq = self._replay_file(data, self.compacting_path, base_seq)
+            data["journal_seq"] = last_seq
+            payload = encode_json(data, self.storage_format)
+            
+            with self._lock:
+                if self.snapshot_seq != base_seq:
+                    # A full save landed meanwhile and already contains these edits
+                    return
+                self._replace_snapshot(payload)
+                self.snapshot_seq = last_seq
+                if os.path.exists(self.compacting_path):
+                    os.remove(self.compacting_path)
+        except Exception as e:
+            print(f"Journal compaction failed: {e}")
+
+    def _journal_size(self):
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    @staticmethod
+    def _replay_file(data, path, after_seq):
+        """Apply records from one journal file, returning the highest seq seen."""
+        last_seq = after_seq
+        if not os.path.exists(path):
+            return last_seq
+        with open(path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break  # torn tail from an interrupted append
+                seq = record.get("seq", 0)
+                if seq <= after_seq:
+                    continue
+                last_seq = max(last_seq, seq)
+                
+                keys = record["path"]
+                node = data
+                for key in keys[:-1]:
+                    if record["op"] == "set":
+                        node = node.setdefault(key, {})
+                    else:
+                        node = node.get(key) if isinstance(node, dict) else None
+                        if node is None:
+                            break
+                if node is None:
+                    continue
+                if record["op"] == "set":
+                    node[keys[-1]] = record["value"]
+                else:
+                    node.pop(keys[-1], None)
+        return last_seq
+
+change_journal = ChangeJournal(JOURNAL_FILE)
+
+# ANCHOR Month shards
+class LazySchedule(dict):
+    """Schedule dict that reads "YYYY-MM" shards from disk on first access."""
+
+    def __init__(self, shard_store, months):
+        super().__init__()
+        self._store = shard_store
+        self._unloaded = set(months)
+
+    @property
+    def store_mode(self):
+        """The storage_mode setting of the layout the months are read from."""
+        return self._store.store_mode
+
+    def _load_month(self, month_key):
+        if month_key in self._unloaded:
+            self._unloaded.discard(month_key)
+            dict.__setitem__(self, month_key, self._store.read_month(month_key))
+
+    def load_all(self):
+        for month_key in list(self._unloaded):
+            self._load_month(month_key)
+
+    def loaded_months(self):
+        return list(dict.keys(self))
+
+    def __missing__(self, month_key):
+        if month_key in self._unloaded:
+            self._load_month(month_key)
+            return dict.__getitem__(self, month_key)
+        raise KeyError(month_key)
+
+    def __contains__(self, month_key):
+        return month_key in self._unloaded or dict.__contains__(self, month_key)
+
+    def __len__(self):
+        return dict.__len__(self) + len(self._unloaded)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __setitem__(self, month_key, value):
+        self._unloaded.discard(month_key)
+        dict.__setitem__(self, month_key, value)
+
+    def __delitem__(self, month_key):
+        self._load_month(month_key)
+        dict.__delitem__(self, month_key)
+
+    def get(self, month_key, default=None):
+        self._load_month(month_key)
+        return dict.get(self, month_key, default)
+
+    def setdefault(self, month_key, default=None):
+        self._load_month(month_key)
+        return dict.setdefault(self, month_key, default)
+
+    def pop(self, month_key, *default):
+        self._load_month(month_key)
+        return dict.pop(self, month_key, *default)
+
+    def keys(self):
+        # Month names come from the manifest, so listing them loads nothing
+        return list(dict.keys(self)) + sorted(self._unloaded)
+
+    def values(self):
+        self.load_all()
+        return dict.values(self)
+
+    def items(self):
+        self.load_all()
+        return dict.items(self)
+
+    def copy(self):
+        self.load_all()
+        return dict(self)
+
+
+class MonthShardStore:
+    """Sharded layout: DATA_FILE keeps everything but the schedule, which is
+    split into one file per month under SHARD_DIR plus a small manifest."""
+
+    store_mode = "sharded"
+
+    def __init__(self, shard_dir):
+        self.shard_dir = shard_dir
+        self.manifest_path = os.path.join(shard_dir, "manifest.json")
+        self.manifest = {"months": {}}
+        self.active = False  # True when the data on disk uses this layout
+
+    def month_path(self, month_key):
+        return os.path.join(self.shard_dir, f"{month_key}.json")
+
+    def read_month(self, month_key):
+        try:
+            return read_json_file(self.month_path(month_key))
+        except (OSError, ValueError) as e:
+            print(f"Could not read schedule shard {month_key}: {e}")
+            return {}
+
+    def attach(self, data):
+        """Hook a lazily loaded schedule into data if the files are sharded."""
+        if "schedule" in data or not os.path.exists(self.manifest_path):
+            self.active = False
+            return
+        with open(self.manifest_path, "r") as f:
+            self.manifest = json.load(f)
+        data["schedule"] = LazySchedule(self, self.manifest.get("months", {}))
+        self.active = True
+
+    def save(self, data, touched=None, storage_format="pretty"):
+        """Rewrite the shards (and core file) affected by the touched paths.
+
+        Month files are small, so the gzip format only applies to the core
+        file; shards are then written as compact JSON.
+        """
+        schedule = data.get("schedule", {})
+        shard_format = "pretty" if storage_format == "pretty" else "compact"
+        if not self.active or touched is None:
+            # Full write; months still on disk untouched don't need rewriting
+            if isinstance(schedule, LazySchedule):
+                months = set(schedule.loaded_months())
+            else:
+                months = set(schedule)
+            months |= set(self.manifest["months"]) - set(schedule)
+            core_dirty = True
+        else:
+            months = set()
+            core_dirty = False
+            for path in touched:
+                if path[0] != "schedule":
+                    core_dirty = True
+                elif len(path) > 1:
+                    months.add(path[1])
+                elif isinstance(schedule, LazySchedule):
+                    months.update(schedule.loaded_months())
+                    months |= set(self.manifest["months"]) - set(schedule)
+                else:
+                    months.update(schedule)
+        
+        os.makedirs(self.shard_dir, exist_ok=True)
+        manifest_dirty = not self.active
+        for month_key in sorted(months):
+            month_data = schedule.get(month_key) if month_key in schedule else None
+            if month_data:
+                _atomic_write(self.month_path(month_key), encode_json(month_data, shard_format))
+                entry = {"days": len(month_data),
+                         "shifts": sum(len(s) for s in month_data.values() if isinstance(s, list))}
+                if self.manifest["months"].get(month_key) != entry:
+                    self.manifest["months"][month_key] = entry
+                    manifest_dirty = True
+            elif month_key in self.manifest["months"]:
+                del self.manifest["months"][month_key]
+                if os.path.exists(self.month_path(month_key)):
+                    os.remove(self.month_path(month_key))
+                manifest_dirty = True
+        
+        if manifest_dirty:
+            _atomic_write(self.manifest_path, json.dumps(self.manifest, indent=4, sort_keys=True).encode("utf-8"))
+        if core_dirty or not self.active:
+            core_touched = None if touched is None or not self.active else [p for p in touched if p[0] != "schedule"]
+            change_journal.write_snapshot({k: v for k, v in data.items() if k != "schedule"}, core_touched,
+                                          storage_format)
+        self.active = True
+
+    def detach(self, data, storage_format=None):
+        """Leave the sharded layout: write one full snapshot, then drop the shards."""
+        schedule = data.get("schedule")
+        if isinstance(schedule, LazySchedule):
+            data["schedule"] = schedule.copy()
+        change_journal.write_snapshot(data, None, storage_format)
+        shutil.rmtree(self.shard_dir, ignore_errors=True)
+        self.manifest = {"months": {}}
+        self.active = False
+
+month_shards = MonthShardStore(SHARD_DIR)
+
+# ANCHOR SQLite storage
+class SqliteStore:
+    """SQLite layout: rows per employee, shift, time-off request, store hours
+    day and store modification; any other top-level section lives in `meta`.
+
+    The schedule is handed back as a LazySchedule so months are only read
+    when accessed, and the shift indexes let callers answer per-employee or
+    per-month questions without walking every month.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS employees (
+            sort_order INTEGER PRIMARY KEY, id INTEGER, name TEXT NOT NULL,
+            first_name TEXT, last_name TEXT, position TEXT, color TEXT,
+            availability TEXT, extra TEXT);
+        CREATE TABLE IF NOT EXISTS shifts (
+            month TEXT NOT NULL, date TEXT NOT NULL, slot INTEGER NOT NULL,
+            employee TEXT NOT NULL, start TEXT, "end" TEXT, employee_id INTEGER);
+        CREATE TABLE IF NOT EXISTS time_off (
+            employee_order INTEGER NOT NULL, slot INTEGER NOT NULL, employee TEXT NOT NULL,
+            date TEXT NOT NULL, type TEXT, times TEXT, extra TEXT);
+        CREATE TABLE IF NOT EXISTS store_hours (day TEXT PRIMARY KEY, open TEXT, close TEXT);
+        CREATE TABLE IF NOT EXISTS store_modifications (
+            date TEXT PRIMARY KEY, type TEXT, opening_time TEXT, closing_time TEXT,
+            reason TEXT, added_date TEXT);
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+        CREATE INDEX IF NOT EXISTS idx_shifts_date ON shifts(date);
+        CREATE INDEX IF NOT EXISTS idx_shifts_month ON shifts(month);
+        CREATE INDEX IF NOT EXISTS idx_time_off_employee_date ON time_off(employee, date);
+    """
+    EMPLOYEE_COLUMNS = {"id": "id", "name": "name", "firstName": "first_name", "lastName": "last_name",
+                        "position": "position", "color": "color"}
+    MODIFICATION_COLUMNS = ("type", "opening_time", "closing_time", "reason", "added_date")
+    TABLE_SECTIONS = ("employees", "schedule", "store_hours", "store_modifications")
+    store_mode = "sqlite"
+
+    def __init__(self, path):
+        self.path = path
+        self.active = False  # True when the data on disk lives in this database
+        self._conn = None
+        self._lock = threading.RLock()
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.executescript(self.SCHEMA)
+            # Databases created before shifts referenced employee ids
+            columns = [row[1] for row in self._conn.execute("PRAGMA table_info(shifts)")]
+            if "employee_id" not in columns:
+                self._conn.execute("ALTER TABLE shifts ADD COLUMN employee_id INTEGER")
+            self._conn.execute("DROP INDEX IF EXISTS idx_shifts_employee_date")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_shifts_employee_id_date ON shifts(employee_id, date)")
+        return self._conn
+
+    # SECTION Loading
+    def load(self):
+        """Rebuild the data dict from the database."""
+        with self._lock:
+            conn = self._connect()
+            data = {key: json.loads(value) for key, value in conn.execute("SELECT key, value FROM meta")}
+            
+            time_off = {}
+            for order, date_str, off_type, times, extra in conn.execute(
+                    "SELECT employee_order, date, type, times, extra FROM time_off ORDER BY employee_order, slot"):
+                if off_type is None:
+                    entry = date_str  # plain date string from before schema_version 1
+                else:
+                    entry = json.loads(extra) if extra else {}
+                    entry.update({"date": date_str, "type": off_type})
+                    if times is not None:
+                        entry["times"] = times
+                time_off.setdefault(order, []).append(entry)
+            
+            employees = []
+            for row in conn.execute("SELECT sort_order, id, name, first_name, last_name, position, color, "
+                                    "availability, extra FROM employees ORDER BY sort_order"):
+                emp = json.loads(row[8]) if row[8] else {}
+                for key, value in zip(self.EMPLOYEE_COLUMNS, row[1:7]):
+                    if value is not None:
+                        emp[key] = value
+                emp["availability"] = json.loads(row[7]) if row[7] else {}
+                emp["requested_days_off"] = time_off.get(row[0], [])
+                employees.append(emp)
+            data["employees"] = employees
+            
+            months = [m for (m,) in conn.execute("SELECT DISTINCT month FROM shifts")]
+            data["schedule"] = LazySchedule(self, months)
+            
+            store_hours = {}
+            for day, open_time, close_time in conn.execute("SELECT day, open, close FROM store_hours"):
+                store_hours[day] = [open_time, close_time] if open_time is not None else None
+            if store_hours:
+                data["store_hours"] = store_hours
+            
+            modifications = {}
+            for row in conn.execute("SELECT date, type, opening_time, closing_time, reason, added_date "
+                                    "FROM store_modifications ORDER BY date"):
+                modifications[row[0]] = {k: v for k, v in zip(self.MODIFICATION_COLUMNS, row[1:]) if v is not None}
+            if modifications:
+                data["store_modifications"] = modifications
+        
+        self.active = True
+        return data
+
+    def read_month(self, month_key):
+        with self._lock:
+            month_data = {}
+            for date_str, employee_id, employee, start, end in self._connect().execute(
+                    'SELECT date, employee_id, employee, start, "end" FROM shifts WHERE month = ? ORDER BY date, slot',
+                    (month_key,)):
+                if employee_id is None:
+                    shift = {"employee": employee, "start": start, "end": end}
+                else:
+                    shift = {"employee_id": employee_id, "start": start, "end": end}
+                month_data.setdefault(date_str, []).append(shift)
+            return month_data
+    #!SECTION
+
+    # SECTION Saving
+    def save(self, data, touched=None):
+        """Rewrite the rows behind the touched paths in one transaction."""
+        full = not self.active or touched is None
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                if full:
+                    for table in ("employees", "time_off", "store_hours", "store_modifications", "meta"):
+                        conn.execute(f"DELETE FROM {table}")
+                    self._write_employees(conn, data)
+                    self._write_store_hours(conn, data)
+                    self._write_modifications(conn, data, None)
+                    self._write_schedule(conn, data, None, None, full_rewrite=not self.active)
+                    for key in data:
+                        if key not in self.TABLE_SECTIONS:
+                            self._write_meta(conn, data, key)
+                else:
+                    for path in touched:
+                        section = path[0]
+                        if section == "employees":
+                            conn.execute("DELETE FROM employees")
+                            conn.execute("DELETE FROM time_off")
+                            self._write_employees(conn, data)
+                        elif section == "schedule":
+                            month_key = path[1] if len(path) > 1 else None
+                            day_str = path[2] if len(path) > 2 else None
+                            self._write_schedule(conn, data, month_key, day_str)
+                        elif section == "store_hours":
+                            conn.execute("DELETE FROM store_hours")
+                            self._write_store_hours(conn, data)
+                        elif section == "store_modifications":
+                            self._write_modifications(conn, data, path[1] if len(path) > 1 else None)
+                        else:
+                            self._write_meta(conn, data, section)
+        
+        if not self.active:
+            self.active = True
+            self._retire_json_files()
+
+    def _write_employees(self, conn, data):
+        for order, emp in enumerate(data.get("employees", [])):
+            extra = {k: v for k, v in emp.items()
+                     if k not in self.EMPLOYEE_COLUMNS and k not in ("availability", "requested_days_off")}
+            conn.execute("INSERT INTO employees VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                         (order, emp.get("id"), emp.get("name", ""), emp.get("firstName"), emp.get("lastName"),
+                          emp.get("position"), emp.get("color"), json.dumps(emp.get("availability", {})),
+                          json.dumps(extra) if extra else None))
+            for slot, entry in enumerate(emp.get("requested_days_off", [])):
+                extra = {k: v for k, v in entry.items() if k not in ("date", "type", "times")}
+                row = (entry.get("date", ""), entry.get("type", "full"), entry.get("times"),
+                       json.dumps(extra) if extra else None)
+                conn.execute("INSERT INTO time_off VALUES (?, ?, ?, ?, ?, ?, ?)",
+                             (order, slot, emp.get("name", "")) + row)
+
+    def _write_schedule(self, conn, data, month_key, day_str, full_rewrite=False):
+        schedule = data.get("schedule", {})
+        if day_str is not None:
+            conn.execute("DELETE FROM shifts WHERE date = ?", (day_str,))
+            days = [(day_str, schedule.get(month_key, {}).get(day_str, []) if month_key in schedule else [])]
+        elif month_key is not None:
+            conn.execute("DELETE FROM shifts WHERE month = ?", (month_key,))
+            month_data = schedule.get(month_key) if month_key in schedule else None
+            days = list(month_data.items()) if isinstance(month_data, dict) else []
+        else:
+            if full_rewrite or not isinstance(schedule, LazySchedule) or schedule._store is not self:
+                months = list(schedule.keys())
+                conn.execute("DELETE FROM shifts")
+            else:
+                # Months never loaded from this database cannot have changed
+                months = schedule.loaded_months()
+                conn.executemany("DELETE FROM shifts WHERE month = ?", [(m,) for m in months])
+            days = []
+            for key in months:
+                month_data = schedule[key]
+                if isinstance(month_data, dict):
+                    days.extend(month_data.items())
+        
+        rows = []
+        for date_str, shifts in days:
+            if not isinstance(shifts, list):
+                continue
+            for slot, shift in enumerate(shifts):
+                rows.append((date_str[:7], date_str, slot, shift.get("employee", ""),
+                             shift.get("start"), shift.get("end"), shift.get("employee_id")))
+        conn.executemany('INSERT INTO shifts VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+
+    def _write_store_hours(self, conn, data):
+        for day, hours in data.get("store_hours", {}).items():
+            conn.execute("INSERT INTO store_hours VALUES (?, ?, ?)",
+                         (day, hours[0], hours[1]) if hours else (day, None, None))
+
+    def _write_modifications(self, conn, data, date_str):
+        modifications = data.get("store_modifications", {})
+        if date_str is None:
+            conn.execute("DELETE FROM store_modifications")
+            items = modifications.items()
+        else:
+            conn.execute("DELETE FROM store_modifications WHERE date = ?", (date_str,))
+            items = [(date_str, modifications[date_str])] if date_str in modifications else []
+        for mod_date, mod in items:
+            conn.execute("INSERT INTO store_modifications VALUES (?, ?, ?, ?, ?, ?)",
+                         (mod_date,) + tuple(mod.get(k) for k in self.MODIFICATION_COLUMNS))
+
+    def _write_meta(self, conn, data, key):
+        if key in data:
+            conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, json.dumps(data[key])))
+        else:
+            conn.execute("DELETE FROM meta WHERE key = ?", (key,))
+
+    def _retire_json_files(self):
+        """Keep the JSON layout around as a backup once the database holds the data."""
+        for path in (DATA_FILE, GZIP_DATA_FILE):
+            if os.path.exists(path):
+                os.replace(path, path + ".bak")
+        for path in (change_journal.path, change_journal.compacting_path):
+            if os.path.exists(path):
+                os.remove(path)
+        if os.path.exists(month_shards.shard_dir):
+            shutil.rmtree(month_shards.shard_dir + ".bak", ignore_errors=True)
+            os.replace(month_shards.shard_dir, month_shards.shard_dir + ".bak")
+            month_shards.active = False
+
+    def detach(self):
+        """Leave the SQLite layout once the data has been written elsewhere."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            if os.path.exists(self.path):
+                os.replace(self.path, self.path + ".bak")
+        self.active = False
+    #!SECTION
+
+    # SECTION Indexed queries
+    # These read the database, so callers check indexes_ready() first
+    def indexes_ready(self, timeout=QUERY_FLUSH_TIMEOUT):
+        """True when the database is in use and every pending background write
+        reached it within timeout seconds; otherwise answer from memory."""
+        return self.active and flush_data(timeout)
+
+    def employee_shift_days(self, emp_id):
+        """Return [(month, date, shift_count)] for every day employee emp_id works."""
+        with self._lock:
+            return self._connect().execute(
+                "SELECT month, date, COUNT(*) FROM shifts WHERE employee_id = ? GROUP BY date ORDER BY date",
+                (emp_id,)).fetchall()
+
+    def employee_shifts_on(self, emp_id, dates):
+        """Return [(date, slot, start, end)] for employee emp_id's shifts on the given dates."""
+        dates = list(dates)
+        if not dates:
+            return []
+        placeholders = ",".join("?" * len(dates))
+        with self._lock:
+            return self._connect().execute(
+                f'SELECT date, slot, start, "end" FROM shifts WHERE employee_id = ? AND date IN ({placeholders}) '
+                'ORDER BY date, slot', [emp_id] + dates).fetchall()
+
+    def month_shifts(self, month_key):
+        """Return [(employee, date, start, end)] for every shift in a month, with
+        employee as the shift_ref() (id, or name for an unmatched shift)."""
+        with self._lock:
+            return self._connect().execute(
+                'SELECT COALESCE(employee_id, employee), date, start, "end" FROM shifts WHERE month = ?',
+                (month_key,)).fetchall()
+    #!SECTION
+
+sqlite_store = SqliteStore(DB_FILE)
+
+def migrate_json_to_sqlite():
+    """One-shot migration of the JSON data (any layout) into DB_FILE."""
+    data = load_data()
+    if sqlite_store.active:
+        return data
+    data.setdefault("settings", {})["storage_mode"] = "sqlite"
+    save_data(data)
+    flush_data()
+    return data
+
+# ANCHOR Write-behind saving
+def _copy_json(value):
+    """Deep copy of JSON-shaped data (dicts, lists and scalars)."""
+    if isinstance(value, dict):
+        return {key: _copy_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_json(item) for item in value]
+    return value
+
+class BackgroundWriter:
+    """Write-behind persistence worker.
+
+    save_data() only records which paths changed; this thread writes them
+    out at most once per interval, so a burst of edits costs one write and
+    the Tk thread never waits on the disk. Edits made while a write is in
+    progress simply schedule the next one.
+
+    The thread never reads the app's data: submit() hands it a snapshot in
+    which the touched paths are fresh copies and everything else is shared
+    with the previous snapshot. A failing write is retried a few times and
+    then left until the next edit, with the error kept in last_error.
+    """
+
+    def __init__(self, write_func, interval_ms=SAVE_INTERVAL_MS, retries=SAVE_RETRIES, verify=False):
+        self.write_func = write_func
+        self.interval = interval_ms / 1000
+        self.retries = retries
+        self.verify = verify      # compare every snapshot with the data (debugging aid)
+        self.stale_paths = []     # paths verify found missing from a save_data() touched list
+        self.writes = 0           # completed writes
+        self.last_error = None
+        self._cond = threading.Condition()
+        self._data = None         # snapshot the next write persists
+        self._source = None       # the app data the snapshots are taken from
+        self._touched = []        # pending paths in submit order; None means everything
+        self._dirty_since = None  # monotonic time of the oldest unsaved edit
+        self._generation = 0      # bumped by every submit()
+        self._written = 0         # generation covered by the last finished write
+        self._abandoned = 0       # generation covered by the last write given up on
+        self._failures = 0        # consecutive failed writes
+        self._flush_requested = False
+        self._thread = None
+
+    def submit(self, data, touched=None):
+        snapshot = self._snapshot(data, touched)
+        if self.verify:
+            stale = self._stale(snapshot, data)
+            if stale:
+                print(f"save_data() did not report {stale} as touched; writing everything")
+                self.stale_paths.extend(stale)
+                touched = None
+                snapshot = self._snapshot(data, None)
+        with self._cond:
+            self._data = snapshot
+            self._source = data
+            if touched is None or self._touched is None:
+                self._touched = None
+            else:
+                for path in touched:
+                    path = tuple(path)
+                    if path not in self._touched:
+                        self._touched.append(path)
+            if self._dirty_since is None:
+                self._dirty_since = time.monotonic()
+            self._generation += 1
+            self._failures = 0
+            self._cond.notify_all()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="data-writer", daemon=True)
+                self._thread.start()
+
+    def _snapshot(self, data, touched):
+        """Copy data for the writer thread, reusing the previous snapshot's
+        sections, months and days that touched leaves alone.
+
+        Snapshots are never modified once handed over, so sharing them is
+        safe; months not loaded yet stay unloaded in the copy.
+        """
+        previous = self._data if self._source is data and touched is not None else None
+        sections, months, days = set(), set(), {}
+        for path in touched or ():
+            if path[0] != "schedule" or len(path) == 1:
+                sections.add(path[0])
+            elif len(path) == 2:
+                months.add(path[1])
+            else:
+                days.setdefault(path[1], set()).add(path[2])
+        
+        snapshot = {}
+        for key, value in data.items():
+            reusable = previous is not None and key in previous and key not in sections
+            if key == "schedule" and isinstance(value, dict):
+                snapshot[key] = self._schedule_snapshot(value, previous[key] if reusable else None, months, days)
+            elif reusable:
+                snapshot[key] = previous[key]
+            else:
+                snapshot[key] = _copy_json(value)
+        return snapshot
+
+    @staticmethod
+    def _stale(snapshot, data):
+        """Paths whose value in snapshot differs from data's (loaded months only)."""
+        stale = [(key,) for key in set(snapshot) ^ set(data)]
+        for key, value in data.items():
+            if key not in snapshot:
+                continue
+            if key == "schedule" and isinstance(value, dict):
+                copied = snapshot[key]
+                for month_key in set(dict.keys(value)) | set(dict.keys(copied)):
+                    month, old = dict.get(value, month_key), dict.get(copied, month_key)
+                    if month == old:
+                        continue
+                    if isinstance(month, dict) and isinstance(old, dict):
+                        stale.extend(("schedule", month_key, day_str) for day_str in set(month) | set(old)
+                                     if month.get(day_str) != old.get(day_str))
+                    else:
+                        stale.append(("schedule", month_key))
+            elif snapshot[key] != value:
+                stale.append((key,))
+        return sorted(stale)
+
+    @staticmethod
+    def _schedule_snapshot(schedule, previous, months, days):
+        if isinstance(schedule, LazySchedule):
+            snapshot = LazySchedule(schedule._store, schedule._unloaded)
+        else:
+            snapshot = {}
+        # dict.items/dict.get see only loaded months and never load any
+        for month_key, month in dict.items(schedule):
+            old = dict.get(previous, month_key) if isinstance(previous, dict) else None
+            if old is None or month_key in months or not isinstance(month, dict):
+                copy = _copy_json(month)
+            elif month_key in days:
+                copy = dict(old)
+                for day_str in days[month_key]:
+                    if day_str in month:
+                        copy[day_str] = _copy_json(month[day_str])
+                    else:
+                        copy.pop(day_str, None)
+            else:
+                copy = old
+            dict.__setitem__(snapshot, month_key, copy)
+        return snapshot
+
+    def flush(self, timeout=None):
+        """Wait until everything submitted so far is written. Returns False on
+        timeout or when the writer gave up on it."""
+        with self._cond:
+            target = self._generation
+            if self._written >= target:
+                return True
+            self._flush_requested = True
+            self._cond.notify_all()
+            self._cond.wait_for(lambda: self._written >= target or self._abandoned >= target, timeout)
+            return self._written >= target
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._dirty_since is not None)
+                # Let a burst of edits pile up into a single write
+                while not self._flush_requested:
+                    remaining = self._dirty_since + self.interval - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                data, touched, generation = self._data, self._touched, self._generation
+                self._touched = []
+                self._dirty_since = None
+                self._flush_requested = False
+            
+            try:
+                self.write_func(data, touched)
+            except Exception as e:
+                # Most likely the disk or database is unavailable; retry
+                # everything a few times with a growing delay, then wait for
+                # the next edit
+                print(f"Background save failed: {e}")
+                with self._cond:
+                    self.last_error = e
+                    self._touched = None
+                    self._failures += 1
+                    if self._failures <= self.retries:
+                        if self._dirty_since is None:
+                            self._dirty_since = time.monotonic() + self.interval * (self._failures - 1)
+                    else:
+                        self._abandoned = max(self._abandoned, generation)
+                    self._cond.notify_all()
+                continue
+            
+            with self._cond:
+                self.last_error = None
+                self._failures = 0
+                self.writes += 1
+                self._written = max(self._written, generation)
+                self._cond.notify_all()
+
+# --verify-saves checks every save_data() touched list against the data
+data_writer = BackgroundWriter(write_data, verify="--verify-saves" in sys.argv)
+# Make sure nothing queued is lost when the interpreter exits
+atexit.register(flush_data, 10)
+
+# SECTION Time codec
+# Every TIME_FMT conversion goes through time_codec. The app only ever sees
+# a few dozen distinct times, so a small bounded LRU memo answers nearly all
+# of them without calling strptime.
+MINUTES_PER_DAY = 24 * 60
+
+class TimeCodec:
+    """Bounded LRU memo of TIME_FMT parsing and formatting."""
+    
+    _MISSING = object()
+    
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # (kind, *args) -> result
+        self._lock = threading.Lock()  # the conflict audit thread converts times too
+        self.hits = 0
+        self.misses = 0
+    
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+    
+    def _lookup(self, key, compute, *args):
+        entries = self._entries
+        with self._lock:
+            value = entries.get(key, self._MISSING)
+            if value is not self._MISSING:
+                self.hits += 1
+                entries.move_to_end(key)
+                return value
+            self.misses += 1
+        # Computed outside the lock since times() looks up each format()
+        value = compute(*args)
+        with self._lock:
+            entries[key] = value
+            if len(entries) > self.maxsize:
+                entries.popitem(last=False)
+        return value
+    
+    @staticmethod
+    def _parse(time_str):
+        try:
+            dt = datetime.strptime(time_str.strip(), TIME_FMT)
+        except (ValueError, AttributeError):
+            return None  # memoized too, so repeated bad values stay cheap
+        return dt.hour * 60 + dt.minute
+    
+    @staticmethod
+    def _format(minutes):
+        hour, minute = divmod(minutes, 60)
+        return f"{hour % 12 or 12:02d}:{minute:02d} {'AM' if hour < 12 else 'PM'}"
+    
+    @staticmethod
+    def _simple(minutes):
+        hour, minute = divmod(minutes, 60)
+        return str(hour % 12 or 12) if minute == 0 else f"{hour % 12 or 12}:{minute:02d}"
+    
+    def _times(self, start_str, end_str, interval_minutes):
+        return tuple(self.format(minutes) for minutes in
+                     range(self.parse(start_str), self.parse(end_str) + 1, interval_minutes))
+    
+    def parse(self, time_str):
+        """Minutes since midnight for a TIME_FMT string (ValueError if malformed)."""
+        minutes = self._lookup(("parse", time_str), self._parse, time_str)
+        if minutes is None:
+            raise ValueError(f"time data {time_str!r} does not match format {TIME_FMT!r}")
+        return minutes
+    
+    def format(self, minutes):
+        """TIME_FMT string for minutes since midnight."""
+        minutes %= MINUTES_PER_DAY
+        return self._lookup(("format", minutes), self._format, minutes)
+    
+    def simple(self, time_str):
+        """Short calendar label such as "7" or "7:30"; malformed input is returned as is."""
+        try:
+            minutes = self.parse(time_str)
+        except (ValueError, TypeError):
+            return time_str
+        return self._lookup(("simple", minutes), self._simple, minutes)
+    
+    def times(self, start_str, end_str, interval_minutes=30):
+        """Times from start to end inclusive every interval_minutes (ValueError if malformed)."""
+        return self._lookup(("times", start_str, end_str, interval_minutes), self._times,
+                            start_str, end_str, interval_minutes)
+
+time_codec = TimeCodec()
+
+def parse_minutes(time_str):
+    """Minutes since midnight for a TIME_FMT string such as "7:00 PM" (ValueError if malformed)."""
+    return time_codec.parse(time_str)
+
+def format_minutes(minutes):
+    """TIME_FMT string for minutes since midnight."""
+    return time_codec.format(minutes)
+
+def format_time_simple(time_str):
+    """Convert '7:00 PM' format to '7' or '7:30' format."""
+    return time_codec.simple(time_str)
+
+def generate_times(start_str, end_str, interval_minutes=30):
+    """Return list of times between start and end inclusive formatted with TIME_FMT."""
+    return list(time_codec.times(start_str, end_str, interval_minutes))
+
+#!SECTION
+
+# SECTION Data model
+# Typed, __slots__ views of the JSON data for hot loops: times are minutes
+# since midnight and dates are ordinals, so checks become integer compares.
+# The JSON dicts stay the stored form; DataModel builds a view once and
+# rebuilds it only for the sections save_data() reports as touched.
+
+def date_ordinal(date_str):
+    """Proleptic Gregorian ordinal of a DATE_FMT string."""
+    return datetime.strptime(date_str, DATE_FMT).toordinal()
+
+def _parse_minutes_or_none(time_str):
+    try:
+        return parse_minutes(time_str)
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+class Shift:
+    """A scheduled shift; employee is its shift_ref() and start and end are None
+    when the stored time is malformed."""
+    __slots__ = ("employee", "day", "start", "end")
+    
+    def __init__(self, employee, day, start, end):
+        self.employee = employee
+        self.day = day
+        self.start = start
+        self.end = end
+    
+    @classmethod
+    def from_dict(cls, day, shift):
+        return cls(shift_ref(shift), day,
+                   _parse_minutes_or_none(shift.get("start")), _parse_minutes_or_none(shift.get("end")))
+    
+    @property
+    def valid(self):
+        return self.start is not None and self.end is not None
+    
+    @property
+    def sort_key(self):
+        """Start minute, with malformed times sorted last."""
+        return self.start if self.start is not None else MINUTES_PER_DAY * 2
+    
+    @property
+    def minutes(self):
+        """Length in minutes; an end at or before the start runs past midnight."""
+        return (self.end - self.start) % MINUTES_PER_DAY or MINUTES_PER_DAY
+
+class ShiftConflict:
+    """One problem found by validate_shifts_batch(): index is the shift's
+    position in the batch and kind one of time, store, employee, time_off,
+    availability, overlap or batch_overlap."""
+    __slots__ = ("day", "index", "kind", "message")
+    
+    def __init__(self, day, index, kind, message):
+        self.day = day
+        self.index = index
+        self.kind = kind
+        self.message = message
+
+class TimeOffRequest:
+    """A requested day off; a partial request with malformed times, or an end
+    at or before the start, has start None.
+    
+    times keeps the stored (start, end) strings of a partial request for messages.
+    """
+    __slots__ = ("day", "full", "start", "end", "times")
+    
+    def __init__(self, day, full, start=0, end=MINUTES_PER_DAY, times=None):
+        self.day = day
+        self.full = full
+        self.start = start
+        self.end = end
+        self.times = times
+    
+    @classmethod
+    def from_dict(cls, entry):
+        """Build from a requested_days_off entry, or None for one that never blocks a shift."""
+        day = date_ordinal(entry["date"])
+        if entry.get("type") == "full":
+            return cls(day, True)
+        if entry.get("type") != "partial":
+            return None
+        parts = [p.strip() for p in entry.get("times", "").split("-")]
+        if len(parts) != 2:
+            return None
+        start, end = _parse_minutes_or_none(parts[0]), _parse_minutes_or_none(parts[1])
+        if start is None or end is None or end <= start:
+            start = end = None
+        return cls(day, False, start, end, tuple(parts))
+
+class Employee:
+    """An employee with availability indexed by weekday (0 = Monday).
+    
+    Each availability entry is None when off, False when the stored times
+    are malformed, otherwise a (start, end) pair.
+    """
+    __slots__ = ("id", "name", "color", "availability", "source")
+    
+    WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+    
+    def __init__(self, emp_id, name, color, availability, source):
+        self.id = emp_id
+        self.name = name
+        self.color = color
+        self.availability = availability
+        self.source = source      # the employee's dict in data["employees"]
+    
+    @classmethod
+    def from_dict(cls, emp):
+        availability = []
+        for day_name in cls.WEEKDAYS:
+            hours = emp.get("availability", {}).get(day_name, ["off"])
+            if hours == ["off"]:
+                availability.append(None)
+                continue
+            try:
+                start, end = parse_minutes(hours[0]), parse_minutes(hours[1])
+                availability.append((start, end))
+            except (ValueError, TypeError, AttributeError, IndexError):
+                availability.append(False)
+        return cls(emp.get("id"), emp.get("name", ""), emp.get("color", "#000000"), availability, emp)
+
+class DayIntervals:
+    """One day's shifts grouped per employee into start-sorted intervals.
+    
+    Each employee keeps parallel lists of starts, (start, end, slot) and the
+    running maximum of the ends, so an overlap query bisects to the last
+    interval starting before the query ends and walks back only while an
+    earlier interval can still reach it. slot is the shift's index in the
+    day's list; shifts with malformed times are listed separately. A shift
+    ending at or before its start runs to midnight.
+    """
+    __slots__ = ("_by_employee", "invalid")
+    
+    def __init__(self, shifts=()):
+        self._by_employee = {}  # shift_ref() -> ([start], [(start, end, slot)], [max end so far])
+        self.invalid = {}       # shift_ref() -> [slot]
+        for slot, shift in enumerate(shifts):
+            self.add(shift, slot)
+    
+    def add(self, shift, slot):
+        """Insert a Shift stored at slot in the day's list."""
+        if not shift.valid:
+            self.invalid.setdefault(shift.employee, []).append(slot)
+            return
+        starts, intervals, reach = self._by_employee.setdefault(shift.employee, ([], [], []))
+        end = shift.end if shift.end > shift.start else MINUTES_PER_DAY
+        i = bisect.bisect_right(starts, shift.start)
+        starts.insert(i, shift.start)
+        intervals.insert(i, (shift.start, end, slot))
+        reach.insert(i, 0)
+        for k in range(i, len(reach)):
+            reach[k] = max(reach[k - 1] if k else 0, intervals[k][1])
+    
+    def has(self, employee):
+        """True if employee has any shift this day."""
+        return employee in self._by_employee or employee in self.invalid
+    
+    def overlapping(self, employee, start, end, exclude_slot=None):
+        """Slots of employee's shifts overlapping start..end, in slot order."""
+        entry = self._by_employee.get(employee)
+        if entry is None:
+            return []
+        starts, intervals, reach = entry
+        found = []
+        j = bisect.bisect_left(starts, end) - 1
+        while j >= 0 and reach[j] > start:
+            _, shift_end, slot = intervals[j]
+            if shift_end > start and slot != exclude_slot:
+                found.append(slot)
+            j -= 1
+        return sorted(found)
+
+class StoreDay:
+    """A date's effective store hours: its store modification if it has one,
+    otherwise the regular hours for its weekday.
+    
+    hours is the stored [opening, closing] strings or None when closed;
+    opening and closing are those in minutes, or None when closed or malformed.
+    modification is the type of the date's store modification, or None, and
+    reason its stored reason ("" if none was given).
+    """
+    __slots__ = ("closed", "hours", "opening", "closing", "reason", "modification")
+    
+    DEFAULT_HOURS = ("8:30 AM", "7:00 PM")
+    
+    def __init__(self, hours, reason="", modification=None):
+        self.closed = hours is None
+        self.hours = hours
+        self.opening = self.closing = None
+        if hours is not None:
+            opening, closing = _parse_minutes_or_none(hours[0]), _parse_minutes_or_none(hours[1])
+            if opening is not None and closing is not None:
+                self.opening, self.closing = opening, closing
+        self.reason = reason
+        self.modification = modification
+    
+    @classmethod
+    def from_data(cls, data, day_str):
+        modification = data.get("store_modifications", {}).get(day_str)
+        kind = None
+        if modification is not None:
+            kind = modification.get("type")
+            if kind == "closure":
+                return cls(None, modification.get("reason", ""), kind)
+            if kind == "modified_hours":
+                hours = [modification.get("opening_time"), modification.get("closing_time")]
+                return cls(hours, modification.get("reason", ""), kind)
+        try:
+            day_name = Employee.WEEKDAYS[datetime.strptime(day_str, DATE_FMT).weekday()]
+        except ValueError:
+            return cls(list(cls.DEFAULT_HOURS), modification=kind)
+        hours = data.get("store_hours", {}).get(day_name)
+        if hours is not None:
+            # Malformed weekly hours fall back to the default hours
+            hours = list(hours) if isinstance(hours, (list, tuple)) and len(hours) == 2 else list(cls.DEFAULT_HOURS)
+        return cls(hours, modification=kind)
+    
+    @property
+    def reason_text(self):
+        """The reason for validation messages, with a default when none was given."""
+        if self.reason:
+            return self.reason
+        return "Special closure" if self.modification == "closure" else "Modified hours"
+
+class StoreCalendar:
+    """Date -> StoreDay, shared by the calendar, PDF export, shift dialogs and validation.
+    
+    Built per date on first use. auto_save_store_hours() clears it and
+    add_store_modification() and undo_store_modification() forget the
+    date they change through invalidate().
+    """
+    
+    def __init__(self):
+        self._data = None   # the data dict the cache was built from
+        self._days = {}
+    
+    def day(self, data, day_str):
+        """The StoreDay for day_str."""
+        if self._data is not data:
+            self._data = data
+            self._days = {}
+        store_day = self._days.get(day_str)
+        if store_day is None:
+            store_day = StoreDay.from_data(data, day_str)
+            self._days[day_str] = store_day
+        return store_day
+    
+    def hours(self, data, day_str):
+        """The [opening, closing] strings for day_str, or None when the store is closed."""
+        return self.day(data, day_str).hours
+    
+    def invalidate(self, day_str=None):
+        """Forget day_str (every date for None)."""
+        if day_str is None:
+            self._days.clear()
+        else:
+            self._days.pop(day_str, None)
+
+store_calendar = StoreCalendar()
+
+class EmployeeIndex:
+    """Name -> employee and id -> employee indexes plus a name -> color map.
+    
+    Built from data["employees"] on first use. add_employee(),
+    edit_employee_name() and remove_employee() keep it current through
+    added()/renamed()/removed(), and the color editors call colors_changed().
+    """
+    
+    def __init__(self):
+        self._employees = None  # the list the index was built from
+        self._by_name = {}
+        self._by_id = {}
+        self._colors = None     # name -> color, rebuilt after colors_changed()
+    
+    def _index(self, data):
+        employees = data.get("employees", [])
+        if self._employees is not employees:
+            self._employees = employees
+            self._by_name = {}
+            self._by_id = {}
+            # The first employee with a name wins, like the old linear scans
+            for emp in employees:
+                self._by_name.setdefault(emp.get("name", ""), emp)
+                self._by_id[emp.get("id")] = emp
+            self._colors = None
+        return self._by_name
+    
+    def find(self, data, name):
+        """The employee dict named name, or None."""
+        return self._index(data).get(name)
+    
+    def find_by_id(self, data, emp_id):
+        """The employee dict with id emp_id, or None."""
+        self._index(data)
+        return self._by_id.get(emp_id)
+    
+    def shift_name(self, data, shift):
+        """Display name of a shift's employee."""
+        if "employee_id" in shift:
+            emp = self.find_by_id(data, shift["employee_id"])
+            if emp is not None:
+                return emp.get("name", "")
+        return shift.get("employee", "Unknown")
+    
+    def color(self, data, name):
+        """The custom color of the employee named name (black if unknown)."""
+        self._index(data)
+        if self._colors is None:
+            self._colors = {emp_name: emp.get("color", "#000000") for emp_name, emp in self._by_name.items()}
+        return self._colors.get(name, "#000000")
+    
+    def added(self, emp):
+        self._by_name.setdefault(emp.get("name", ""), emp)
+        self._by_id[emp.get("id")] = emp
+        self._colors = None
+    
+    def removed(self, emp):
+        self._reindex(emp.get("name", ""), emp)
+        self._by_id.pop(emp.get("id"), None)
+        self._colors = None
+    
+    def renamed(self, emp, old_name):
+        self._reindex(old_name, emp)
+        self._by_name.setdefault(emp.get("name", ""), emp)
+        self._colors = None
+    
+    def colors_changed(self):
+        self._colors = None
+    
+    def _reindex(self, name, emp):
+        """Point name at the next employee still using it once emp no longer does."""
+        if self._by_name.get(name) is not emp:
+            return
+        del self._by_name[name]
+        for other in self._employees or ():
+            if other is not emp and other.get("name", "") == name:
+                self._by_name[name] = other
+                break
+
+employee_index = EmployeeIndex()
+
+def employee_display_name(emp):
+    """First and last name as shown in the day editor, falling back to the stored name."""
+    return (emp.get("firstName", "") + " " + emp.get("lastName", "")).strip() or emp.get("name", "")
+
+class DataModel:
+    """Cache of the typed views, kept in step with the touched paths passed to save_data()."""
+    
+    def __init__(self, employees):
+        self._index = employees     # the EmployeeIndex ids are resolved through
+        self._employees = {}        # employee id -> Employee
+        self._days = {}             # day_str -> [shift dict list, its length, [Shift], DayIntervals or None]
+    
+    def invalidate(self, touched):
+        """Forget the views behind the touched paths (all of them for None)."""
+        if touched is None:
+            self._employees.clear()
+            self._days.clear()
+            return
+        for path in touched:
+            if path[0] == "employees":
+                self._employees.clear()
+            elif path[0] == "schedule" and len(path) > 2:
+                self._days.pop(path[2], None)
+            elif path[0] == "schedule" and len(path) > 1:
+                for day_str in [d for d in self._days if d.startswith(path[1])]:
+                    del self._days[day_str]
+            elif path[0] == "schedule":
+                self._days.clear()
+    
+    def employee(self, data, emp_id):
+        """The Employee with id emp_id, or None."""
+        emp = self._index.find_by_id(data, emp_id)
+        if emp is None:
+            return None
+        view = self._employees.get(emp_id)
+        if view is None or view.source is not emp:
+            view = Employee.from_dict(emp)
+            self._employees[emp_id] = view
+        return view
+    
+    def _day(self, data, day_str, shifts):
+        if shifts is None:
+            shifts = data.get("schedule", {}).get(day_str[:7], {}).get(day_str, [])
+        entry = self._days.get(day_str)
+        # The identity and length checks also catch lists replaced or appended to
+        if entry is None or entry[0] is not shifts or entry[1] != len(shifts):
+            day = date_ordinal(day_str)
+            entry = [shifts, len(shifts), [Shift.from_dict(day, shift) for shift in shifts], None]
+            self._days[day_str] = entry
+        return entry
+    
+    def day_shifts(self, data, day_str, shifts=None):
+        """Shift views matching data's shift list for day_str index for index."""
+        return self._day(data, day_str, shifts)[2]
+    
+    def day_intervals(self, data, day_str, shifts=None):
+        """The DayIntervals of day_str's shifts."""
+        entry = self._day(data, day_str, shifts)
+        if entry[3] is None:
+            entry[3] = DayIntervals(entry[2])
+        return entry[3]
+
+data_model = DataModel(employee_index)
+
+class WeeklyHours:
+    """(employee ref, ISO week) -> paid minutes, with the break time taken off each shift.
+    
+    A week is summed from its seven days the first time it is asked for.
+    After that save_data() marks the touched days stale and only their
+    share is swapped out on the next lookup, so a lookup never re-sums
+    the week. Changing the break time starts over.
+    """
+    
+    def __init__(self, model):
+        self._model = model         # the DataModel the shift views come from
+        self._data = None
+        self._break = None
+        self._weeks = {}            # (ISO year, ISO week) -> {ref: minutes}
+        self._days = {}             # day_str in a summed week -> {ref: minutes}
+        self._stale_days = set()
+        self._stale_months = set()
+    
+    @staticmethod
+    def paid_minutes(shift, break_minutes):
+        return max(shift.minutes - break_minutes, 0) if shift.valid else 0
+    
+    @staticmethod
+    def week_start(day_str):
+        """The Monday starting day_str's ISO week."""
+        day = datetime.strptime(day_str, DATE_FMT).date()
+        return day - timedelta(days=day.weekday())
+    
+    def invalidate(self, touched):
+        if touched is None:
+            self._data = None
+            return
+        for path in touched:
+            if path[0] != "schedule":
+                continue
+            if len(path) > 2:
+                self._stale_days.add(path[2])
+            elif len(path) > 1:
+                self._stale_months.add(path[1])
+            else:
+                self._data = None
+    
+    def _day_minutes(self, data, day_str):
+        totals = {}
+        shifts = data.get("schedule", {}).get(day_str[:7], {}).get(day_str, [])
+        for shift in self._model.day_shifts(data, day_str, shifts):
+            totals[shift.employee] = totals.get(shift.employee, 0) + self.paid_minutes(shift, self._break)
+        return totals
+    
+    def _swap_day(self, data, day_str):
+        if day_str not in self._days:
+            return
+        week = self._weeks[self.week_start(day_str).isocalendar()[:2]]
+        for ref, minutes in self._days[day_str].items():
+            week[ref] -= minutes
+        self._days[day_str] = self._day_minutes(data, day_str)
+        for ref, minutes in self._days[day_str].items():
+            week[ref] = week.get(ref, 0) + minutes
+    
+    def minutes(self, data, ref, day_str, break_minutes):
+        """Paid minutes scheduled for ref in the ISO week containing day_str."""
+        if self._data is not data or self._break != break_minutes:
+            self._data = data
+            self._break = break_minutes
+            self._weeks = {}
+            self._days = {}
+            self._stale_days.clear()
+            self._stale_months.clear()
+        for month_key in self._stale_months:
+            for stale_day in [d for d in self._days if d.startswith(month_key)]:
+                self._swap_day(data, stale_day)
+        for stale_day in self._stale_days:
+            if stale_day[:7] not in self._stale_months:
+                self._swap_day(data, stale_day)
+        self._stale_days.clear()
+        self._stale_months.clear()
+        monday = self.week_start(day_str)
+        key = monday.isocalendar()[:2]
+        week = self._weeks.get(key)
+        if week is None:
+            week = {}
+            for offset in range(7):
+                week_day = (monday + timedelta(days=offset)).strftime(DATE_FMT)
+                self._days[week_day] = self._day_minutes(data, week_day)
+                for ref_, minutes in self._days[week_day].items():
+                    week[ref_] = week.get(ref_, 0) + minutes
+            self._weeks[key] = week
+        return week.get(ref, 0)
+
+weekly_hours = WeeklyHours(data_model)
+
+class TimeOffIndex:
+    """(employee id, day ordinal) -> [TimeOffRequest] across all employees.
+    
+    Built from data["employees"] on first use. save_employee_changes()
+    (which writes what add_requested_day() and remove_requested_day() put
+    in the list) and remove_employee() keep it current through
+    updated()/removed(); an employee whose requested_days_off list was
+    replaced some other way is re-indexed on their next lookup.
+    """
+    
+    def __init__(self):
+        self._employees = None  # the list the index was built from
+        self._requests = {}
+        self._days = {}         # employee id -> (requested_days_off list, its length, [ordinals])
+    
+    def _index(self, data):
+        employees = data.get("employees", [])
+        if self._employees is not employees:
+            self._employees = employees
+            self._requests = {}
+            self._days = {}
+            for emp in employees:
+                self.updated(emp)
+        return self._requests
+    
+    def requests(self, data, emp, day):
+        """emp's time-off requests on the day with ordinal day that can block a shift."""
+        requests = self._index(data)
+        entries = emp.get("requested_days_off", [])
+        indexed = self._days.get(emp.get("id"))
+        if indexed is None or indexed[0] is not entries or indexed[1] != len(entries):
+            self.updated(emp)
+        return requests.get((emp.get("id"), day), ())
+    
+    def updated(self, emp):
+        """Re-index emp's requested_days_off."""
+        emp_id = emp.get("id")
+        self.removed(emp)
+        entries = emp.get("requested_days_off", [])
+        days = []
+        for entry in entries:
+            try:
+                request = TimeOffRequest.from_dict(entry)
+            except (ValueError, KeyError, TypeError):
+                continue
+            if request is not None:
+                self._requests.setdefault((emp_id, request.day), []).append(request)
+                days.append(request.day)
+        self._days[emp_id] = (entries, len(entries), days)
+    
+    def removed(self, emp):
+        indexed = self._days.pop(emp.get("id"), None)
+        if indexed is not None:
+            for day in indexed[2]:
+                self._requests.pop((emp.get("id"), day), None)
+
+time_off_index = TimeOffIndex()
+
+class EmployeeShiftIndex:
+    """Employee id -> sorted [(day_str, slot)] of their shifts in the indexed months.
+    
+    slot is the shift's position in its day's list. Months are indexed as
+    they are loaded, so with a lazily loaded schedule a lookup only reads
+    the months its date range needs from disk. After that save_data() marks
+    the touched days and months stale and only those are re-indexed on the
+    next lookup.
+    """
+    
+    def __init__(self):
+        self._schedule = None     # the schedule dict the index was built from
+        self._months = set()      # months indexed so far
+        self._by_employee = {}    # shift_ref() -> sorted [(day_str, slot)]
+        self._day_employees = {}  # day_str -> shift_ref()s with a shift that day
+        self._stale_days = set()
+        self._stale_months = set()
+    
+    def invalidate(self, touched):
+        if touched is None:
+            self._schedule = None
+            return
+        for path in touched:
+            if path[0] != "schedule":
+                continue
+            if len(path) > 2:
+                self._stale_days.add(path[2])
+            elif len(path) > 1:
+                self._stale_months.add(path[1])
+            else:
+                self._schedule = None
+    
+    def _index(self, data, first_day=None, last_day=None, loaded_only=False):
+        """Bring the index up to date, first loading the months first_day..last_day
+        touch unless loaded_only."""
+        schedule = data.get("schedule", {})
+        if self._schedule is not schedule:
+            self._schedule = schedule
+            self._months = set()
+            self._by_employee = {}
+            self._day_employees = {}
+        else:
+            for month_key in self._stale_months & self._months:
+                for day_str in [d for d in self._day_employees if d.startswith(month_key)]:
+                    self._drop_day(day_str)
+                self._add_month(month_key, schedule.get(month_key, {}))
+            for day_str in self._stale_days:
+                if day_str[:7] in self._months and day_str[:7] not in self._stale_months:
+                    self._drop_day(day_str)
+                    self._add_day(day_str, schedule.get(day_str[:7], {}).get(day_str, []))
+        self._stale_days.clear()
+        self._stale_months.clear()
+        
+        if not loaded_only:
+            for month_key in schedule.keys():
+                if ((first_day is None or month_key >= first_day[:7]) and
+                        (last_day is None or month_key <= last_day[:7]) and month_key not in self._months):
+                    schedule.get(month_key)  # reads a lazily loaded month
+        # dict.items only lists months already in memory
+        for month_key, month_data in list(dict.items(schedule)):
+            if month_key not in self._months:
+                self._months.add(month_key)
+                self._add_month(month_key, month_data)
+    
+    def _add_month(self, month_key, month_data):
+        for day_str, shifts in month_data.items():
+            self._add_day(day_str, shifts)
+    
+    def _add_day(self, day_str, shifts):
+        for slot, shift in enumerate(shifts):
+            ref = shift_ref(shift)
+            bisect.insort(self._by_employee.setdefault(ref, []), (day_str, slot))
+            self._day_employees.setdefault(day_str, set()).add(ref)
+    
+    def _drop_day(self, day_str):
+        for ref in self._day_employees.pop(day_str, ()):
+            entries = self._by_employee[ref]
+            del entries[bisect.bisect_left(entries, (day_str,)):bisect.bisect_left(entries, (day_str + "~",))]
+    
+    def _resolve(self, entries):
+        schedule = self._schedule
+        return [(day_str, slot, schedule[day_str[:7]][day_str][slot]) for day_str, slot in entries]
+    
+    def shifts(self, data, emp_id, first_day=None, last_day=None, loaded_only=False):
+        """[(day_str, slot, shift)] for employee emp_id in date order, optionally
+        limited to first_day..last_day and to the months already loaded."""
+        self._index(data, first_day, last_day, loaded_only)
+        entries = self._by_employee.get(emp_id, [])
+        lo = bisect.bisect_left(entries, (first_day,)) if first_day else 0
+        hi = bisect.bisect_left(entries, (last_day + "~",)) if last_day else len(entries)
+        return self._resolve(entries[lo:hi])
+    
+    def on_days(self, data, emp_id, day_strs):
+        """{day_str: [(slot, shift)]} for employee emp_id on each of day_strs."""
+        result = {}
+        for day_str in day_strs:
+            result[day_str] = [(slot, shift) for _, slot, shift in self.shifts(data, emp_id, day_str, day_str)]
+        return result
+
+employee_shifts = EmployeeShiftIndex()
+
+def slot_span(start, end):
+    """Mask of the SLOT_MINUTES slots that start..end touches (0 if empty)."""
+    first = start // SLOT_MINUTES
+    last = -(-min(end, MINUTES_PER_DAY) // SLOT_MINUTES)
+    return ((1 << (last - first)) - 1) << first if last > first else 0
+
+def slot_inner(start, end):
+    """Mask of the SLOT_MINUTES slots lying wholly inside start..end (0 if none)."""
+    first = -(-start // SLOT_MINUTES)
+    last = min(end, MINUTES_PER_DAY) // SLOT_MINUTES
+    return ((1 << (last - first)) - 1) << first if last > first else 0
+
+class AvailabilityIndex:
+    """Date -> {employee id: mask of the SLOT_MINUTES slots they are free}.
+    
+    A day's mask is the weekday availability minus that date's time off and
+    the employee's shifts, so free() answers "who can work start..end" with
+    one AND per employee. For times on slot boundaries this matches the
+    availability, time-off and overlap checks of shift_conflicts(); other
+    times are rounded towards busy. Days are built on first use and dropped
+    for the days, months and employee changes save_data() reports.
+    """
+    
+    def __init__(self, model, time_off):
+        self._model = model         # the DataModel the shift views come from
+        self._time_off = time_off   # the TimeOffIndex time off is read from
+        self._data = None
+        self._weekly = None         # [(employee dict, [mask per weekday])]
+        self._days = {}             # day_str -> {employee id: mask}
+    
+    def invalidate(self, touched):
+        if touched is None:
+            self._data = None
+            return
+        for path in touched:
+            if path[0] == "employees":
+                self._weekly = None
+                self._days.clear()
+            elif path[0] == "schedule" and len(path) > 2:
+                self._days.pop(path[2], None)
+            elif path[0] == "schedule" and len(path) > 1:
+                for day_str in [d for d in self._days if d.startswith(path[1])]:
+                    del self._days[day_str]
+            elif path[0] == "schedule":
+                self._days.clear()
+    
+    def _employees(self, data):
+        if self._data is not data:
+            self._data = data
+            self._weekly = None
+            self._days = {}
+        if self._weekly is None:
+            self._weekly = []
+            for emp in data.get("employees", []):
+                # Availability until 11:59 PM runs to midnight, so overnight shifts can match it
+                masks = [slot_inner(hours[0], MINUTES_PER_DAY if hours[1] == MINUTES_PER_DAY - 1 else hours[1])
+                         if hours else 0
+                         for hours in Employee.from_dict(emp).availability]
+                self._weekly.append((emp, masks))
+        return self._weekly
+    
+    def day_masks(self, data, day_str):
+        """{employee id: free mask} for day_str."""
+        weekly = self._employees(data)
+        masks = self._days.get(day_str)
+        if masks is not None:
+            return masks
+        day_dt = datetime.strptime(day_str, DATE_FMT)
+        weekday, ordinal = day_dt.weekday(), day_dt.toordinal()
+        masks = {}
+        for emp, week in weekly:
+            mask = week[weekday]
+            for req in self._time_off.requests(data, emp, ordinal):
+                if req.full or req.start is None:
+                    mask = 0
+                else:
+                    mask &= ~slot_span(req.start, req.end)
+            masks[emp.get("id")] = mask
+        shifts = data.get("schedule", {}).get(day_str[:7], {}).get(day_str, [])
+        for shift in self._model.day_shifts(data, day_str, shifts):
+            if shift.employee not in masks:
+                continue
+            if shift.valid:
+                end = shift.end if shift.end > shift.start else MINUTES_PER_DAY
+                masks[shift.employee] &= ~slot_span(shift.start, end)
+            else:
+                masks[shift.employee] = 0
+        self._days[day_str] = masks
+        return masks
+    
+    def free(self, data, day_str, start, end):
+        """Employee dicts free for the whole of start..end (minutes) on day_str.
+        
+        An end at or before start (an overnight shift) runs to midnight, the
+        same way day_masks() blocks out such a shift; the next morning is not
+        checked.
+        """
+        if end <= start:
+            end = MINUTES_PER_DAY
+        wanted = slot_span(start, end)
+        if not wanted:
+            return []
+        masks = self.day_masks(data, day_str)
+        return [emp for emp, _ in self._weekly if masks[emp.get("id")] & wanted == wanted]
+
+availability_index = AvailabilityIndex(data_model, time_off_index)
+#!SECTION
+
+# SECTION Conflict audit
+# Shift validation over a ScheduleViews bundle, so the UI can validate
+# through the shared caches while the audit thread validates a snapshot
+# through caches of its own.
+class ScheduleViews:
+    """A data dict together with the caches shift validation and scheduling read from."""
+    __slots__ = ("data", "employees", "model", "store", "time_off", "hours", "availability")
+    
+    def __init__(self, data, employees=None, model=None, store=None, time_off=None, hours=None,
+                 availability=None):
+        self.data = data
+        self.employees = employees if employees is not None else EmployeeIndex()
+        self.model = model if model is not None else DataModel(self.employees)
+        self.store = store if store is not None else StoreCalendar()
+        self.time_off = time_off if time_off is not None else TimeOffIndex()
+        self.hours = hours if hours is not None else WeeklyHours(self.model)
+        self.availability = availability if availability is not None else AvailabilityIndex(self.model, self.time_off)
+
+def shared_views(data):
+    """ScheduleViews over the app-wide caches; only for the Tk thread."""
+    return ScheduleViews(data, employee_index, data_model, store_calendar, time_off_index, weekly_hours,
+                         availability_index)
+
+def shift_conflicts(views, emp_ref, day_str, start_time, end_time, exclude_shift_index=None, batch_minutes=0):
+    """The (kind, message) conflicts of placing one shift on day_str, plus its
+    (start, end) minutes, which are None when the checks stopped early.
+    
+    emp_ref is a shift_ref(): the employee id, or the stored name of a shift
+    matching no employee. batch_minutes are paid minutes the employee has
+    that ISO week in shifts not stored yet, e.g. earlier shifts of a batch.
+    """
+    conflicts = []
+    
+    # Basic time validation; everything below compares minutes since midnight
+    try:
+        start_min = parse_minutes(start_time)
+        end_min = parse_minutes(end_time)
+        if end_min <= start_min:
+            conflicts.append(("time", "End time must be after start time"))
+            return conflicts, None
+    except Exception:
+        conflicts.append(("time", "Invalid time format"))
+        return conflicts, None
+    
+    # Check store modifications (closures and modified hours)
+    store_day = views.store.day(views.data, day_str)
+    if store_day.modification == "closure":
+        conflicts.append(("store", f"Store is closed on this date. Reason: {store_day.reason_text}"))
+        return conflicts, None
+    elif store_day.modification == "modified_hours":
+        if store_day.opening is None:
+            conflicts.append(("store", "Error validating modified store hours"))
+        else:
+            if start_min < store_day.opening:
+                conflicts.append(("store", f"Shift starts at {start_time} but store opens at {store_day.hours[0]} due to: {store_day.reason_text}"))
+            if end_min > store_day.closing:
+                conflicts.append(("store", f"Shift ends at {end_time} but store closes at {store_day.hours[1]} due to: {store_day.reason_text}"))
+    
+    # Find employee data; the name is only used in the messages
+    employee = views.model.employee(views.data, emp_ref)
+    if employee is None:
+        conflicts.append(("employee", "Employee not found"))
+        return conflicts, None
+    emp_name = employee.name
+    
+    # Get day of week for availability check
+    day_dt = datetime.strptime(day_str, DATE_FMT)
+    day_name = day_dt.strftime("%A").lower()
+    
+    # Check requested days off
+    for req in views.time_off.requests(views.data, employee.source, day_dt.toordinal()):
+        if req.full:
+            conflicts.append(("time_off", f"{emp_name} requested this entire day off"))
+        elif req.start is None:
+            # if malformed, treat as full day off
+            conflicts.append(("time_off", f"{emp_name} has a time off request for this day"))
+        elif start_min < req.end and req.start < end_min:
+            conflicts.append(("time_off", f"{emp_name} requested time off from {req.times[0]} to {req.times[1]}"))
+    
+    # Check day availability
+    availability = employee.availability[day_dt.weekday()]
+    if availability is None:
+        conflicts.append(("availability", f"{emp_name} is not available on {day_name.capitalize()}s"))
+    elif availability is False:
+        conflicts.append(("availability", f"{emp_name}'s availability data is invalid for {day_name}"))
+    else:
+        stored = employee.source["availability"][day_name]
+        if start_min < availability[0]:
+            conflicts.append(("availability", f"Shift starts at {start_time} but {emp_name} is only available from {stored[0]}"))
+        if end_min > availability[1]:
+            conflicts.append(("availability", f"Shift ends at {end_time} but {emp_name} is only available until {stored[1]}"))
+    
+    # Check for overlap with existing shifts (skipping the shift we're editing)
+    month_key = f"{day_dt.year}-{day_dt.month:02d}"
+    shifts = views.data.get("schedule", {}).get(month_key, {}).get(day_str, [])
+    intervals = views.model.day_intervals(views.data, day_str, shifts)
+    overlapping = intervals.overlapping(employee.id, start_min, end_min, exclude_shift_index)
+    unreadable = [i for i in intervals.invalid.get(employee.id, ()) if i != exclude_shift_index]
+    for i in sorted(overlapping + unreadable):
+        if i in overlapping:
+            conflicts.append(("overlap", f"Overlaps with existing shift ({shifts[i]['start']} - {shifts[i]['end']})"))
+        else:
+            conflicts.append(("overlap", "Error checking overlap with existing shift"))
+    
+    # Check the overtime threshold against the running weekly total
+    settings = views.data.get("settings", {})
+    threshold = settings.get("overtime_threshold")
+    if threshold:
+        break_minutes = settings.get("default_break_time") or 0
+        week_minutes = views.hours.minutes(views.data, employee.id, day_str, break_minutes)
+        if exclude_shift_index is not None and exclude_shift_index < len(shifts):
+            replaced = views.model.day_shifts(views.data, day_str, shifts)[exclude_shift_index]
+            if replaced.employee == employee.id:
+                week_minutes -= WeeklyHours.paid_minutes(replaced, break_minutes)
+        week_minutes += batch_minutes + max(end_min - start_min - break_minutes, 0)
+        if week_minutes > threshold * 60:
+            week_of = WeeklyHours.week_start(day_str).strftime("%b %d")
+            conflicts.append(("overtime", f"{emp_name} would be scheduled {week_minutes / 60:.1f} hours "
+                                          f"in the week of {week_of}, over the {threshold}-hour overtime threshold"))
+    
+    return conflicts, (start_min, end_min)
+
+def snapshot_for_audit(data, days):
+    """Copy of everything validating the shifts on days reads, safe to hand to another thread.
+    
+    The schedule is copied for the whole ISO weeks days fall in, so weekly
+    hours and overtime see every shift of those weeks.
+    """
+    mondays = sorted({WeeklyHours.week_start(day_str) for day_str in days})
+    schedule = {}
+    source = data.get("schedule", {})
+    for day_str in [(monday + timedelta(days=i)).strftime(DATE_FMT) for monday in mondays for i in range(7)]:
+        shifts = source.get(day_str[:7], {}).get(day_str)
+        if shifts:
+            schedule.setdefault(day_str[:7], {})[day_str] = [dict(shift) for shift in shifts]
+    return {
+        "employees": copy.deepcopy(data.get("employees", [])),
+        "store_hours": copy.deepcopy(data.get("store_hours", {})),
+        "store_modifications": copy.deepcopy(data.get("store_modifications", {})),
+        "settings": dict(data.get("settings", {})),
+        "coverage_requirements": copy.deepcopy(data.get("coverage_requirements", {})),
+        "schedule": schedule,
+    }
+
+def stored_shift_conflicts(views, day_str, slot, shift):
+    """[ShiftConflict] for the shift already stored at slot on day_str."""
+    found, _ = shift_conflicts(views, shift_ref(shift), day_str, shift.get("start"), shift.get("end"), slot)
+    return [ShiftConflict(day_str, slot, kind, message) for kind, message in found]
+
+class ConflictAudit:
+    """Re-validates every stored shift in a date range on a worker thread.
+    
+    start() snapshots the range on the calling thread and audits the copy
+    in the background; poll() returns (days, report) once it finishes,
+    where report maps day_str -> [ShiftConflict] (index is the shift's
+    slot in the day) for the days with problems, or is None if the audit
+    failed. Starting a new audit discards an unfinished one.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._done = None  # (generation, days, report) of the last finished audit
+        self.last_range = None  # (first_day, last_day) of the last audit started
+        self.on_start = None    # called on the starting thread after each start(), e.g. to poll
+    
+    @staticmethod
+    def audit(data, days):
+        """Audit the shifts on days synchronously and return the report."""
+        views = ScheduleViews(data)
+        report = {}
+        for day_str in days:
+            shifts = data.get("schedule", {}).get(day_str[:7], {}).get(day_str, [])
+            found = [conflict for slot, shift in enumerate(shifts)
+                     for conflict in stored_shift_conflicts(views, day_str, slot, shift)]
+            if found:
+                report[day_str] = found
+        return report
+    
+    def start(self, data, first_day, last_day):
+        """Begin auditing first_day..last_day (date objects, inclusive) in the background."""
+        days = [(first_day + timedelta(days=n)).strftime(DATE_FMT)
+                for n in range((last_day - first_day).days + 1)]
+        snapshot = snapshot_for_audit(data, days)
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+        self.last_range = (first_day, last_day)
+        threading.Thread(target=self._run, args=(generation, snapshot, days),
+                         name="conflict-audit", daemon=True).start()
+        if self.on_start is not None:
+            self.on_start()
+    
+    def rerun(self, data):
+        """Audit the last audited range again, e.g. after a change of unknown extent."""
+        if self.last_range is not None:
+            self.start(data, *self.last_range)
+    
+    def _run(self, generation, snapshot, days):
+        try:
+            report = self.audit(snapshot, days)
+        except Exception as e:
+            print(f"Conflict audit failed: {e}")
+            report = None
+        with self._lock:
+            if generation == self._generation:
+                self._done = (generation, days, report)
+    
+    def poll(self):
+        """(days, report) of the latest audit once it has finished, else None (each is returned once)."""
+        with self._lock:
+            done, self._done = self._done, None
+            if done is None or done[0] != self._generation:
+                return None
+        return done[1], done[2]
+
+conflict_audit = ConflictAudit()
+
+class ConflictSet:
+    """day_str -> [ShiftConflict] for the stored shifts known to fail validation.
+    
+    Kept for the whole session and read by the calendar badges. Audits
+    replace whole days through merge_audit(); in between, save_data() and
+    the employee editor re-validate only the shifts their change can affect. Days re-validated after an audit's snapshot was
+    taken keep their newer findings when that audit is merged.
+    """
+    
+    def __init__(self):
+        self._days = {}
+        self.stamp = 0      # bumped by every targeted re-validation
+        self._updated = {}  # day_str -> stamp of its last targeted re-validation
+    
+    def day(self, day_str):
+        """The conflicts found on day_str, in slot order."""
+        return self._days.get(day_str, [])
+    
+    def merge_audit(self, days, report, stamp):
+        """Take an audit's findings for days, except days re-validated since stamp."""
+        for day_str in days:
+            if self._updated.get(day_str, 0) <= stamp:
+                self._set_day(day_str, report.get(day_str, []))
+    
+    def _set_day(self, day_str, found):
+        if found:
+            self._days[day_str] = found
+        else:
+            self._days.pop(day_str, None)
+    
+    def _revalidate(self, views, day_str, slots=None):
+        """Re-check the shifts at slots (all of them for None) on day_str, keeping its other findings."""
+        shifts = views.data.get("schedule", {}).get(day_str[:7], {}).get(day_str, [])
+        if slots is None:
+            slots = range(len(shifts))
+            kept = []
+        else:
+            kept = [conflict for conflict in self._days.get(day_str, []) if conflict.index not in slots]
+        found = [conflict for slot in slots if slot < len(shifts)
+                 for conflict in stored_shift_conflicts(views, day_str, slot, shifts[slot])]
+        # sorted() is stable, so each shift's messages keep their order
+        self._set_day(day_str, sorted(kept + found, key=lambda conflict: conflict.index))
+        self._updated[day_str] = self.stamp
+    
+    def days_changed(self, views, days):
+        """Re-validate every shift on days."""
+        self.stamp += 1
+        for day_str in days:
+            self._revalidate(views, day_str)
+    
+    def employee_changed(self, views, emp, weekdays, dates):
+        """Re-validate emp's shifts on the named weekdays and on the DATE_FMT dates."""
+        if not weekdays and not dates:
+            return
+        self.stamp += 1
+        slots_by_day = {}
+        # Months not loaded yet have no findings; they are audited once displayed
+        for day_str, slot, _ in employee_shifts.shifts(views.data, emp.get("id"), loaded_only=True):
+            if day_str in dates or Employee.WEEKDAYS[datetime.strptime(day_str, DATE_FMT).weekday()] in weekdays:
+                slots_by_day.setdefault(day_str, set()).add(slot)
+        for day_str, slots in slots_by_day.items():
+            self._revalidate(views, day_str, slots)
+    
+    def invalidate(self, data, touched):
+        """Follow save_data(): re-validate the touched days (schedule days and store
+        modifications), re-word the findings after employee changes and forget
+        the days under wider schedule changes. A change of unknown extent
+        re-runs the last audit, keeping the current findings until it lands."""
+        if touched is None:
+            conflict_audit.rerun(data)
+            return
+        days = []
+        for path in touched:
+            if path[0] == "employees":
+                # Messages name the employee, and removals drop shifts
+                days.extend(self._days)
+            elif path[0] == "store_modifications" and len(path) > 1:
+                days.append(path[1])
+            elif path[0] != "schedule":
+                continue
+            elif len(path) > 2:
+                days.append(path[2])
+            else:
+                prefix = path[1] if len(path) > 1 else ""
+                for day_str in [d for d in self._days if d.startswith(prefix)]:
+                    del self._days[day_str]
+        if days:
+            self.days_changed(shared_views(data), dict.fromkeys(days))
+
+schedule_conflicts = ConflictSet()
+#!SECTION
+
+# SECTION Coverage
+# Staffing requirements are headcounts per COVERAGE_SLOT_MINUTES slot, kept
+# per weekday with optional whole-day rows for single dates:
+#   data["coverage_requirements"] = {"weekly": {"saturday": [0, ..., 3, ...]},
+#                                    "overrides": {"2025-12-24": [...]}}
+COVERAGE_SLOTS = MINUTES_PER_DAY // COVERAGE_SLOT_MINUTES
+
+def coverage_requirement(data, day_str):
+    """day_str's [headcount per slot]: its date override, else its weekday's row, else None."""
+    requirements = data.get("coverage_requirements", {})
+    row = requirements.get("overrides", {}).get(day_str)
+    if row is None:
+        day_name = Employee.WEEKDAYS[datetime.strptime(day_str, DATE_FMT).weekday()]
+        row = requirements.get("weekly", {}).get(day_name)
+    if row is None:
+        return None
+    row = [max(int(count), 0) for count in row[:COVERAGE_SLOTS]]
+    return row + [0] * (COVERAGE_SLOTS - len(row))
+
+def requirement_ranges(row):
+    """[(start, end, count)] minute runs of equal non-zero headcount in a requirement row."""
+    ranges = []
+    for slot, count in enumerate(row):
+        if not count:
+            continue
+        if ranges and ranges[-1][1] == slot * COVERAGE_SLOT_MINUTES and ranges[-1][2] == count:
+            ranges[-1] = (ranges[-1][0], (slot + 1) * COVERAGE_SLOT_MINUTES, count)
+        else:
+            ranges.append((slot * COVERAGE_SLOT_MINUTES, (slot + 1) * COVERAGE_SLOT_MINUTES, count))
+    return ranges
+
+class CoverageMatrix:
+    """Headcount and required headcount per (day, COVERAGE_SLOT_MINUTES slot).
+    
+    A shift counts towards the slots it covers completely. Requirements
+    only apply while the store is open, so a closed day requires nobody.
+    open_slots[row] is the (first, last) slot range of the day's store
+    hours, or None when closed.
+    """
+    __slots__ = ("days", "headcount", "required", "open_slots")
+    
+    def __init__(self, views, days):
+        self.days = list(days)
+        width = COVERAGE_SLOTS
+        
+        # Difference array over every day's slots, accumulated in one pass
+        diff = [0] * (len(self.days) * width + 1)
+        for row, day_str in enumerate(self.days):
+            base = row * width
+            shifts = views.data.get("schedule", {}).get(day_str[:7], {}).get(day_str, [])
+            for shift in views.model.day_shifts(views.data, day_str, shifts):
+                if not shift.valid:
+                    continue
+                end = shift.end if shift.end > shift.start else MINUTES_PER_DAY
+                first, last = -(-shift.start // COVERAGE_SLOT_MINUTES), end // COVERAGE_SLOT_MINUTES
+                if last > first:
+                    diff[base + first] += 1
+                    diff[base + last] -= 1
+        counts = list(itertools.accumulate(diff))
+        self.headcount = [counts[row * width:(row + 1) * width] for row in range(len(self.days))]
+        
+        self.required = []
+        self.open_slots = []
+        for day_str in self.days:
+            store_day = views.store.day(views.data, day_str)
+            row = [0] * width
+            if store_day.opening is None or store_day.closing <= store_day.opening:
+                self.open_slots.append(None)
+            else:
+                first = -(-store_day.opening // COVERAGE_SLOT_MINUTES)
+                last = store_day.closing // COVERAGE_SLOT_MINUTES
+                self.open_slots.append((first, last))
+                wanted = coverage_requirement(views.data, day_str)
+                if wanted is not None:
+                    row[first:last] = wanted[first:last]
+            self.required.append(row)
+    
+    def balance(self, row):
+        """[headcount - required] per slot of the row-th day."""
+        return [have - need for have, need in zip(self.headcount[row], self.required[row])]
+    
+    def runs(self, row):
+        """[(start, end, have, need)] minute runs of unequal headcount and requirement in the row-th day's store hours."""
+        if self.open_slots[row] is None:
+            return []
+        runs = []
+        first, last = self.open_slots[row]
+        for slot in range(first, last):
+            have, need = self.headcount[row][slot], self.required[row][slot]
+            if have == need or not need:
+                continue
+            if runs and runs[-1][1] == slot * COVERAGE_SLOT_MINUTES and runs[-1][2:] == (have, need):
+                runs[-1] = (runs[-1][0], (slot + 1) * COVERAGE_SLOT_MINUTES, have, need)
+            else:
+                runs.append((slot * COVERAGE_SLOT_MINUTES, (slot + 1) * COVERAGE_SLOT_MINUTES, have, need))
+        return runs
+#!SECTION
+
+# SECTION Auto-scheduling
+# Fills store hours with shifts read off a ScheduleViews bundle and hands
+# back a proposal; nothing is written until the user accepts it.
+class ScheduleProposal:
+    """Shifts an auto-schedule run would add and the staffing it could not meet.
+    
+    shifts maps day_str -> [new shift dict]. gaps maps day_str ->
+    [(start, end, missing)] runs of minutes still under the required
+    headcount, missing being the largest shortfall in the run, and
+    short_slots counts every missing person-slot.
+    """
+    __slots__ = ("shifts", "gaps", "short_slots")
+    
+    def __init__(self):
+        self.shifts = {}
+        self.gaps = {}
+        self.short_slots = 0
+    
+    @property
+    def shift_count(self):
+        return sum(len(day_shifts) for day_shifts in self.shifts.values())
+
+class ScheduleGenerator:
+    """Greedy auto-scheduler.
+    
+    Day by day it takes the earliest slot below the required headcount and
+    gives it to the free employee with the fewest paid minutes that week,
+    trying shift lengths from shift_minutes down to MIN_AUTO_SHIFT_MINUTES
+    before recording the slot as a gap. Candidates come from the views'
+    AvailabilityIndex, so availability, time off and existing shifts are
+    respected. Shifts stay on the 30-minute grid of the day's store hours
+    (store_modifications included), nobody gets two shifts on a day and
+    nobody is taken past the overtime threshold. rng, when given, adds up
+    to LOAD_NOISE_MINUTES of random weight to each employee's load, so
+    repeated runs explore different assignments.
+    """
+    
+    LOAD_NOISE_MINUTES = 120
+    
+    def __init__(self, views, min_staff=None, shift_minutes=None, rng=None):
+        settings = views.data.get("settings", {})
+        self.views = views
+        self.min_staff = settings.get("min_staff_per_slot", 2) if min_staff is None else min_staff
+        self.shift_minutes = shift_minutes or (settings.get("default_shift_length") or 8) * 60
+        self.break_minutes = settings.get("default_break_time") or 0
+        threshold = settings.get("overtime_threshold")
+        self.max_week_minutes = threshold * 60 if threshold else None
+        self.rng = rng
+    
+    def required(self, day_str, store_day):
+        """Headcount wanted in each SLOT_MINUTES slot of day_str: the day's
+        coverage requirement if it has one, else min_staff throughout store hours."""
+        need = [0] * (MINUTES_PER_DAY // SLOT_MINUTES)
+        wanted = coverage_requirement(self.views.data, day_str)
+        for slot in range(-(-store_day.opening // SLOT_MINUTES), store_day.closing // SLOT_MINUTES):
+            if wanted is None:
+                need[slot] = self.min_staff
+            else:
+                need[slot] = wanted[slot * SLOT_MINUTES // COVERAGE_SLOT_MINUTES]
+        return need
+    
+    def run(self, days):
+        """A ScheduleProposal filling each of days (DATE_FMT strings, in order)."""
+        proposal = ScheduleProposal()
+        added = {}  # (employee id, week start) -> paid minutes proposed so far
+        for day_str in days:
+            self._fill_day(day_str, proposal, added)
+        return proposal
+    
+    def _fill_day(self, day_str, proposal, added):
+        data = self.views.data
+        store_day = self.views.store.day(data, day_str)
+        if store_day.opening is None or store_day.closing <= store_day.opening:
+            return
+        opening, closing = store_day.opening, store_day.closing
+        need = self.required(day_str, store_day)
+        shifts = data.get("schedule", {}).get(day_str[:7], {}).get(day_str, [])
+        for shift in self.views.model.day_shifts(data, day_str, shifts):
+            if shift.valid:
+                end = shift.end if shift.end > shift.start else MINUTES_PER_DAY
+                for slot in range(shift.start // SLOT_MINUTES, -(-end // SLOT_MINUTES)):
+                    need[slot] -= 1
+        
+        masks = dict(self.views.availability.day_masks(data, day_str))
+        intervals = self.views.model.day_intervals(data, day_str, shifts)
+        week_start = WeeklyHours.week_start(day_str)
+        candidates = []
+        load = {}
+        for emp in data.get("employees", []):
+            emp_id = emp.get("id")
+            if not masks.get(emp_id) or intervals.has(emp_id):
+                continue
+            candidates.append(emp)
+            load[emp_id] = (self.views.hours.minutes(data, emp_id, day_str, self.break_minutes)
+                            + added.get((emp_id, week_start), 0))
+        
+        slot = 0
+        while True:
+            slot = next((i for i in range(slot, len(need)) if need[i] > 0), None)
+            if slot is None:
+                break
+            slot_start = slot * SLOT_MINUTES
+            start = max(opening, opening + (slot_start - opening) // 30 * 30)
+            end = min(start + self.shift_minutes, closing)
+            shortest = min(MIN_AUTO_SHIFT_MINUTES, closing - start)
+            best = None
+            while best is None and end - start >= shortest and end > slot_start:
+                wanted = slot_span(start, end)
+                paid = max(end - start - self.break_minutes, 0)
+                best_key = None
+                for emp in candidates:
+                    emp_id = emp.get("id")
+                    if masks[emp_id] & wanted != wanted:
+                        continue
+                    if self.max_week_minutes is not None and load[emp_id] + paid > self.max_week_minutes:
+                        continue
+                    key = load[emp_id] + (self.rng.random() * self.LOAD_NOISE_MINUTES if self.rng else 0)
+                    if best_key is None or key < best_key:
+                        best, best_key = emp, key
+                if best is None:
+                    end = start + (end - start - 1) // 30 * 30
+            if best is None:
+                slot += 1
+                continue
+            
+            emp_id = best.get("id")
+            proposal.shifts.setdefault(day_str, []).append(
+                {"employee_id": emp_id, "start": format_minutes(start), "end": format_minutes(end)})
+            candidates.remove(best)
+            masks[emp_id] &= ~wanted
+            load[emp_id] += paid
+            added[(emp_id, week_start)] = added.get((emp_id, week_start), 0) + paid
+            for i in range(start // SLOT_MINUTES, -(-end // SLOT_MINUTES)):
+                need[i] -= 1
+        
+        # Whatever is still short becomes runs of (start, end, largest shortfall)
+        gaps = []
+        for i, missing in enumerate(need):
+            if missing <= 0:
+                continue
+            proposal.short_slots += missing
+            if gaps and gaps[-1][1] == i * SLOT_MINUTES:
+                gaps[-1] = (gaps[-1][0], (i + 1) * SLOT_MINUTES, max(gaps[-1][2], missing))
+            else:
+                gaps.append((i * SLOT_MINUTES, (i + 1) * SLOT_MINUTES, missing))
+        if gaps:
+            proposal.gaps[day_str] = gaps
+
+def proposal_score(views, proposal, days):
+    """(unstaffed person-minutes, overtime minutes, spread) of a proposal for days.
+    
+    Lower is better, compared in that order. spread is the standard
+    deviation of the paid minutes per employee and ISO week over the weeks
+    days fall in, existing shifts included.
+    """
+    settings = views.data.get("settings", {})
+    break_minutes = settings.get("default_break_time") or 0
+    threshold = settings.get("overtime_threshold")
+    added = {}  # (employee id, week start) -> proposed paid minutes
+    for day_str, day_shifts in proposal.shifts.items():
+        week_start = WeeklyHours.week_start(day_str)
+        for shift in day_shifts:
+            key = (shift["employee_id"], week_start)
+            minutes = parse_minutes(shift["end"]) - parse_minutes(shift["start"])
+            added[key] = added.get(key, 0) + max(minutes - break_minutes, 0)
+    totals = []
+    overtime = 0
+    for week_start in sorted({WeeklyHours.week_start(day_str) for day_str in days}):
+        week_day = week_start.strftime(DATE_FMT)
+        for emp in views.data.get("employees", []):
+            emp_id = emp.get("id")
+            total = views.hours.minutes(views.data, emp_id, week_day, break_minutes) + added.get((emp_id, week_start), 0)
+            totals.append(total)
+            if threshold:
+                overtime += max(total - threshold * 60, 0)
+    spread = 0.0
+    if totals:
+        mean = sum(totals) / len(totals)
+        spread = round((sum((total - mean) ** 2 for total in totals) / len(totals)) ** 0.5, 3)
+    return proposal.short_slots * SLOT_MINUTES, overtime, spread
+
+def schedule_candidate(views, days, min_staff, seed):
+    """(score, ScheduleProposal) of one generator pass; seed None is the plain greedy pass."""
+    rng = random.Random(seed) if seed is not None else None
+    proposal = ScheduleGenerator(views, min_staff=min_staff, rng=rng).run(days)
+    return proposal_score(views, proposal, days), proposal
+
+_worker_views = None  # the ScheduleViews a process-pool worker runs candidates against
+
+def _init_optimizer_worker(snapshot):
+    global _worker_views
+    _worker_views = ScheduleViews(snapshot)
+
+def _run_optimizer_candidate(days, min_staff, seed):
+    return schedule_candidate(_worker_views, days, min_staff, seed)
+
+class ScheduleOptimizer:
+    """Multi-start auto-scheduling: the plain greedy pass plus randomized
+    passes, each scored by proposal_score(), keeping the best.
+    
+    Candidates run on a spawned process pool over a snapshot of the data,
+    taken when the optimizer is created, so run() may be called from any
+    thread. With one worker, or when no pool can be started, they run in
+    this process. Candidate seeds are drawn from random.Random(seed) and
+    ties go to the earlier candidate, so the same seed and candidate count
+    give the same schedule unless time_budget (seconds) cuts the run short.
+    """
     
-    # Ensure store_hours exists (for backwards compatibility)
-    if "store_hours" not in data:
-        data["store_hours"] = {
-            "monday": ("8:30 AM", "7:00 PM"),
-            "tuesday": ("8:30 AM", "7:00 PM"),
-            "wednesday": ("8:30 AM", "7:00 PM"),
-            "thursday": ("8:30 AM", "7:00 PM"),
-            "friday": ("8:30 AM", "7:00 PM"),
-            "saturday": ("9:00 AM", "3:00 PM"),
-            "sunday": None
-        }
-        save_data(data)
+    def __init__(self, data, days, min_staff=None, seed=0, candidates=16, time_budget=10.0, workers=None):
+        self.days = list(days)
+        self.min_staff = min_staff
+        self.seed = seed
+        self.candidates = max(candidates, 1)
+        self.time_budget = time_budget
+        self.workers = max(min(workers or os.cpu_count() or 1, self.candidates), 1)
+        self.snapshot = snapshot_for_audit(data, self.days)
+        self.evaluated = 0
+        self.best_index = None
+        self.elapsed = 0.0
     
-    return data
-
-def save_data(data):
-    with open(DATA_FILE, "w") as f:
-        json.dump(data, f, indent=4)
-
-def generate_times(start_str, end_str, interval_minutes=30):
-    """Return list of times between start and end inclusive formatted with TIME_FMT."""
-    start_dt = datetime.strptime(start_str, TIME_FMT)
-    end_dt = datetime.strptime(end_str, TIME_FMT)
-    times = []
-    current = start_dt
-    while current <= end_dt:
-        times.append(current.strftime(TIME_FMT))
-        current += timedelta(minutes=interval_minutes)
-    return times
-
-def get_store_hours_for_date(date_str, store_hours_data, store_modifications=None):
-    """Get store hours for a specific date based on day of week and modifications."""
-    try:
-        # First check for store modifications on this specific date
-        if store_modifications and date_str in store_modifications:
-            modification = store_modifications[date_str]
-            if modification["type"] == "closure":
-                # Store is closed this day due to modification
-                return None
-            elif modification["type"] == "modified_hours":
-                # Return modified hours
-                return [modification["opening_time"], modification["closing_time"]]
-        
-        # No modifications, check regular store hours
-        date_obj = datetime.strptime(date_str, DATE_FMT)
-        day_name = date_obj.strftime('%A').lower()
-        store_hours = store_hours_data.get(day_name)
-        
-        if store_hours is None:
-            # Store is closed this day
-            return None
-        elif isinstance(store_hours, list) and len(store_hours) == 2:
-            return store_hours
-        else:
-            # Fallback to default hours
-            return ["8:30 AM", "7:00 PM"]
-    except Exception:
-        # Fallback to default hours on any JSON/data parsing error
-        return ["8:30 AM", "7:00 PM"]
+    def run(self):
+        """The best ScheduleProposal found."""
+        started = time.monotonic()
+        deadline = started + self.time_budget
+        master = random.Random(self.seed)
+        seeds = [None] + [master.randrange(2 ** 32) for _ in range(self.candidates - 1)]
+        results = {}
+        if self.workers > 1:
+            try:
+                results = self._run_pool(seeds, deadline)
+            except Exception as e:
+                # e.g. process creation is not permitted here; fall back to this process
+                print(f"Schedule optimizer could not use a process pool: {e}")
+        if not results:
+            views = ScheduleViews(self.snapshot)
+            for index, seed in enumerate(seeds):
+                if results and time.monotonic() > deadline:
+                    break
+                results[index] = schedule_candidate(views, self.days, self.min_staff, seed)
+        self.evaluated = len(results)
+        self.best_index = min(results, key=lambda index: (results[index][0], index))
+        self.elapsed = time.monotonic() - started
+        return results[self.best_index][1]
+    
+    def _run_pool(self, seeds, deadline):
+        multiprocessing = load_multiprocessing()
+        results = {}
+        # Spawned, not forked: a fork from this threaded process could hand a
+        # worker a lock (e.g. the time codec's) that another thread holds
+        pool = multiprocessing.get_context("spawn").Pool(self.workers, initializer=_init_optimizer_worker,
+                                                          initargs=(self.snapshot,))
+        try:
+            pending = {index: pool.apply_async(_run_optimizer_candidate, (self.days, self.min_staff, seed))
+                       for index, seed in enumerate(seeds)}
+            while pending and time.monotonic() < deadline:
+                for index in [index for index, result in pending.items() if result.ready()]:
+                    results[index] = pending.pop(index).get()
+                if pending:
+                    time.sleep(0.01)
+        finally:
+            # Candidates still running past the time budget are stopped with their workers
+            pool.terminate()
+            pool.join()
+        return results
+
+class Replacement:
+    """A candidate to take over a shift. week_minutes are their paid minutes
+    that ISO week before taking it, headroom the minutes left under the
+    overtime threshold after (None without a threshold) and same_day whether
+    they already work another shift that day."""
+    __slots__ = ("employee", "week_minutes", "headroom", "same_day")
+    
+    def __init__(self, employee, week_minutes, headroom, same_day):
+        self.employee = employee
+        self.week_minutes = week_minutes
+        self.headroom = headroom
+        self.same_day = same_day
+
+def replacement_candidates(views, day_str, start, end, exclude=None):
+    """[Replacement] for everyone who could work start..end (minutes) on day_str, best first.
+    
+    Everyone listed is available, has no time off and no overlapping shift
+    then (read from the AvailabilityIndex). Those staying within the
+    overtime threshold come first, then those without another shift that
+    day, then the fewest paid minutes that week. exclude is an employee id
+    to leave out, e.g. whoever called off.
+    """
+    data = views.data
+    settings = data.get("settings", {})
+    break_minutes = settings.get("default_break_time") or 0
+    threshold = settings.get("overtime_threshold")
+    paid = max(end - start - break_minutes, 0)
+    intervals = views.model.day_intervals(data, day_str)
+    candidates = []
+    for emp in views.availability.free(data, day_str, start, end):
+        emp_id = emp.get("id")
+        if emp_id == exclude:
+            continue
+        week_minutes = views.hours.minutes(data, emp_id, day_str, break_minutes)
+        headroom = threshold * 60 - week_minutes - paid if threshold else None
+        candidates.append(Replacement(emp, week_minutes, headroom, intervals.has(emp_id)))
+    candidates.sort(key=lambda c: (c.headroom is not None and c.headroom < 0, c.same_day, c.week_minutes,
+                                   c.employee.get("name", "").lower()))
+    return candidates
+#!SECTION
 
 # Auto-Update System Functions
 def version_compare(version1, version2):
@@ -129,6 +2885,7 @@ def check_for_updates(callback=None):
     """Check GitHub for latest release version. Runs in background thread."""
     def _check():
         try:
+            requests = load_requests()
             response = requests.get(UPDATE_CHECK_URL, timeout=10)
             if response.status_code == 200:
                 release_data = response.json()
@@ -236,21 +2993,6 @@ def create_update_assistant():
 def friendly_weekday_name(dt):
     return dt.strftime("%A")  # 'Monday' etc.
 
-def format_time_simple(time_str):
-    """Convert '7:00 PM' format to '7' or '7:30' format."""
-    try:
-        dt = datetime.strptime(time_str, TIME_FMT)
-        hour = dt.hour
-        if hour > 12:
-            hour -= 12
-        elif hour == 0:
-            hour = 12
-        if dt.minute == 0:
-            return str(hour)
-        return f"{hour}:{dt.minute:02d}"
-    except ValueError:
-        return time_str  # Return original if parsing fails
-
 class WorkSchedulerApp:
     def __init__(self, root):
         self.root = root
@@ -394,14 +3136,15 @@ class WorkSchedulerApp:
 
         # Data
         self.data = load_data()
-        if "schedule" not in self.data:
-            self.data["schedule"] = {}
+        startup_profile.mark("load_data")
             
         # Initialize application settings
         self.init_settings()
+        startup_profile.mark("init_settings")
         
         # Load color toggle preference from settings
         self.show_employee_colors = self.get_setting('show_employee_colors', True)
+        self.show_coverage = self.get_setting('show_coverage_heatmap', False)
             
         # Current month shown
         today = date.today()
@@ -439,8 +3182,11 @@ class WorkSchedulerApp:
 
         # Build UI
         self.setup_employee_tab()
+        startup_profile.mark("employee tab")
         self.setup_schedule_tab()
+        startup_profile.mark("schedule tab")
         self.setup_store_hours_tab()
+        startup_profile.mark("store hours tab")
         
         # Show splash screen if enabled
         if self.get_setting('show_splash_screen', True):
@@ -449,15 +3195,46 @@ class WorkSchedulerApp:
             # If splash screen is disabled, show the main window immediately
             self.root.deiconify()
         
-        # Check for updates on startup (in background)
-        self.check_for_updates_on_startup()
+        # Check for updates on startup (in background, once the window is up so
+        # importing requests doesn't compete with building the UI)
+        self.root.after(UPDATE_CHECK_DELAY_MS, self.check_for_updates_on_startup)
         
         # Check if this was started after an update
         self.check_for_update_completion()
+        startup_profile.mark("splash and update check")
         
         # Bind resize event
         self.root.bind("<Configure>", self.on_window_resize)
         
+        # Make sure pending saves reach the disk before the window closes
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+    def on_close(self):
+        """Finish any pending saves, then close the application"""
+        if getattr(self, '_employee_dirty', False):
+            try:
+                self.save_employee_changes(silent=True)
+            except Exception as e:
+                print(f"Error saving employee changes on exit: {e}")
+        if not flush_data(timeout=10):
+            error = f"\n\n{data_writer.last_error}" if data_writer.last_error else ""
+            messagebox.showwarning("Saving", f"Some changes could not be written to disk yet.{error}")
+        self.root.destroy()
+    
+    def sqlite_indexes_ready(self):
+        """True when the SQLite indexes can answer a query. Otherwise callers
+        answer from memory, and a failing background save is reported once."""
+        if not sqlite_store.active:
+            return False
+        if sqlite_store.indexes_ready():
+            return True
+        error = data_writer.last_error
+        if error is not None and error is not getattr(self, '_reported_save_error', None):
+            self._reported_save_error = error
+            messagebox.showwarning("Saving", f"Recent changes could not be written to disk:\n\n{error}\n\n"
+                                   "They are kept while the app is open and saved again with your next change.")
+        return False
+        
     def create_modern_button(self, parent, text, command=None, style='primary', width=None, font_size_offset=0):
         """Create a modern styled button with hover effects"""
         if style == 'primary':
@@ -571,6 +3348,7 @@ class WorkSchedulerApp:
         help_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Help", menu=help_menu)
         help_menu.add_command(label="Check for Updates", command=self.manual_check_for_updates)
+        help_menu.add_command(label="Storage Statistics", command=self.show_storage_stats_dialog)
         help_menu.add_separator()
         help_menu.add_command(label=f"About Work Scheduler v{APP_VERSION}", command=self.show_about_dialog)
     
@@ -618,6 +3396,33 @@ Brought to you by WILLSTER"""
         # Close button
         tk.Button(content_frame, text="Close", command=dialog.destroy).pack(pady=(20, 0))
         
+    def show_storage_stats_dialog(self):
+        """Show save/storage diagnostics."""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Storage Statistics")
+        dialog.resizable(False, False)
+        dialog.transient(self.root)
+        
+        self.center_dialog(dialog, 360, 290)
+        
+        content_frame = tk.Frame(dialog, padx=20, pady=20)
+        content_frame.pack(fill="both", expand=True)
+        
+        lookups = section_cache.hits + section_cache.misses
+        info_text = f"""Storage mode: {self.get_setting('storage_mode', 'snapshot')}
+Background writes: {data_writer.writes}
+Last save error: {data_writer.last_error or "none"}
+
+Save cache hit rate: {section_cache.hit_rate:.0%}
+({section_cache.hits} of {lookups} sections reused)
+
+Time codec hit rate: {time_codec.hit_rate:.0%}
+({time_codec.hits} hits, {time_codec.misses} misses)"""
+        
+        tk.Label(content_frame, text=info_text, font=("Arial", 10), justify="left").pack(anchor="w")
+        
+        tk.Button(content_frame, text="Close", command=dialog.destroy).pack(pady=(20, 0))
+        
     def show_splash_screen(self):
         """Show a simple splash screen on startup"""
         # Create simple splash window
@@ -1002,7 +3807,7 @@ Thank you for keeping your application up to date!"""
 
                 # Employee name (column 0)
                 emp_label = tk.Label(shift_frame, 
-                                   text=shift['employee'], 
+                                   text=self.shift_employee_name(shift), 
                                    font=("Segoe UI", 11, "bold"),
                                    anchor="w")
                 emp_label.grid(row=0, column=0, sticky="w", padx=(5, 0))
@@ -1051,14 +3856,14 @@ Thank you for keeping your application up to date!"""
                 edit_btn.bind("<Button-5>", lambda e: on_mousewheel_linux(e, 1))
                 
                 # Delete button
-                def delete_shift(shift_index=i, employee_name=shift['employee']):
+                def delete_shift(shift_index=i, employee_name=self.shift_employee_name(shift)):
                     if messagebox.askyesno("Confirm Delete", 
                                          f"Delete shift for {employee_name}?"):
                         month_key = f"{day_dt.year}-{day_dt.month:02d}"
                         self.data["schedule"][month_key][day_str].pop(shift_index)
                         if not self.data["schedule"][month_key][day_str]:
                             del self.data["schedule"][month_key][day_str]
-                        save_data(self.data)
+                        save_data(self.data, touched=[("schedule", month_key, day_str)])
                         refresh_shifts_list()
                         self.draw_calendar()
                 
@@ -1096,8 +3901,7 @@ Thank you for keeping your application up to date!"""
         start_var = tk.StringVar()
         
         # Get store hours for this specific date
-        store_hours = get_store_hours_for_date(day_str, self.data.get("store_hours", {}), 
-                                              self.data.get("store_modifications", {}))
+        store_hours = store_calendar.hours(self.data, day_str)
         if store_hours:
             start_times = generate_times(store_hours[0], store_hours[1])
             end_times = generate_times(store_hours[0], store_hours[1])
@@ -1151,13 +3955,9 @@ Thank you for keeping your application up to date!"""
             if day_str not in self.data["schedule"][month_key]:
                 self.data["schedule"][month_key][day_str] = []
             
-            self.data["schedule"][month_key][day_str].append({
-                "employee": emp_name,
-                "start": start_time,
-                "end": end_time
-            })
+            self.data["schedule"][month_key][day_str].append(self.make_shift(emp_name, start_time, end_time))
             
-            save_data(self.data)
+            save_data(self.data, touched=[("schedule", month_key, day_str)])
             refresh_shifts_list()
             self.draw_calendar()
             
@@ -1208,7 +4008,7 @@ Thank you for keeping your application up to date!"""
         
         # Employee
         tk.Label(content, text="Employee:", font=("Segoe UI", 10)).grid(row=0, column=0, sticky="w", pady=5)
-        emp_var = tk.StringVar(value=shift['employee'])
+        emp_var = tk.StringVar(value=self.shift_employee_name(shift))
         employee_names = [emp.get("name", emp.get("display_name", "Unknown")) for emp in self.data.get("employees", [])]
         # Sort employees alphabetically (case-insensitive)
         employee_names.sort(key=str.lower)
@@ -1221,8 +4021,7 @@ Thank you for keeping your application up to date!"""
         start_var = tk.StringVar(value=shift['start'])
         
         # Get store hours for this specific date
-        store_hours = get_store_hours_for_date(day_str, self.data.get("store_hours", {}), 
-                                              self.data.get("store_modifications", {}))
+        store_hours = store_calendar.hours(self.data, day_str)
         if store_hours:
             start_time_values = generate_times(store_hours[0], store_hours[1])
             end_time_values = generate_times(store_hours[0], store_hours[1])
@@ -1266,13 +4065,9 @@ Thank you for keeping your application up to date!"""
                 return  # User chose not to proceed or validation failed
             
             # Update shift
-            self.data["schedule"][month_key][day_str][shift_index] = {
-                "employee": emp_name,
-                "start": start_time,
-                "end": end_time
-            }
+            self.data["schedule"][month_key][day_str][shift_index] = self.make_shift(emp_name, start_time, end_time)
             
-            save_data(self.data)
+            save_data(self.data, touched=[("schedule", month_key, day_str)])
             refresh_callback()
             self.draw_calendar()
             edit_dialog.destroy()
@@ -1288,8 +4083,13 @@ Thank you for keeping your application up to date!"""
                  font=("Segoe UI", 10),
                  padx=15).pack(side="right")
         
-    def init_settings(self):
-        """Initialize application settings with defaults"""
+    def init_settings(self, reset=False):
+        """Initialize application settings with defaults.
+        
+        Missing defaults are only merged in memory, so a normal launch writes
+        nothing; they reach the disk with the next save. reset=True replaces
+        every setting with its default and saves.
+        """
         default_settings = {
             'auto_save_interval': 600,  # milliseconds (10 minutes)
             'default_shift_length': 8,  # hours
@@ -1297,6 +4097,7 @@ Thank you for keeping your application up to date!"""
             'start_week_on_monday': True,  # Calendar week start
             'show_employee_icons': True,  # Show emoji icons
             'show_employee_colors': True,  # Show custom employee colors in schedule
+            'show_coverage_heatmap': False,  # Staffing strip under each calendar day
             'auto_backup': True,        # Auto backup data
             'backup_frequency': 7,      # days
             'confirm_deletions': True,  # Confirm before deleting
@@ -1308,19 +4109,22 @@ Thank you for keeping your application up to date!"""
             'pdf_include_logo': False,  # Include logo in PDFs
             'default_break_time': 30,   # minutes
             'overtime_threshold': 40,   # hours per week
-            'show_splash_screen': True  # Show splash screen on startup
+            'min_staff_per_slot': 2,    # people on shift throughout store hours when auto-scheduling
+            'show_splash_screen': True,  # Show splash screen on startup
+            'storage_mode': 'snapshot',  # 'snapshot', 'journal' (append edits), 'sharded' (file per month) or 'sqlite'
+            'storage_format': 'pretty'  # 'pretty' (indented), 'compact' or 'gzip' JSON on disk
         }
         
         # Load settings from data file or use defaults
-        if 'settings' not in self.data:
+        if reset or 'settings' not in self.data:
             self.data['settings'] = default_settings.copy()
-            save_data(self.data)
         else:
             # Merge any new default settings that don't exist
             for key, value in default_settings.items():
                 if key not in self.data['settings']:
                     self.data['settings'][key] = value
-            save_data(self.data)
+        if reset:
+            save_data(self.data, touched=[("settings",)])
         
         self.settings = self.data['settings']
         
@@ -1332,7 +4136,7 @@ Thank you for keeping your application up to date!"""
         """Set a setting value and save to file"""
         self.settings[key] = value
         self.data['settings'] = self.settings
-        save_data(self.data)
+        save_data(self.data, touched=[("settings",)])
         
     def show_settings_dialog(self):
         """Show the settings/preferences dialog"""
@@ -1396,6 +4200,22 @@ Thank you for keeping your application up to date!"""
         setting_vars['remember_window_state'] = tk.BooleanVar(value=self.get_setting('remember_window_state', True))
         ttk.Checkbutton(general_frame, text="Remember window size and position", 
                        variable=setting_vars['remember_window_state']).pack(anchor="w", pady=5)
+        
+        # ANCHOR Storage mode
+        storage_frame = ttk.Frame(general_frame)
+        storage_frame.pack(fill="x", pady=5)
+        ttk.Label(storage_frame, text="Data storage mode:").pack(side="left")
+        setting_vars['storage_mode'] = tk.StringVar(value=self.get_setting('storage_mode', 'snapshot'))
+        ttk.Combobox(storage_frame, textvariable=setting_vars['storage_mode'], values=["snapshot", "journal", "sharded", "sqlite"],
+                     state="readonly", width=12).pack(side="right")
+        
+        # ANCHOR Storage format
+        format_frame = ttk.Frame(general_frame)
+        format_frame.pack(fill="x", pady=5)
+        ttk.Label(format_frame, text="Data file format:").pack(side="left")
+        setting_vars['storage_format'] = tk.StringVar(value=self.get_setting('storage_format', 'pretty'))
+        ttk.Combobox(format_frame, textvariable=setting_vars['storage_format'], values=list(STORAGE_FORMATS),
+                     state="readonly", width=12).pack(side="right")
         #!SECTION
         # SECTION === SCHEDULE SETTINGS ===
         ttk.Label(schedule_frame, text="Schedule Settings", font=("Segoe UI", 12, "bold")).pack(anchor="w", pady=(0, 15))
@@ -1424,6 +4244,14 @@ Thank you for keeping your application up to date!"""
         overtime_spin = ttk.Spinbox(overtime_frame, from_=20, to=60, textvariable=setting_vars['overtime_threshold'], width=10)
         overtime_spin.pack(side="right")
         
+        # ANCHOR Auto-schedule minimum staff
+        min_staff_frame = ttk.Frame(schedule_frame)
+        min_staff_frame.pack(fill="x", pady=5)
+        ttk.Label(min_staff_frame, text="Auto-schedule minimum staff on shift:").pack(side="left")
+        setting_vars['min_staff_per_slot'] = tk.IntVar(value=self.get_setting('min_staff_per_slot', 2))
+        min_staff_spin = ttk.Spinbox(min_staff_frame, from_=1, to=50, textvariable=setting_vars['min_staff_per_slot'], width=10)
+        min_staff_spin.pack(side="right")
+        
         # ANCHOR Time format
         setting_vars['time_format_24h'] = tk.BooleanVar(value=self.get_setting('time_format_24h', False))
         ttk.Checkbutton(schedule_frame, text="Use 24-hour time format", 
@@ -1493,6 +4321,7 @@ Thank you for keeping your application up to date!"""
                 self.set_setting('default_shift_length', setting_vars['default_shift_length'].get())
                 self.set_setting('default_break_time', setting_vars['default_break_time'].get())
                 self.set_setting('overtime_threshold', setting_vars['overtime_threshold'].get())
+                self.set_setting('min_staff_per_slot', setting_vars['min_staff_per_slot'].get())
                 self.set_setting('time_format_24h', setting_vars['time_format_24h'].get())
                 self.set_setting('start_week_on_monday', setting_vars['start_week_on_monday'].get())
                 self.set_setting('font_scaling', setting_vars['font_scaling'].get())
@@ -1500,6 +4329,8 @@ Thank you for keeping your application up to date!"""
                 self.set_setting('show_splash_screen', setting_vars['show_splash_screen'].get())
                 self.set_setting('pdf_company_name', setting_vars['pdf_company_name'].get())
                 self.set_setting('pdf_include_logo', setting_vars['pdf_include_logo'].get())
+                self.set_setting('storage_mode', setting_vars['storage_mode'].get())
+                self.set_setting('storage_format', setting_vars['storage_format'].get())
                 
                 # ANCHOR Show success message
                 messagebox.showinfo("Settings Saved", "Settings have been saved successfully!")
@@ -1531,6 +4362,7 @@ Thank you for keeping your application up to date!"""
             setting_vars['default_shift_length'].set(8)
             setting_vars['default_break_time'].set(30)
             setting_vars['overtime_threshold'].set(40)
+            setting_vars['min_staff_per_slot'].set(2)
             setting_vars['time_format_24h'].set(False)
             setting_vars['start_week_on_monday'].set(True)
             setting_vars['font_scaling'].set(1.0)
@@ -1538,13 +4370,15 @@ Thank you for keeping your application up to date!"""
             setting_vars['show_splash_screen'].set(True)
             setting_vars['pdf_company_name'].set('Your Company')
             setting_vars['pdf_include_logo'].set(False)
+            setting_vars['storage_mode'].set('snapshot')
+            setting_vars['storage_format'].set('pretty')
     
     def reset_settings_to_defaults(self):
         """Reset all settings to default values"""
         if messagebox.askyesno("Reset Settings", 
                               "Are you sure you want to reset all settings to their default values?\n\n"
                               "This action cannot be undone."):
-            self.init_settings()  # This will reload defaults
+            self.init_settings(reset=True)
             messagebox.showinfo("Settings Reset", "All settings have been reset to their default values.")
             self.apply_settings_changes()
     
@@ -2034,10 +4868,10 @@ Thank you for keeping your application up to date!"""
                     # Only validate if both times are selected
                     if start_time and end_time:
                         try:
-                            start_dt = datetime.strptime(start_time, TIME_FMT)
-                            end_dt = datetime.strptime(end_time, TIME_FMT)
+                            start_min = parse_minutes(start_time)
+                            end_min = parse_minutes(end_time)
                             
-                            if start_dt >= end_dt:
+                            if start_min >= end_min:
                                 # Invalid: start is after or equal to end
                                 messagebox.showerror(
                                     "Invalid Time Range",
@@ -2155,17 +4989,6 @@ Thank you for keeping your application up to date!"""
         self.emp_listbox.delete(0, tk.END)
         # Sort employees alphabetically by name
         employees = self.data.get("employees", [])
-        
-        # Add backward compatibility for color field
-        needs_save = False
-        for emp in employees:
-            if "color" not in emp:
-                emp["color"] = "#000000"  # Default black color
-                needs_save = True
-        
-        if needs_save:
-            save_data(self.data)
-        
         sorted_employees = sorted(employees, key=lambda emp: emp.get("name", "").lower())
         for emp in sorted_employees:
             self.emp_listbox.insert(tk.END, emp["name"])
@@ -2206,10 +5029,18 @@ Thank you for keeping your application up to date!"""
 
     def find_employee_by_display(self, display_name):
         """Return the employee dict matching a display name."""
-        for e in self.data.get("employees", []):
-            if e.get("name") == display_name:
-                return e
-        return None
+        return employee_index.find(self.data, display_name)
+
+    def shift_employee_name(self, shift):
+        """Return the display name of a shift's employee."""
+        return employee_index.shift_name(self.data, shift)
+
+    def make_shift(self, emp_name, start, end):
+        """Return a new shift dict referencing the employee by id."""
+        emp = self.find_employee_by_display(emp_name)
+        if emp is None:
+            return {"employee": emp_name, "start": start, "end": end}
+        return {"employee_id": emp["id"], "start": start, "end": end}
 
     def validate_shift_scheduling(self, emp_name, day_str, start_time, end_time, 
                                  exclude_shift_index=None, show_dialog=True):
@@ -2227,113 +5058,10 @@ Thank you for keeping your application up to date!"""
         Returns:
             tuple: (is_valid, conflicts_list)
         """
-        from datetime import datetime
-        
-        conflicts = []
-        
-        # Basic time validation
-        try:
-            start_dt = datetime.strptime(start_time, TIME_FMT)
-            end_dt = datetime.strptime(end_time, TIME_FMT)
-            if end_dt <= start_dt:
-                conflicts.append("End time must be after start time")
-                return False, conflicts
-        except Exception:
-            conflicts.append("Invalid time format")
-            return False, conflicts
-        
-        # Check store modifications (closures and modified hours)
-        store_modifications = self.data.get("store_modifications", {})
-        if day_str in store_modifications:
-            modification = store_modifications[day_str]
-            if modification["type"] == "closure":
-                reason = modification.get("reason", "Special closure")
-                conflicts.append(f"Store is closed on this date. Reason: {reason}")
-                return False, conflicts
-            elif modification["type"] == "modified_hours":
-                try:
-                    store_open = datetime.strptime(modification["opening_time"], TIME_FMT)
-                    store_close = datetime.strptime(modification["closing_time"], TIME_FMT)
-                    reason = modification.get("reason", "Modified hours")
-                    
-                    if start_dt < store_open:
-                        conflicts.append(f"Shift starts at {start_time} but store opens at {modification['opening_time']} due to: {reason}")
-                    if end_dt > store_close:
-                        conflicts.append(f"Shift ends at {end_time} but store closes at {modification['closing_time']} due to: {reason}")
-                except Exception:
-                    conflicts.append("Error validating modified store hours")
-        
-        # Find employee data
-        emp_data = self.find_employee_by_display(emp_name)
-        if not emp_data:
-            conflicts.append("Employee not found")
-            return False, conflicts
-        
-        # Get day of week for availability check
-        day_dt = datetime.strptime(day_str, DATE_FMT)
-        day_name = day_dt.strftime("%A").lower()
-        
-        # Check requested days off (support both structured and legacy formats)
-        rd_list = emp_data.get("requested_days_off", [])
-        for req in rd_list:
-            if isinstance(req, dict):
-                rtype = req.get("type")
-                rdate = req.get("date")
-                if rdate != day_str:
-                    continue
-                if rtype == "full":
-                    conflicts.append(f"{emp_name} requested this entire day off")
-                elif rtype == "partial":
-                    times = req.get("times", "")
-                    parts = [p.strip() for p in times.split("-")]
-                    if len(parts) == 2:
-                        try:
-                            r_start = datetime.strptime(parts[0], TIME_FMT)
-                            r_end = datetime.strptime(parts[1], TIME_FMT)
-                            # Check if shift overlaps with requested time off
-                            if not (end_dt <= r_start or start_dt >= r_end):
-                                conflicts.append(f"{emp_name} requested time off from {parts[0]} to {parts[1]}")
-                        except Exception:
-                            # if malformed, treat as full day off
-                            conflicts.append(f"{emp_name} has a time off request for this day")
-            else:
-                # legacy string format - treat as full day
-                if req == day_str:
-                    conflicts.append(f"{emp_name} requested this day off")
-        
-        # Check day availability
-        availability = emp_data.get("availability", {}).get(day_name, ["off"])
-        if availability == ["off"]:
-            conflicts.append(f"{emp_name} is not available on {day_name.capitalize()}s")
-        else:
-            # availability should be [start, end]
-            try:
-                avail_start = datetime.strptime(availability[0], TIME_FMT)
-                avail_end = datetime.strptime(availability[1], TIME_FMT)
-                if start_dt < avail_start:
-                    conflicts.append(f"Shift starts at {start_time} but {emp_name} is only available from {availability[0]}")
-                if end_dt > avail_end:
-                    conflicts.append(f"Shift ends at {end_time} but {emp_name} is only available until {availability[1]}")
-            except Exception:
-                conflicts.append(f"{emp_name}'s availability data is invalid for {day_name}")
-        
-        # Check for overlap with existing shifts
-        month_key = f"{day_dt.year}-{day_dt.month:02d}"
-        shifts = self.data.get("schedule", {}).get(month_key, {}).get(day_str, [])
-        for i, shift in enumerate(shifts):
-            # Skip the shift we're editing
-            if exclude_shift_index is not None and i == exclude_shift_index:
-                continue
-                
-            if shift["employee"] == emp_name:
-                try:
-                    shift_start = datetime.strptime(shift["start"], TIME_FMT)
-                    shift_end = datetime.strptime(shift["end"], TIME_FMT)
-                    # Check if shifts overlap
-                    if not (end_dt <= shift_start or start_dt >= shift_end):
-                        conflicts.append(f"Overlaps with existing shift ({shift['start']} - {shift['end']})")
-                except Exception:
-                    conflicts.append(f"Error checking overlap with existing shift")
+        emp = self.find_employee_by_display(emp_name)
+        emp_ref = emp["id"] if emp is not None else emp_name
+        conflicts = [message for _, message in
+                     shift_conflicts(shared_views(self.data), emp_ref, day_str, start_time, end_time, exclude_shift_index)[0]]
         
         # If there are conflicts and we should show dialog
         if conflicts and show_dialog:
@@ -2346,6 +5074,48 @@ Thank you for keeping your application up to date!"""
         
         return len(conflicts) == 0, conflicts
 
+    def validate_shifts_batch(self, shifts, target_days=None):
+        """
+        Validate placing every shift in shifts on each of target_days.
+        
+        shifts may instead be a {day_str: [shift]} dict of different shifts
+        per day, e.g. an auto-schedule proposal; target_days then defaults
+        to its keys. Each shift is checked like validate_shift_scheduling()
+        against the day's existing shifts, and also against the
+        conflict-free shifts placed before it in the batch, so pasted shifts
+        that overlap each other are caught and the overtime check counts the
+        batch's earlier shifts in the same ISO week. Employees, time off,
+        store hours and each day's overlap index are looked up once per batch.
+        
+        Returns:
+            list: ShiftConflict records ordered by day, then shift index
+        """
+        records = []
+        views = shared_views(self.data)
+        break_minutes = self.data.get("settings", {}).get("default_break_time") or 0
+        week_placed = {}  # (employee ref, week's Monday) -> paid minutes of clean shifts placed so far
+        per_day = isinstance(shifts, dict)
+        if target_days is None:
+            target_days = list(shifts)
+        for day_str in target_days:
+            placed = {}  # employee ref -> [(start, end)] of clean shifts placed so far
+            for index, shift in enumerate(shifts.get(day_str, []) if per_day else shifts):
+                ref = shift_ref(shift)
+                week = (ref, WeeklyHours.week_start(day_str))
+                found, interval = shift_conflicts(views, ref, day_str, shift.get("start"), shift.get("end"),
+                                                  batch_minutes=week_placed.get(week, 0))
+                if interval is not None:
+                    start_min, end_min = interval
+                    for other_start, other_end in placed.get(ref, ()):
+                        if start_min < other_end and other_start < end_min:
+                            found.append(("batch_overlap", "Overlaps with pasted shift "
+                                          f"({format_minutes(other_start)} - {format_minutes(other_end)})"))
+                    if not found:
+                        placed.setdefault(ref, []).append(interval)
+                        week_placed[week] = week_placed.get(week, 0) + max(end_min - start_min - break_minutes, 0)
+                records.extend(ShiftConflict(day_str, index, kind, message) for kind, message in found)
+        return records
+
     def add_employee(self):
         # Create dialog window
         dialog = tk.Toplevel(self.root)
@@ -2393,7 +5163,8 @@ Thank you for keeping your application up to date!"""
                 "requested_days_off": []
             }
             self.data["employees"].append(new_emp)
-            save_data(self.data)
+            employee_index.added(new_emp)
+            save_data(self.data, touched=[("employees",)])
             self.refresh_employee_list()
             dialog.destroy()
 
@@ -2414,25 +5185,21 @@ Thank you for keeping your application up to date!"""
         # Get the employee name from the listbox
         emp_name = self.emp_listbox.get(idx)
         # Find the employee in the data by name
-        emp = None
-        emp_index = None
-        for i, e in enumerate(self.data["employees"]):
-            if e.get("name") == emp_name:
-                emp = e
-                emp_index = i
-                break
-        
+        emp = self.find_employee_by_display(emp_name)
         if not emp:
             return
         
-        # Count shifts to show in confirmation
-        shift_count = 0
+        # Find the days this employee works: a single indexed query with the
+        # SQLite backend, otherwise the employee's entries in the shift index
         schedule = self.data.get("schedule", {})
-        for month_data in schedule.values():
-            if isinstance(month_data, dict):
-                for shifts in month_data.values():
-                    if isinstance(shifts, list):
-                        shift_count += sum(1 for s in shifts if s.get("employee") == emp["name"])
+        if self.sqlite_indexes_ready():
+            shift_days = sqlite_store.employee_shift_days(emp["id"])
+        else:
+            counts = {}
+            for day_str, _, _ in employee_shifts.shifts(self.data, emp["id"]):
+                counts[day_str] = counts.get(day_str, 0) + 1
+            shift_days = [(day_str[:7], day_str, count) for day_str, count in counts.items()]
+        shift_count = sum(count for _, _, count in shift_days)
         
         # Show confirmation dialog with shift count
         if not messagebox.askyesno("Confirm Remove", 
@@ -2441,36 +5208,29 @@ Thank you for keeping your application up to date!"""
             return
             
         # Remove if confirmed
-        self.data["employees"].pop(emp_index)
-        
-        # Remove any scheduled shifts for this employee across all months
-        shifts_removed = False
-        for month_key in list(schedule.keys()):
+        employees = self.data["employees"]
+        employees.pop(next(i for i, e in enumerate(employees) if e is emp))
+        employee_index.removed(emp)
+        time_off_index.removed(emp)
+        
+        # Remove their scheduled shifts from just those days
+        shifts_removed = bool(shift_days)
+        touched = [("employees",)]
+        for month_key, day_key, _ in shift_days:
             month_data = schedule[month_key]
-            # Handle both dictionary and list structures
-            if isinstance(month_data, dict):
-                for day_key in list(month_data.keys()):
-                    shifts = month_data[day_key]
-                    if isinstance(shifts, list):
-                        filtered_shifts = [s for s in shifts if s.get("employee") != emp["name"]]
-                        if len(filtered_shifts) != len(shifts):
-                            shifts_removed = True
-                        month_data[day_key] = filtered_shifts
-                        # Clean up empty days
-                        if not filtered_shifts:
-                            del month_data[day_key]
-                # Clean up empty months
-                if not month_data:
-                    del schedule[month_key]
-            elif isinstance(month_data, list):
-                filtered_shifts = [s for s in month_data if s.get("employee") != emp["name"]]
-                if len(filtered_shifts) != len(month_data):
-                    shifts_removed = True
-                schedule[month_key] = filtered_shifts
-                if not filtered_shifts:
-                    del schedule[month_key]
-        
-        save_data(self.data)
+            filtered_shifts = [s for s in month_data[day_key] if shift_ref(s) != emp["id"]]
+            if filtered_shifts:
+                month_data[day_key] = filtered_shifts
+            else:
+                # Clean up empty days
+                del month_data[day_key]
+            touched.append(("schedule", month_key, day_key))
+            # Clean up empty months
+            if not month_data:
+                del schedule[month_key]
+                touched.append(("schedule", month_key))
+        
+        save_data(self.data, touched=touched)
         self.refresh_employee_list()
         self.clear_employee_editor()
         
@@ -2489,11 +5249,7 @@ Thank you for keeping your application up to date!"""
             # Get the employee name from the listbox
             emp_name = self.emp_listbox.get(idx)
             # Find the employee in the data by name
-            emp = None
-            for e in self.data["employees"]:
-                if e.get("name") == emp_name:
-                    emp = e
-                    break
+            emp = self.find_employee_by_display(emp_name)
             
             if not emp:
                 return
@@ -2523,13 +5279,10 @@ Thank you for keeping your application up to date!"""
             # Fill days off
             self.days_off_list.delete(0, tk.END)
             for time_off in emp.get("requested_days_off", []):
-                if isinstance(time_off, dict):  # New format
-                    if time_off["type"] == "partial":
-                        display_text = f"{time_off['date']} ({time_off['times']})"
-                    else:  # full day
-                        display_text = time_off["date"]
-                else:  # Old format - just a date string
-                    display_text = time_off
+                if time_off["type"] == "partial":
+                    display_text = f"{time_off['date']} ({time_off['times']})"
+                else:  # full day
+                    display_text = time_off["date"]
                 self.days_off_list.insert(tk.END, display_text)
         finally:
             # Clear dirty indicator and re-enable auto-save
@@ -2549,11 +5302,7 @@ Thank you for keeping your application up to date!"""
         # Get the employee name from the listbox
         emp_name = self.emp_listbox.get(idx)
         # Find the employee in the data by name
-        emp = None
-        for e in self.data["employees"]:
-            if e.get("name") == emp_name:
-                emp = e
-                break
+        emp = self.find_employee_by_display(emp_name)
         
         if not emp:
             return
@@ -2592,12 +5341,14 @@ Thank you for keeping your application up to date!"""
                 return
 
             # Update employee data
+            old_name = emp["name"]
             emp["firstName"] = first
             emp["lastName"] = last
             emp["name"] = (first + " " + last).strip()  # Update legacy name field
+            employee_index.renamed(emp, old_name)
             
             # Save changes
-            save_data(self.data)
+            save_data(self.data, touched=[("employees",)])
             self.refresh_employee_list()
             
             # Select the edited employee in the list
@@ -2626,11 +5377,7 @@ Thank you for keeping your application up to date!"""
         # Get the employee name from the listbox
         emp_name = self.emp_listbox.get(idx)
         # Find the employee in the data by name
-        emp = None
-        for e in self.data["employees"]:
-            if e.get("name") == emp_name:
-                emp = e
-                break
+        emp = self.find_employee_by_display(emp_name)
         
         if not emp:
             return
@@ -2733,11 +5480,9 @@ Thank you for keeping your application up to date!"""
         
         def save_color():
             new_color = selected_color.get()
-            # Ensure employee has color field (for backward compatibility)
-            if "color" not in emp:
-                emp["color"] = "#000000"
             emp["color"] = new_color
-            save_data(self.data)
+            employee_index.colors_changed()
+            save_data(self.data, touched=[("employees",)])
             dialog.destroy()
             # Refresh the calendar to show new colors
             if hasattr(self, 'draw_calendar'):
@@ -2769,17 +5514,26 @@ Thank you for keeping your application up to date!"""
         # If colors are disabled, always return black
         if not getattr(self, 'show_employee_colors', True):
             return "#000000"
-            
-        for emp in self.data.get("employees", []):
-            if emp.get("name") == employee_name:
-                return emp.get("color", "#000000")
-        return "#000000"  # Default black if employee not found
+        
+        # Black if employee not found
+        return employee_index.color(self.data, employee_name)
 
+    def _load_date_entry(self):
+        """Return the DateEntry widget class, or None (after telling the user) if tkcalendar is missing."""
+        try:
+            return load_date_entry()
+        except ImportError as e:
+            messagebox.showerror("Missing Component", f"The date picker requires tkcalendar:\n{e}")
+            return None
+    
     def add_requested_day(self):
         sel = self.emp_listbox.curselection()
         if not sel:
             self._show_employee_selection_warning()
             return
+        DateEntry = self._load_date_entry()
+        if DateEntry is None:
+            return
 
         # Create dialog window
         dialog = tk.Toplevel(self.root)
@@ -2833,8 +5587,7 @@ Thank you for keeping your application up to date!"""
         # Generate initial time options (will be updated when date changes)
         def update_time_options():
             selected_date = partial_day_cal.get_date().strftime(DATE_FMT)
-            store_hours = get_store_hours_for_date(selected_date, self.data.get("store_hours", {}), 
-                                                  self.data.get("store_modifications", {}))
+            store_hours = store_calendar.hours(self.data, selected_date)
             if store_hours:
                 times = generate_times(store_hours[0], store_hours[1])
             else:
@@ -2844,8 +5597,7 @@ Thank you for keeping your application up to date!"""
         
         # Initial time generation using current date
         current_date = partial_day_cal.get_date().strftime(DATE_FMT)
-        store_hours = get_store_hours_for_date(current_date, self.data.get("store_hours", {}), 
-                                              self.data.get("store_modifications", {}))
+        store_hours = store_calendar.hours(self.data, current_date)
         if store_hours:
             times = generate_times(store_hours[0], store_hours[1])
         else:
@@ -2939,10 +5691,10 @@ Thank you for keeping your application up to date!"""
                         
                     # Validate date and times
                     date = datetime.strptime(date_str, DATE_FMT)
-                    start_dt = datetime.strptime(start_time, TIME_FMT)
-                    end_dt = datetime.strptime(end_time, TIME_FMT)
+                    start_min = parse_minutes(start_time)
+                    end_min = parse_minutes(end_time)
                     
-                    if end_dt <= start_dt:
+                    if end_min <= start_min:
                         raise ValueError("End time must be after start time")
                     
                     dates_to_add.append((date_str, "partial", start_time, end_time))
@@ -2973,13 +5725,13 @@ Thank you for keeping your application up to date!"""
                     # Show conflict resolution dialog
                     if self.show_conflict_resolution_dialog(emp_name, conflicts):
                         # User chose to proceed, add the time off requests
-                        self.add_time_off_to_list(dates_to_add)
+                        add_time_off_to_list(dates_to_add)
                         self.mark_employee_dirty()
                         dialog.destroy()
                     # If user chose not to proceed, dialog stays open
                 else:
                     # No conflicts, proceed normally
-                    self.add_time_off_to_list(dates_to_add)
+                    add_time_off_to_list(dates_to_add)
                     self.mark_employee_dirty()
                     dialog.destroy()
                 
@@ -3022,6 +5774,20 @@ Thank you for keeping your application up to date!"""
         """Check if requested time off conflicts with existing shifts"""
         conflicts = []
         
+        # Collect this employee's shifts on the requested dates together with
+        # their index in the day's list (used when removing them)
+        dates = [date_info[0] for date_info in dates_to_add]
+        emp = self.find_employee_by_display(emp_name)
+        if emp is None:
+            return conflicts
+        shifts_by_date = {}
+        if self.sqlite_indexes_ready():
+            for date_str, slot, start, end in sqlite_store.employee_shifts_on(emp["id"], dates):
+                shifts_by_date.setdefault(date_str, []).append(
+                    (slot, {"employee_id": emp["id"], "start": start, "end": end}))
+        else:
+            shifts_by_date = employee_shifts.on_days(self.data, emp["id"], dates)
+        
         for date_info in dates_to_add:
             date_str = date_info[0]
             request_type = date_info[1]  # "full" or "partial"
@@ -3032,13 +5798,10 @@ Thank you for keeping your application up to date!"""
                 month_key = f"{date_obj.year}-{date_obj.month:02d}"
                 
                 # Check if there are shifts for this employee on this date
-                schedule_data = self.data.get("schedule", {}).get(month_key, {})
-                day_shifts = schedule_data.get(date_str, [])
-                
-                employee_shifts = [shift for shift in day_shifts if shift.get("employee") == emp_name]
+                employee_shifts = shifts_by_date.get(date_str, [])
                 
                 if employee_shifts:
-                    for i, shift in enumerate(employee_shifts):
+                    for i, shift in employee_shifts:
                         if request_type == "full":
                             # Full day off conflicts with any shift
                             conflicts.append({
@@ -3052,13 +5815,13 @@ Thank you for keeping your application up to date!"""
                             # Partial day - check time overlap
                             _, _, req_start, req_end = date_info
                             try:
-                                req_start_dt = datetime.strptime(req_start, TIME_FMT)
-                                req_end_dt = datetime.strptime(req_end, TIME_FMT)
-                                shift_start_dt = datetime.strptime(shift.get("start", ""), TIME_FMT)
-                                shift_end_dt = datetime.strptime(shift.get("end", ""), TIME_FMT)
+                                req_start_min = parse_minutes(req_start)
+                                req_end_min = parse_minutes(req_end)
+                                shift_start_min = parse_minutes(shift.get("start", ""))
+                                shift_end_min = parse_minutes(shift.get("end", ""))
                                 
                                 # Check for time overlap
-                                if (req_start_dt < shift_end_dt and req_end_dt > shift_start_dt):
+                                if (req_start_min < shift_end_min and req_end_min > shift_start_min):
                                     conflicts.append({
                                         "date": date_str,
                                         "type": "partial_day",
@@ -3176,7 +5939,12 @@ Thank you for keeping your application up to date!"""
         
         def remove_shifts():
             """Remove conflicting shifts and proceed with time off request"""
-            for conflict in conflicts:
+            # Pop from the back so earlier indexes on the same day stay valid
+            removed = set()
+            for conflict in sorted(conflicts, key=lambda c: (c["date"], c["shift_index"]), reverse=True):
+                if (conflict["date"], conflict["shift_index"]) in removed:
+                    continue
+                removed.add((conflict["date"], conflict["shift_index"]))
                 month_key = conflict["month_key"]
                 date_str = conflict["date"]
                 shift_index = conflict["shift_index"]
@@ -3195,7 +5963,7 @@ Thank you for keeping your application up to date!"""
                         del self.data["schedule"][month_key]
             
             # Save data and refresh calendar
-            save_data(self.data)
+            save_data(self.data, touched=[("schedule", c["month_key"], c["date"]) for c in conflicts])
             if hasattr(self, 'draw_calendar'):
                 self.draw_calendar()
             
@@ -3248,6 +6016,10 @@ Thank you for keeping your application up to date!"""
 
     def add_store_modification(self):
         """Add a store hour modification (closure or modified hours) for a specific date"""
+        DateEntry = self._load_date_entry()
+        if DateEntry is None:
+            return
+        
         # Create dialog window
         dialog = tk.Toplevel(self.root)
         dialog.title("Store Hour Modification")
@@ -3380,10 +6152,10 @@ Thank you for keeping your application up to date!"""
                         
                     # Validate date and times
                     date_obj = datetime.strptime(date_str, DATE_FMT)
-                    start_dt = datetime.strptime(start_time, TIME_FMT)
-                    end_dt = datetime.strptime(end_time, TIME_FMT)
+                    start_min = parse_minutes(start_time)
+                    end_min = parse_minutes(end_time)
                     
-                    if end_dt <= start_dt:
+                    if end_min <= start_min:
                         raise ValueError("Closing time must be after opening time")
                     
                     # Add store modification to data
@@ -3399,7 +6171,8 @@ Thank you for keeping your application up to date!"""
                     }
                 
                 # Save data
-                save_data(self.data)
+                store_calendar.invalidate(date_str)
+                save_data(self.data, touched=[("store_modifications", date_str)])
                 
                 # Refresh calendar if it exists
                 if hasattr(self, 'draw_calendar'):
@@ -3471,7 +6244,8 @@ Thank you for keeping your application up to date!"""
                 del self.data["store_modifications"]
             
             # Save data
-            save_data(self.data)
+            store_calendar.invalidate(date_str)
+            save_data(self.data, touched=[("store_modifications", date_str)])
             
             # Refresh calendar to update colors
             if hasattr(self, 'draw_calendar'):
@@ -3494,17 +6268,16 @@ Thank you for keeping your application up to date!"""
         # Get the employee name from the listbox
         emp_name = self.emp_listbox.get(idx)
         # Find the employee in the data by name
-        emp = None
-        for e in self.data["employees"]:
-            if e.get("name") == emp_name:
-                emp = e
-                break
+        emp = self.find_employee_by_display(emp_name)
         
         if not emp:
             if not silent:
                 messagebox.showerror("Error", "Employee not found.")
             return False
         
+        old_availability = dict(emp.get("availability", {}))
+        old_days_off = emp.get("requested_days_off", [])
+        
         # Availability parsing
         for day, w in self.avail_widgets.items():
             if w['var'].get():
@@ -3516,13 +6289,13 @@ Thank you for keeping your application up to date!"""
                     return False
                 # validate times and order
                 try:
-                    s_dt = datetime.strptime(start, TIME_FMT)
-                    e_dt = datetime.strptime(end, TIME_FMT)
-                    if e_dt <= s_dt:
+                    s_min = parse_minutes(start)
+                    e_min = parse_minutes(end)
+                    if e_min <= s_min:
                         if not silent:
                             messagebox.showerror("Invalid", f"End time must be after start time for {day.capitalize()}.")
                         return False
-                    emp["availability"][day] = [s_dt.strftime(TIME_FMT), e_dt.strftime(TIME_FMT)]
+                    emp["availability"][day] = [format_minutes(s_min), format_minutes(e_min)]
                 except Exception:
                     if not silent:
                         messagebox.showerror("Invalid", f"Invalid time selection for {day.capitalize()}.")
@@ -3549,7 +6322,17 @@ Thank you for keeping your application up to date!"""
                 })
         
         emp["requested_days_off"] = requested_off
-        save_data(self.data)
+        time_off_index.updated(emp)
+        save_data(self.data, touched=[("employees",)])
+        
+        # Re-check just this employee's shifts on the weekdays and dates that changed
+        changed_weekdays = {day for day in Employee.WEEKDAYS
+                            if emp["availability"].get(day) != old_availability.get(day)}
+        old_entries = {(e.get("date"), e.get("type"), e.get("times")) for e in old_days_off}
+        new_entries = {(e.get("date"), e.get("type"), e.get("times")) for e in requested_off}
+        changed_dates = {entry[0] for entry in old_entries ^ new_entries}
+        schedule_conflicts.employee_changed(shared_views(self.data), emp, changed_weekdays, changed_dates)
+        self.show_conflict_badges()
         # Update status indicator
         if silent:
             # Mark clean and briefly show Saved status
@@ -3617,12 +6400,22 @@ Thank you for keeping your application up to date!"""
                                                     self.toggle_employee_colors, 'primary_dark', width=15, font_size_offset=2)
         color_toggle_btn.pack(side="left", padx=(5, 10))
         
+        # Coverage heatmap toggle button
+        coverage_btn = self.create_modern_button(nav_container, "🌡 Coverage",
+                                               self.toggle_coverage_heatmap, 'primary_dark', width=15, font_size_offset=2)
+        coverage_btn.pack(side="left", padx=(5, 10))
+        
         
         # Employee stats button
         stats_btn = self.create_modern_button(nav_container, "📊 Employee Stats", 
                                             self.show_employee_stats, 'primary_dark', width=15, font_size_offset=2)
         stats_btn.pack(side="left", padx=(5, 10))
         
+        # Auto-schedule button
+        auto_btn = self.create_modern_button(nav_container, "🗓 Auto-Schedule",
+                                           self.show_auto_schedule_dialog, 'primary_dark', width=15, font_size_offset=2)
+        auto_btn.pack(side="left", padx=(5, 10))
+        
         # PDF button
         pdf_btn = self.create_modern_button(nav_container, "📄 Generate PDF", 
                                           self.generate_month_pdf, 'primary', width=15, font_size_offset=2)
@@ -3648,6 +6441,169 @@ Thank you for keeping your application up to date!"""
         # draw initial calendar
         self.draw_calendar()
 
+    def show_auto_schedule_dialog(self):
+        """Generate shifts for a date range and let the user review them before they are added"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Auto-Schedule")
+        dialog.transient(self.root)
+        dialog.grab_set()
+        self.center_dialog(dialog, width=640, height=520)
+        
+        main_frame = ttk.Frame(dialog, padding="15")
+        main_frame.pack(fill="both", expand=True)
+        
+        # Range and headcount
+        month_start = date(self.current_year, self.current_month, 1)
+        month_end = date(self.current_year, self.current_month, calendar.monthrange(self.current_year, self.current_month)[1])
+        form = ttk.Frame(main_frame)
+        form.pack(fill="x")
+        ttk.Label(form, text="From (YYYY-MM-DD):").grid(row=0, column=0, sticky="w", pady=3)
+        first_var = tk.StringVar(value=month_start.strftime(DATE_FMT))
+        ttk.Entry(form, textvariable=first_var, width=14).grid(row=0, column=1, sticky="w", padx=6)
+        ttk.Label(form, text="To (YYYY-MM-DD):").grid(row=1, column=0, sticky="w", pady=3)
+        last_var = tk.StringVar(value=month_end.strftime(DATE_FMT))
+        ttk.Entry(form, textvariable=last_var, width=14).grid(row=1, column=1, sticky="w", padx=6)
+        ttk.Label(form, text="Minimum staff on shift:").grid(row=2, column=0, sticky="w", pady=3)
+        min_staff_var = tk.IntVar(value=self.get_setting('min_staff_per_slot', 2))
+        ttk.Spinbox(form, from_=1, to=50, textvariable=min_staff_var, width=6).grid(row=2, column=1, sticky="w", padx=6)
+        
+        # Optimization: more than one candidate runs the multi-start optimizer on a process pool
+        ttk.Label(form, text="Candidates (1 = single pass):").grid(row=0, column=2, sticky="w", padx=(20, 0))
+        candidates_var = tk.IntVar(value=1)
+        ttk.Spinbox(form, from_=1, to=256, textvariable=candidates_var, width=6).grid(row=0, column=3, sticky="w", padx=6)
+        ttk.Label(form, text="Time limit (seconds):").grid(row=1, column=2, sticky="w", padx=(20, 0))
+        budget_var = tk.IntVar(value=10)
+        ttk.Spinbox(form, from_=1, to=600, textvariable=budget_var, width=6).grid(row=1, column=3, sticky="w", padx=6)
+        ttk.Label(form, text="Seed:").grid(row=2, column=2, sticky="w", padx=(20, 0))
+        seed_var = tk.IntVar(value=0)
+        ttk.Entry(form, textvariable=seed_var, width=8).grid(row=2, column=3, sticky="w", padx=6)
+        
+        # Review area
+        review = tk.Text(main_frame, height=18, wrap="word", state="disabled")
+        review.pack(fill="both", expand=True, pady=10)
+        
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill="x")
+        # shifts: day_str -> [conflict-free proposed shift] awaiting acceptance;
+        # result: [ScheduleProposal] once a background optimizer run finishes
+        state = {"shifts": {}, "result": None}
+        
+        def show_review(lines):
+            review.config(state="normal")
+            review.delete("1.0", tk.END)
+            review.insert(tk.END, "\n".join(lines))
+            review.config(state="disabled")
+        
+        def generate():
+            try:
+                first_day = datetime.strptime(first_var.get().strip(), DATE_FMT).date()
+                last_day = datetime.strptime(last_var.get().strip(), DATE_FMT).date()
+                min_staff = min_staff_var.get()
+                candidates = candidates_var.get()
+                budget = budget_var.get()
+                seed = seed_var.get()
+            except (ValueError, tk.TclError):
+                messagebox.showerror("Invalid Input", "Enter dates as YYYY-MM-DD and whole numbers elsewhere.", parent=dialog)
+                return
+            if last_day < first_day:
+                messagebox.showerror("Invalid Range", "The end date must not be before the start date.", parent=dialog)
+                return
+            if min_staff != self.get_setting('min_staff_per_slot', 2):
+                self.set_setting('min_staff_per_slot', min_staff)
+            
+            days = [(first_day + timedelta(days=i)).strftime(DATE_FMT) for i in range((last_day - first_day).days + 1)]
+            if candidates <= 1:
+                show_proposal(days, ScheduleGenerator(shared_views(self.data), min_staff=min_staff).run(days))
+                return
+            
+            # The optimizer snapshots the data here and runs on a worker thread
+            optimizer = ScheduleOptimizer(self.data, days, min_staff=min_staff, seed=seed,
+                                          candidates=candidates, time_budget=budget)
+            state["result"] = None
+            
+            def optimize():
+                try:
+                    state["result"] = [optimizer.run()]
+                except Exception as e:
+                    print(f"Schedule optimization failed: {e}")
+                    state["result"] = [None]
+            threading.Thread(target=optimize, name="schedule-optimizer", daemon=True).start()
+            generate_button.config(state="disabled")
+            add_button.config(state="disabled")
+            show_review([f"Optimizing: {candidates} candidates on {optimizer.workers} worker"
+                         f"{'s' if optimizer.workers != 1 else ''}, up to {budget} s..."])
+            
+            def poll():
+                if not dialog.winfo_exists():
+                    return
+                if state["result"] is None:
+                    dialog.after(AUDIT_POLL_MS, poll)
+                    return
+                generate_button.config(state="normal")
+                if state["result"][0] is None:
+                    show_review(["Optimization failed; try a single pass (1 candidate)."])
+                    return
+                show_proposal(days, state["result"][0],
+                              f"Best of {optimizer.evaluated} candidates (#{optimizer.best_index + 1}) "
+                              f"in {optimizer.elapsed:.1f} s")
+            dialog.after(AUDIT_POLL_MS, poll)
+        
+        def show_proposal(days, proposal, note=None):
+            # One validation pass over the whole proposal; anything it flags is left out
+            messages = {}
+            for record in self.validate_shifts_batch(proposal.shifts):
+                messages.setdefault((record.day, record.index), []).append(record.message)
+            state["shifts"] = {}
+            lines = []
+            for day_str in days:
+                day_shifts = proposal.shifts.get(day_str, [])
+                gaps = proposal.gaps.get(day_str, [])
+                if not day_shifts and not gaps:
+                    continue
+                clean = [shift for i, shift in enumerate(day_shifts) if (day_str, i) not in messages]
+                if clean:
+                    state["shifts"][day_str] = clean
+                label = datetime.strptime(day_str, DATE_FMT).strftime("%a %b %d")
+                lines.append(f"{label}: {len(clean)} shift{'s' if len(clean) != 1 else ''}")
+                for shift in clean:
+                    lines.append(f"    {self.shift_employee_name(shift)}  {shift['start']} - {shift['end']}")
+                for i, shift in enumerate(day_shifts):
+                    for message in messages.get((day_str, i), []):
+                        lines.append(f"    ⚠ Skipped {self.shift_employee_name(shift)}: {message}")
+                for start, end, missing in gaps:
+                    lines.append(f"    ✗ Short {format_minutes(start)} - {format_minutes(end)} "
+                                 f"(up to {missing} {'person' if missing == 1 else 'people'})")
+            
+            count = sum(len(day_shifts) for day_shifts in state["shifts"].values())
+            summary = f"{count} shifts proposed for {len(days)} days"
+            if proposal.gaps:
+                summary += f"; {len(proposal.gaps)} days could not be fully staffed"
+            show_review([summary] + ([note] if note else []) + [""] + lines)
+            add_button.config(text=f"Add {count} Shifts", state="normal" if count else "disabled")
+        
+        def accept():
+            touched = []
+            schedule = self.data.setdefault("schedule", {})
+            for day_str, day_shifts in state["shifts"].items():
+                month_key = day_str[:7]
+                if month_key not in schedule:
+                    schedule[month_key] = {}
+                schedule[month_key].setdefault(day_str, []).extend(day_shifts)
+                touched.append(("schedule", month_key, day_str))
+            count = sum(len(day_shifts) for day_shifts in state["shifts"].values())
+            state["shifts"] = {}
+            dialog.destroy()
+            if touched:
+                save_data(self.data, touched=touched)
+                self.draw_calendar()
+                messagebox.showinfo("Auto-Schedule", f"Added {count} shifts.")
+        
+        generate_button = ttk.Button(button_frame, text="Generate", command=generate)
+        generate_button.pack(side="left")
+        add_button = ttk.Button(button_frame, text="Add Shifts", command=accept, state="disabled")
+        add_button.pack(side="left", padx=8)
+        ttk.Button(button_frame, text="Close", command=dialog.destroy).pack(side="right")
+
     def prev_month(self):
         if self.current_month == 1:
             self.current_month = 12
@@ -3674,6 +6630,199 @@ Thank you for keeping your application up to date!"""
         # Redraw the calendar to apply the color change
         self.draw_calendar()
         
+    def toggle_coverage_heatmap(self):
+        """Toggle the staffing strip under each calendar day"""
+        self.show_coverage = not self.show_coverage
+        self.set_setting('show_coverage_heatmap', self.show_coverage)
+        self.show_coverage_heatmap()
+
+    def show_coverage_heatmap(self):
+        """Draw (or remove) the coverage strip of each displayed day from one CoverageMatrix."""
+        cells = getattr(self, 'day_cell_frames', {})
+        for cell_frame in cells.values():
+            strip = getattr(cell_frame, '_coverage_strip', None)
+            if strip is not None:
+                strip.destroy()
+                cell_frame._coverage_strip = None
+        if not self.show_coverage or not cells:
+            return
+        
+        matrix = CoverageMatrix(shared_views(self.data), sorted(cells))
+        for row, day_str in enumerate(matrix.days):
+            cell_frame = cells[day_str]
+            if matrix.open_slots[row] is None:
+                continue
+            try:
+                strip = tk.Canvas(cell_frame, height=8, highlightthickness=0, bg=cell_frame.cget("bg"), cursor="hand2")
+                strip.grid(row=2, column=0, sticky="ew", padx=2, pady=(0, 2))
+                strip.bind("<Configure>", lambda e, c=strip, r=row: self._paint_coverage_strip(c, matrix, r, e.width))
+                strip.bind("<Button-1>", lambda e, r=row: self.show_day_coverage(matrix, r))
+                cell_frame._coverage_strip = strip
+            except tk.TclError:
+                pass
+
+    @staticmethod
+    def coverage_color(have, need):
+        """Heatmap color for a slot: reds when short, green when met, blues when over."""
+        if have < need:
+            return ("#F8C4C4", "#E57373", "#C62828")[min(need - have, 3) - 1]
+        if have > need:
+            return "#90CAF9" if have - need == 1 else "#42A5F5"
+        return "#81C784" if need else ""
+
+    def _paint_coverage_strip(self, canvas, matrix, row, width):
+        canvas.delete("all")
+        first, last = matrix.open_slots[row]
+        slot_width = width / max(last - first, 1)
+        for i, slot in enumerate(range(first, last)):
+            color = self.coverage_color(matrix.headcount[row][slot], matrix.required[row][slot])
+            if color:
+                canvas.create_rectangle(i * slot_width, 0, (i + 1) * slot_width, 8, fill=color, width=0)
+
+    def show_day_coverage(self, matrix, row):
+        """List the stretches of a day that are under or over its staffing requirement."""
+        day_date = datetime.strptime(matrix.days[row], DATE_FMT).strftime("%A, %B %d, %Y")
+        runs = matrix.runs(row)
+        if not any(matrix.required[row]):
+            messagebox.showinfo("Coverage", f"No staffing requirement is set for {day_date}.\n\n"
+                                            "Set one under Store Hours → Staffing Requirements.")
+            return
+        if not runs:
+            messagebox.showinfo("Coverage", f"✅ {day_date} is staffed exactly as required.")
+            return
+        lines = []
+        for start, end, have, need in runs:
+            state = f"short {need - have}" if have < need else f"{have - need} extra"
+            lines.append(f"• {format_minutes(start)} - {format_minutes(end)}: {have} of {need} ({state})")
+        messagebox.showinfo("Coverage", f"Staffing on {day_date}:\n\n" + "\n".join(lines))
+
+    def show_coverage_requirements_dialog(self):
+        """Edit the staffing requirement per weekday and per date override"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Staffing Requirements")
+        dialog.transient(self.root)
+        dialog.grab_set()
+        self.center_dialog(dialog, width=520, height=480)
+        
+        main_frame = ttk.Frame(dialog, padding="15")
+        main_frame.pack(fill="both", expand=True)
+        ttk.Label(main_frame, text="People needed on shift, per half hour. A day with no requirement "
+                                   "is auto-scheduled with the minimum staff setting.",
+                  wraplength=480).pack(anchor="w", pady=(0, 10))
+        
+        # Which row is being edited: a weekday, or a single date's override
+        target_frame = ttk.Frame(main_frame)
+        target_frame.pack(fill="x")
+        ttk.Label(target_frame, text="Apply to:").pack(side="left")
+        targets = [day_name.capitalize() for day_name in Employee.WEEKDAYS] + ["Single date"]
+        target_var = tk.StringVar(value=targets[0])
+        ttk.Combobox(target_frame, textvariable=target_var, values=targets, state="readonly",
+                     width=12).pack(side="left", padx=6)
+        date_var = tk.StringVar(value=date(self.current_year, self.current_month, 1).strftime(DATE_FMT))
+        date_entry = ttk.Entry(target_frame, textvariable=date_var, width=12, state="disabled")
+        date_entry.pack(side="left")
+        
+        ranges_listbox = tk.Listbox(main_frame, height=10)
+        ranges_listbox.pack(fill="both", expand=True, pady=10)
+        status = ttk.Label(main_frame, text="")
+        status.pack(anchor="w")
+        
+        # Start, end and headcount of a range to set
+        edit_frame = ttk.Frame(main_frame)
+        edit_frame.pack(fill="x", pady=6)
+        times = generate_times("12:00 AM", "11:30 PM", COVERAGE_SLOT_MINUTES)
+        start_var, end_var, count_var = tk.StringVar(), tk.StringVar(), tk.IntVar(value=2)
+        ttk.Combobox(edit_frame, textvariable=start_var, values=times, state="readonly", width=10).pack(side="left")
+        ttk.Label(edit_frame, text="to").pack(side="left", padx=4)
+        ttk.Combobox(edit_frame, textvariable=end_var, values=times[1:] + ["11:59 PM"], state="readonly",
+                     width=10).pack(side="left")
+        ttk.Spinbox(edit_frame, from_=0, to=50, textvariable=count_var, width=5).pack(side="left", padx=6)
+        ttk.Label(edit_frame, text="people").pack(side="left")
+        
+        def target():
+            """("weekly", weekday) or ("overrides", date_str) for the current selection."""
+            if target_var.get() == "Single date":
+                return "overrides", date_var.get().strip()
+            return "weekly", target_var.get().lower()
+        
+        def current_row():
+            section, key = target()
+            requirements = self.data.get("coverage_requirements", {})
+            row = requirements.get(section, {}).get(key)
+            if row is None and section == "overrides":
+                try:
+                    row = coverage_requirement(self.data, key)
+                except ValueError:
+                    row = None
+            return list(row) if row is not None else [0] * COVERAGE_SLOTS
+        
+        def refresh(*args):
+            date_entry.config(state="normal" if target_var.get() == "Single date" else "disabled")
+            ranges_listbox.delete(0, tk.END)
+            section, key = target()
+            for start, end, count in requirement_ranges(current_row()):
+                ranges_listbox.insert(tk.END, f"{format_minutes(start)} - {format_minutes(end % MINUTES_PER_DAY)}: "
+                                              f"{count} {'person' if count == 1 else 'people'}")
+            has_override = key in self.data.get("coverage_requirements", {}).get("overrides", {})
+            if section == "overrides":
+                status.config(text="Date override" if has_override else "No override; showing the weekday's requirement")
+            else:
+                status.config(text="")
+        
+        def store(row):
+            section, key = target()
+            if section == "overrides":
+                try:
+                    datetime.strptime(key, DATE_FMT)
+                except ValueError:
+                    messagebox.showerror("Invalid Date", "Enter the date as YYYY-MM-DD.", parent=dialog)
+                    return
+            requirements = self.data.setdefault("coverage_requirements", {})
+            if row is None:
+                requirements.get(section, {}).pop(key, None)
+            else:
+                requirements.setdefault(section, {})[key] = row
+            save_data(self.data, touched=[("coverage_requirements",)])
+            refresh()
+            self.show_coverage_heatmap()
+        
+        def set_range():
+            try:
+                start, end, count = parse_minutes(start_var.get()), parse_minutes(end_var.get()), count_var.get()
+            except (ValueError, tk.TclError):
+                messagebox.showwarning("Missing", "Select a start and end time and a number of people.", parent=dialog)
+                return
+            if end_var.get() == "11:59 PM":
+                end = MINUTES_PER_DAY
+            if end <= start:
+                messagebox.showwarning("Invalid Range", "End time must be after start time.", parent=dialog)
+                return
+            row = current_row()
+            row[start // COVERAGE_SLOT_MINUTES:end // COVERAGE_SLOT_MINUTES] = \
+                [count] * (end // COVERAGE_SLOT_MINUTES - start // COVERAGE_SLOT_MINUTES)
+            store(row)
+        
+        def clear_selected():
+            sel = ranges_listbox.curselection()
+            if not sel:
+                return
+            row = current_row()
+            start, end, _ = requirement_ranges(row)[sel[0]]
+            row[start // COVERAGE_SLOT_MINUTES:end // COVERAGE_SLOT_MINUTES] = \
+                [0] * ((end - start) // COVERAGE_SLOT_MINUTES)
+            store(row)
+        
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill="x", pady=(6, 0))
+        ttk.Button(button_frame, text="Set Range", command=set_range).pack(side="left")
+        ttk.Button(button_frame, text="Clear Selected", command=clear_selected).pack(side="left", padx=6)
+        ttk.Button(button_frame, text="Remove Requirement", command=lambda: store(None)).pack(side="left")
+        ttk.Button(button_frame, text="Close", command=dialog.destroy).pack(side="right")
+        
+        target_var.trace_add("write", refresh)
+        date_var.trace_add("write", refresh)
+        refresh()
+
     def show_color_editor(self):
         """Show comprehensive employee color editor dialog"""
         # Create dialog window
@@ -3858,13 +7007,13 @@ Thank you for keeping your application up to date!"""
             emp_name = emp_listbox.get(sel[0])
             
             # Find and update employee
-            for emp in self.data.get("employees", []):
-                if emp.get("name") == emp_name:
-                    emp["color"] = color
-                    break
+            emp = self.find_employee_by_display(emp_name)
+            if emp:
+                emp["color"] = color
+                employee_index.colors_changed()
             
             # Save data
-            save_data(self.data)
+            save_data(self.data, touched=[("employees",)])
             
             # Refresh calendar if it exists
             if hasattr(self, 'draw_calendar'):
@@ -3921,12 +7070,10 @@ Thank you for keeping your application up to date!"""
             if sel:
                 emp_name = emp_listbox.get(sel[0])
                 # Find employee's current color
-                for emp in self.data.get("employees", []):
-                    if emp.get("name") == emp_name:
-                        current_color = emp.get("color", "#000000")
-                        selected_color.set(current_color)
-                        update_preview()
-                        break
+                emp = self.find_employee_by_display(emp_name)
+                if emp:
+                    selected_color.set(emp.get("color", "#000000"))
+                    update_preview()
         
         emp_listbox.bind("<<ListboxSelect>>", on_employee_select)
         
@@ -3939,7 +7086,8 @@ Thank you for keeping your application up to date!"""
                                     "Reset all employee colors to black?\n\nThis cannot be undone."):
                 for emp in self.data.get("employees", []):
                     emp["color"] = "#000000"
-                save_data(self.data)
+                employee_index.colors_changed()
+                save_data(self.data, touched=[("employees",)])
                 selected_color.set("#000000")
                 update_preview()
                 if hasattr(self, 'draw_calendar'):
@@ -4038,9 +7186,35 @@ Thank you for keeping your application up to date!"""
         # Get all employees sorted alphabetically
         employees = sorted(self.data.get("employees", []), key=lambda emp: emp.get("name", "").lower())
         
-        # Calculate hours for each employee for each week
+        # Calculate hours for each employee for each week in a single pass over
+        # the month's shifts (one indexed query with the SQLite backend)
         month_key = f"{self.current_year}-{self.current_month:02d}"
-        schedule_data = self.data.get("schedule", {}).get(month_key, {})
+        if self.sqlite_indexes_ready():
+            month_shifts = [(emp, day_str, Shift(emp, None, _parse_minutes_or_none(start), _parse_minutes_or_none(end)))
+                            for emp, day_str, start, end in sqlite_store.month_shifts(month_key)]
+        else:
+            schedule_data = self.data.get("schedule", {}).get(month_key, {})
+            month_shifts = [(shift.employee, day_str, shift)
+                            for day_str, day_shifts in schedule_data.items()
+                            for shift in data_model.day_shifts(self.data, day_str, day_shifts)]
+        
+        week_of_day = {}
+        for week_idx, (week_start, week_end) in enumerate(weeks):
+            current_day = week_start
+            while current_day <= week_end:
+                week_of_day[current_day.strftime(DATE_FMT)] = week_idx
+                current_day += timedelta(days=1)
+        
+        weekly_minutes = {}
+        for shift_emp, day_str, shift in month_shifts:
+            week_idx = week_of_day.get(day_str)
+            # Skip invalid time formats
+            if week_idx is None or not shift.valid:
+                continue
+            # Shift.minutes handles overnight shifts
+            key = (shift_emp, week_idx)
+            weekly_minutes[key] = weekly_minutes.get(key, 0) + shift.minutes
+        weekly_hours = {key: minutes / 60 for key, minutes in weekly_minutes.items()}
         
         for row, employee in enumerate(employees, 1):
             emp_name = employee.get("name", "")
@@ -4057,37 +7231,8 @@ Thank you for keeping your application up to date!"""
             name_label.grid(row=row, column=0, sticky="nsew")
             
             # Calculate hours for each week
-            for week_idx, (week_start, week_end) in enumerate(weeks):
-                total_hours = 0
-                
-                # Check each day in the week
-                current_day = week_start
-                while current_day <= week_end:
-                    day_str = current_day.strftime(DATE_FMT)
-                    day_shifts = schedule_data.get(day_str, [])
-                    
-                    # Sum hours for this employee on this day
-                    for shift in day_shifts:
-                        if shift.get("employee") == emp_name:
-                            try:
-                                start_time = shift.get("start", "")
-                                end_time = shift.get("end", "")
-                                
-                                if start_time and end_time:
-                                    start_dt = datetime.strptime(start_time, TIME_FMT)
-                                    end_dt = datetime.strptime(end_time, TIME_FMT)
-                                    
-                                    # Handle overnight shifts
-                                    if end_dt <= start_dt:
-                                        end_dt += timedelta(days=1)
-                                    
-                                    hours = (end_dt - start_dt).total_seconds() / 3600
-                                    total_hours += hours
-                            except (ValueError, TypeError):
-                                # Skip invalid time formats
-                                continue
-                    
-                    current_day += timedelta(days=1)
+            for week_idx in range(len(weeks)):
+                total_hours = weekly_hours.get((employee.get("id"), week_idx), 0)
                 
                 # Display hours (rounded to 1 decimal place)
                 hours_text = f"{total_hours:.1f}" if total_hours > 0 else "0"
@@ -4561,6 +7706,10 @@ Thank you for keeping your application up to date!"""
                                                self.add_store_modification, 'primary')
         add_mod_btn.pack(side="top")
         
+        staffing_btn = self.create_modern_button(mod_btn_frame, "👥 Staffing Requirements",
+                                                 self.show_coverage_requirements_dialog, 'primary')
+        staffing_btn.pack(side="top", pady=(8, 0))
+        
         hours_frame = tk.Frame(hours_tile, bg=self.colors['surface_alt'])
         hours_frame.pack(fill="both", expand=True)
         
@@ -4850,17 +7999,17 @@ Thank you for keeping your application up to date!"""
                 
                 # Validate start is before end
                 try:
-                    start_dt = datetime.strptime(start, TIME_FMT)
-                    end_dt = datetime.strptime(end, TIME_FMT)
+                    start_min = parse_minutes(start)
+                    end_min = parse_minutes(end)
                     
-                    if start_dt >= end_dt:
+                    if start_min >= end_min:
                         errors.append(f"{day.capitalize()}: Start time must be before end time")
                         continue
                 except Exception:
                     errors.append(f"{day.capitalize()}: Invalid time format")
                     continue
                 
-                new_store_hours[day] = (start, end)
+                new_store_hours[day] = [start, end]
             else:
                 new_store_hours[day] = None
         
@@ -4875,7 +8024,8 @@ Thank you for keeping your application up to date!"""
         
         # Save to data
         self.data["store_hours"] = new_store_hours
-        save_data(self.data)
+        store_calendar.invalidate()
+        save_data(self.data, touched=[("store_hours",)])
         
         # Refresh Employee Manager availability section
         self.refresh_employee_availability_times()
@@ -4925,6 +8075,8 @@ Thank you for keeping your application up to date!"""
         # Clear old labels list
         self.schedule_labels = []
         self.day_labels = []  # Track day number labels for font updates
+        self.day_header_frames = {}  # day_str -> header frame, where conflict badges go
+        self.day_cell_frames = {}  # day_str -> cell frame, where the coverage strip goes
         
         # Check if this is just a font update (don't rebuild if not needed)
         if hasattr(self, '_skip_calendar_rebuild') and self._skip_calendar_rebuild:
@@ -5046,10 +8198,9 @@ Thank you for keeping your application up to date!"""
                         
                         # Check if this day has store modifications and add undo button if so
                         if hasattr(self, 'day_str') and self.day_str and hasattr(self, 'parent_app') and self.parent_app:
-                            store_modifications = self.parent_app.data.get("store_modifications", {})
-                            if self.day_str in store_modifications:
-                                modification = store_modifications[self.day_str]
-                                if modification["type"] == "closure":
+                            store_day = store_calendar.day(self.parent_app.data, self.day_str)
+                            if store_day.modification is not None:
+                                if store_day.modification == "closure":
                                     tooltip = "Remove store closure and revert to normal hours"
                                 else:  # modified_hours
                                     tooltip = "Remove modified hours and revert to normal hours"
@@ -5978,20 +9129,17 @@ Thank you for keeping your application up to date!"""
                 # Check if store is closed on this day
                 day_dt = date(self.current_year, self.current_month, day)
                 day_str = day_dt.strftime(DATE_FMT)
-                day_name = day_dt.strftime("%A").lower()
-                store_hours = self.data.get("store_hours", {})
-                is_closed = store_hours.get(day_name) is None
+                store_day = store_calendar.day(self.data, day_str)
+                is_closed = store_day.closed
                 
                 # Check for store modifications
-                store_modifications = self.data.get("store_modifications", {})
-                modification = store_modifications.get(day_str)
-                has_modification = modification is not None
+                modification = store_day.modification
+                has_modification = modification in ("closure", "modified_hours")
                 
                 # Set background color based on store status
                 if has_modification:
-                    if modification["type"] == "closure":
+                    if modification == "closure":
                         bg_color = "#FFE6E6"  # Light red for closure days
-                        is_closed = True
                     else:  # modified_hours
                         bg_color = "#FFF0E6"  # Light orange for modified hours
                 elif is_closed:
@@ -6010,6 +9158,8 @@ Thank you for keeping your application up to date!"""
                 
                 # Track day labels for font updates
                 self.day_labels.append(day_label)
+                self.day_header_frames[day_str] = header_frame
+                self.day_cell_frames[day_str] = cell_frame
                 
                 # Content frame (shifts or modification info)
                 content_frame = tk.Frame(cell_frame, bg=bg_color)
@@ -6017,7 +9167,7 @@ Thank you for keeping your application up to date!"""
                 
                 # Display store modification information if present
                 if has_modification:
-                    if modification["type"] == "closure":
+                    if modification == "closure":
                         # Store closure - display normally as it replaces shifts
                         mod_frame = tk.Frame(content_frame, bg=bg_color)
                         mod_frame.pack(fill="x", pady=2)
@@ -6031,7 +9181,7 @@ Thank you for keeping your application up to date!"""
                         closure_label.pack(fill="x")
                         
                         # Show reason (truncated if too long)
-                        reason = modification.get("reason", "")
+                        reason = store_day.reason
                         if len(reason) > 20:
                             reason = reason[:17] + "..."
                         
@@ -6056,8 +9206,8 @@ Thank you for keeping your application up to date!"""
                         bg_mod_frame.place(x=0, y=0, relwidth=1.0, relheight=1.0)  # Cover entire content area
                         
                         # Semi-transparent background for modification info
-                        mod_text = f"⏰ {modification['opening_time']} - {modification['closing_time']}"
-                        reason = modification.get("reason", "")
+                        mod_text = f"⏰ {store_day.hours[0]} - {store_day.hours[1]}"
+                        reason = store_day.reason
                         if len(reason) > 12:
                             reason = reason[:9] + "..."
                         if reason:
@@ -6088,20 +9238,15 @@ Thank you for keeping your application up to date!"""
                 max_display_shifts = 24  # Show up to 24 shifts in 2 columns (12 rows x 2)
                 
                 # Determine shift background based on modification status
-                has_bg_modification = has_modification and modification["type"] == "modified_hours"
+                has_bg_modification = modification == "modified_hours"
                 shift_bg = bg_color if not has_bg_modification else bg_color  # Keep same bg but use transparency effect
                 
                 if num_shifts > 0:
-                    # Sort shifts by start time for better organization (proper time sorting)
-                    def get_sort_time(shift):
-                        try:
-                            # Parse the time string and convert to 24-hour format for proper sorting
-                            dt = datetime.strptime(shift['start'], TIME_FMT)
-                            return dt.hour * 60 + dt.minute  # Convert to minutes for easy comparison
-                        except ValueError:
-                            return 999999  # Put invalid times at the end
-                    
-                    sorted_shifts = sorted(shifts, key=get_sort_time)
+                    # Sort shifts by start time for better organization (minutes since
+                    # midnight from the cached model; malformed times go last)
+                    shift_models = data_model.day_shifts(self.data, day_str, shifts)
+                    order = sorted(range(num_shifts), key=lambda i: shift_models[i].sort_key)
+                    sorted_shifts = [shifts[i] for i in order]
                     
                     # Use larger, more readable fonts for shifts - increased further for 2-column layout
                     if num_shifts <= 4:
@@ -6128,13 +9273,13 @@ Thank you for keeping your application up to date!"""
                         
                         # Left column shift
                         left_shift = shifts_to_show[i]
-                        left_name = left_shift['employee']
+                        left_name = left_full_name = self.shift_employee_name(left_shift)
                         if len(left_name) > 12:  # Shorter for 2-column layout
                             left_name = left_name[:9] + "..."
                         left_text = f"{left_name} ({format_time_simple(left_shift['start'])}-{format_time_simple(left_shift['end'])})"
                         
                         # Get custom employee color
-                        left_employee_color = self.get_employee_color(left_shift['employee'])
+                        left_employee_color = self.get_employee_color(left_full_name)
                         
                         # Make text more prominent if there's background modification
                         if has_bg_modification:
@@ -6165,13 +9310,13 @@ Thank you for keeping your application up to date!"""
                         # Right column shift (if exists)
                         if i + 1 < len(shifts_to_show):
                             right_shift = shifts_to_show[i + 1]
-                            right_name = right_shift['employee']
+                            right_name = right_full_name = self.shift_employee_name(right_shift)
                             if len(right_name) > 12:  # Shorter for 2-column layout
                                 right_name = right_name[:9] + "..."
                             right_text = f"{right_name} ({format_time_simple(right_shift['start'])}-{format_time_simple(right_shift['end'])})"
                             
                             # Get custom employee color
-                            right_employee_color = self.get_employee_color(right_shift['employee'])
+                            right_employee_color = self.get_employee_color(right_full_name)
                             
                             # Make text more prominent if there's background modification
                             if has_bg_modification:
@@ -6231,9 +9376,82 @@ Thank you for keeping your application up to date!"""
                 
                 # Set up the three action icons (edit, copy, delete)
                 hover_mgr.setup_cell_click(day_str, shifts, self)
+        
+        # Show the last known conflicts right away, then re-check the month in the background
+        self.show_conflict_badges()
+        self.start_conflict_audit()
+        self.show_coverage_heatmap()
 
     # Note: Cell menu system now handles its own specific actions through button bindings
 
+    def start_conflict_audit(self):
+        """Re-validate the displayed month's shifts on a worker thread; badges update when it finishes."""
+        first_day = date(self.current_year, self.current_month, 1)
+        last_day = date(self.current_year, self.current_month,
+                        calendar.monthrange(self.current_year, self.current_month)[1])
+        conflict_audit.on_start = self._watch_conflict_audit
+        try:
+            conflict_audit.start(self.data, first_day, last_day)
+        except Exception as e:
+            print(f"Could not start conflict audit: {e}")
+    
+    def _watch_conflict_audit(self):
+        """Poll for the audit just started, wherever it was started from."""
+        self._audit_stamp = schedule_conflicts.stamp
+        if getattr(self, '_audit_poll_timer', None) is None:
+            self._audit_poll_timer = self.root.after(AUDIT_POLL_MS, self._poll_conflict_audit)
+
+    def _poll_conflict_audit(self):
+        result = conflict_audit.poll()
+        if result is None:
+            self._audit_poll_timer = self.root.after(AUDIT_POLL_MS, self._poll_conflict_audit)
+            return
+        self._audit_poll_timer = None
+        days, report = result
+        if report is not None:
+            schedule_conflicts.merge_audit(days, report, self._audit_stamp)
+            self.show_conflict_badges()
+
+    def show_conflict_badges(self):
+        """Badge the calendar days that have conflicts in schedule_conflicts."""
+        for day_str, header_frame in getattr(self, 'day_header_frames', {}).items():
+            try:
+                if not header_frame.winfo_exists():
+                    continue
+                badge = getattr(header_frame, '_conflict_badge', None)
+                if badge is not None:
+                    badge.destroy()
+                    header_frame._conflict_badge = None
+                found = schedule_conflicts.day(day_str)
+                if not found:
+                    continue
+                shift_count = len({conflict.index for conflict in found})
+                badge = tk.Label(header_frame, text=f"⚠ {shift_count}", font=("Segoe UI", 8, "bold"),
+                                 fg="#CC0000", bg=header_frame.cget("bg"), cursor="hand2")
+                badge.pack(side="right", padx=2)
+                badge.bind("<Button-1>", lambda e, d=day_str: self.show_day_conflicts(d))
+                header_frame._conflict_badge = badge
+            except tk.TclError:
+                pass
+
+    def show_day_conflicts(self, day_str):
+        """List the known conflicts on day_str."""
+        found = schedule_conflicts.day(day_str)
+        if not found:
+            return
+        shifts = self.data.get("schedule", {}).get(day_str[:7], {}).get(day_str, [])
+        lines = []
+        for conflict in found:
+            if conflict.index < len(shifts):
+                shift = shifts[conflict.index]
+                label = f"{self.shift_employee_name(shift)} ({shift.get('start', '?')} - {shift.get('end', '?')})"
+            else:
+                label = "Removed shift"
+            lines.append(f"• {label}: {conflict.message}")
+        day_date = datetime.strptime(day_str, DATE_FMT).strftime("%A, %B %d, %Y")
+        messagebox.showwarning("Scheduling Conflicts",
+                               f"⚠️ Shifts on {day_date} that no longer pass validation:\n\n" + "\n".join(lines))
+
     def copy_day_shifts(self, day_str, shifts):
         """Copy shifts to clipboard for later pasting"""
         try:
@@ -6274,25 +9492,17 @@ Thank you for keeping your application up to date!"""
             conflicting_shifts = []
             non_conflicting_shifts = []
             
-            for shift in shifts_to_paste:
-                # DEBUG: Individual shift checking
-                # print(f"   🔍 Checking shift: {shift.get('employee', 'Unknown')} - {shift.get('start', '?')} to {shift.get('end', '?')}")
-                
-                # Use the existing validation method to check for conflicts
-                is_valid, conflicts = self.validate_shift_scheduling(
-                    shift["employee"], target_day_str, 
-                    shift["start"], shift["end"], show_dialog=False)
-                
-                if not is_valid and conflicts:
-                    # DEBUG: Conflicts found
-                    # print(f"   ❌ Conflicts found: {conflicts}")
+            messages = {}
+            for record in self.validate_shifts_batch(shifts_to_paste, [target_day_str]):
+                messages.setdefault(record.index, []).append(record.message)
+            
+            for index, shift in enumerate(shifts_to_paste):
+                if index in messages:
                     conflicting_shifts.append({
                         'shift': shift,
-                        'conflicts': conflicts
+                        'conflicts': messages[index]
                     })
                 else:
-                    # DEBUG: No conflicts
-                    # print(f"   ✅ No conflicts found")
                     non_conflicting_shifts.append(shift)
             
             # If there are conflicts, show conflict resolution dialog
@@ -6357,7 +9567,7 @@ Thank you for keeping your application up to date!"""
             self.data["schedule"][month_key][target_day_str].extend(shifts_to_paste)
             
             # Save data and refresh calendar
-            save_data(self.data)
+            save_data(self.data, touched=[("schedule", month_key, target_day_str)])
             self.draw_calendar()
             
             # Show success message
@@ -6438,7 +9648,7 @@ Thank you for keeping your application up to date!"""
             shift_frame.pack(fill="x", pady=(0, 10))
             
             # Shift header
-            shift_header = f"❌ {shift['employee']} ({shift['start']} - {shift['end']})"
+            shift_header = f"❌ {self.shift_employee_name(shift)} ({shift['start']} - {shift['end']})"
             tk.Label(shift_frame, text=shift_header, font=("Segoe UI", 11, "bold"), 
                     fg="#D32F2F", anchor="w").pack(fill="x")
             
@@ -6522,7 +9732,7 @@ Thank you for keeping your application up to date!"""
                     del self.data["schedule"][month_key][day_str]
                     
                     # Save data and refresh calendar
-                    save_data(self.data)
+                    save_data(self.data, touched=[("schedule", month_key, day_str)])
                     self.draw_calendar()
                     
                     messagebox.showinfo("Shifts Deleted", 
@@ -6536,8 +9746,11 @@ Thank you for keeping your application up to date!"""
     def open_day_editor(self, day_str):
         day_dt = datetime.strptime(day_str, DATE_FMT).date()
         day_name = day_dt.strftime("%A").lower()
-        store_hours = self.data.get("store_hours", {})
-        if store_hours.get(day_name) is None:
+        store_day = store_calendar.day(self.data, day_str)
+        if store_day.modification == "closure":
+            messagebox.showinfo("Closed", f"Store is closed on {day_dt.strftime('%B %d, %Y')}: {store_day.reason_text}. Cannot schedule.")
+            return
+        if store_day.closed:
             messagebox.showinfo("Closed", f"Store is closed on {day_dt.strftime('%A')}. Cannot schedule.")
             return
 
@@ -6552,7 +9765,7 @@ Thank you for keeping your application up to date!"""
         win.grab_set()  # Make dialog modal - must be closed properly
         
         # Set size and center the dialog
-        self.center_dialog(win, width=420, height=400)
+        self.center_dialog(win, width=520, height=440)
         
         # Bind window close event to restore tab selection
         def _restore_tab_later():
@@ -6594,7 +9807,7 @@ Thank you for keeping your application up to date!"""
         day_shifts = month_schedule.get(day_str, [])
 
         for s in day_shifts:
-            shifts_listbox.insert(tk.END, f"{s['employee']} | {s['start']} - {s['end']}")
+            shifts_listbox.insert(tk.END, f"{self.shift_employee_name(s)} | {s['start']} - {s['end']}")
 
         # Add/Edit area with status indicators
         form = tk.Frame(win, pady=8)
@@ -6606,13 +9819,7 @@ Thank you for keeping your application up to date!"""
 
         # Employee row with status
         tk.Label(form, text="Employee:").grid(row=0, column=0, sticky="e", padx=4, pady=4)
-        employees = []
-        for e in self.data.get("employees", []):
-            disp = ((e.get("firstName", "") + " " + e.get("lastName", "")).strip())
-            if disp:
-                employees.append(disp)
-            else:
-                employees.append(e.get("name", ""))
+        employees = [employee_display_name(e) for e in self.data.get("employees", [])]
         # Sort employees alphabetically (case-insensitive)
         employees.sort(key=str.lower)
         emp_var = tk.StringVar()
@@ -6621,10 +9828,8 @@ Thank you for keeping your application up to date!"""
         emp_status = create_status_label()
         emp_status.grid(row=0, column=2, padx=4, pady=4)
 
-        # Generate time options based on store hours for that day
-        store_hours = self.data.get("store_hours", {})
-        store_range = store_hours[day_name]  # tuple or None handled above
-        times = generate_times(store_range[0], store_range[1])
+        # Generate time options based on the store hours in effect that day
+        times = generate_times(store_day.hours[0], store_day.hours[1])
 
         # Start time row with status
         tk.Label(form, text="Start:").grid(row=1, column=0, sticky="e", padx=4, pady=4)
@@ -6642,6 +9847,29 @@ Thank you for keeping your application up to date!"""
         end_status = create_status_label()
         end_status.grid(row=2, column=2, padx=4, pady=4)
 
+        # Available staff picker: narrows the employee list to who is free for the selected times
+        free_only_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(form, text="Only list staff free for these times",
+                       variable=free_only_var).grid(row=3, column=1, sticky="w", padx=4, pady=4)
+        free_status = tk.Label(form, text="", fg="gray", width=30, anchor="w")
+        free_status.grid(row=3, column=2, padx=4, pady=4)
+
+        def refresh_staff_picker(*args):
+            free_status.config(text="")
+            if not free_only_var.get():
+                emp_cb.configure(values=employees)
+                return
+            try:
+                s_min, e_min = parse_minutes(start_var.get()), parse_minutes(end_var.get())
+            except ValueError:
+                free_status.config(text="Select start and end times")
+                emp_cb.configure(values=employees)
+                return
+            free = sorted((employee_display_name(e) for e in availability_index.free(self.data, day_str, s_min, e_min)),
+                          key=str.lower)
+            emp_cb.configure(values=free)
+            free_status.config(text=f"{len(free)} of {len(employees)} free")
+
         def check_conflicts(*args):
             emp_name = emp_var.get()
             start = start_var.get()
@@ -6673,59 +9901,39 @@ Thank you for keeping your application up to date!"""
             # Check if employee already has ANY shift on this day
             month_key = f"{day_dt.year}-{day_dt.month:02d}"
             day_shifts_list = self.data.get("schedule", {}).get(month_key, {}).get(day_str, [])
-            employee_already_scheduled = any(shift["employee"] == emp_name for shift in day_shifts_list)
+            day_intervals = data_model.day_intervals(self.data, day_str, day_shifts_list)
+            employee_already_scheduled = day_intervals.has(emp_data["id"])
             
             if employee_already_scheduled:
                 emp_status.config(text="⚠ Already assigned to this day")
                 emp_cb.configure(style="Invalid.TCombobox")
                 has_conflicts = True
 
-            # Check requested days off (supports new dict-format and legacy strings)
-            def _time_overlap(a_start, a_end, b_start, b_end):
-                return not (a_end <= b_start or a_start >= b_end)
-
-            rd_list = emp_data.get("requested_days_off", [])
-            for req in rd_list:
-                # New structured format
-                if isinstance(req, dict):
-                    rtype = req.get("type")
-                    rdate = req.get("date")
-                    if rtype == "full" and rdate == day_str:
-                        emp_status.config(text="⚠ Requested this day off")
-                        emp_cb.configure(style="Invalid.TCombobox")
-                        has_conflicts = True
-                        break
-                    if rtype == "partial" and rdate == day_str:
-                        # times stored like "HH:MM AM - HH:MM PM"
-                        times = req.get("times", "")
-                        parts = [p.strip() for p in times.split("-")]
-                        if len(parts) == 2:
-                            try:
-                                r_start = datetime.strptime(parts[0], TIME_FMT)
-                                r_end = datetime.strptime(parts[1], TIME_FMT)
-                                # if no start/end selected yet, indicate partial-day request
-                                if not start and not end:
-                                    emp_status.config(text="⚠ Requested partial day off")
-                                    emp_cb.configure(style="Invalid.TCombobox")
-                                    has_conflicts = True
-                                    break
-                                # if both selected, check overlap
-                                if start and end:
-                                    s_dt = datetime.strptime(start, TIME_FMT)
-                                    e_dt = datetime.strptime(end, TIME_FMT)
-                                    if _time_overlap(s_dt, e_dt, r_start, r_end):
-                                        emp_status.config(text="⚠ Requested partial day off (overlaps)")
-                                        start_cb.configure(style="Invalid.TCombobox")
-                                        end_cb.configure(style="Invalid.TCombobox")
-                                        has_conflicts = True
-                                        break
-                            except Exception:
-                                pass
-                else:
-                    # legacy string format
-                    if req == day_str:
-                        emp_status.config(text="⚠ Requested this day off")
-                        emp_cb.configure(style="Invalid.TCombobox")
+            # Check requested days off
+            for req in time_off_index.requests(self.data, emp_data, day_dt.toordinal()):
+                if req.full:
+                    emp_status.config(text="⚠ Requested this day off")
+                    emp_cb.configure(style="Invalid.TCombobox")
+                    has_conflicts = True
+                    break
+                if req.start is None:
+                    continue
+                # if no start/end selected yet, indicate partial-day request
+                if not start and not end:
+                    emp_status.config(text="⚠ Requested partial day off")
+                    emp_cb.configure(style="Invalid.TCombobox")
+                    has_conflicts = True
+                    break
+                # if both selected, check overlap
+                if start and end:
+                    try:
+                        s_min, e_min = parse_minutes(start), parse_minutes(end)
+                    except ValueError:
+                        continue
+                    if s_min < req.end and req.start < e_min:
+                        emp_status.config(text="⚠ Requested partial day off (overlaps)")
+                        start_cb.configure(style="Invalid.TCombobox")
+                        end_cb.configure(style="Invalid.TCombobox")
                         has_conflicts = True
                         break
                 
@@ -6737,25 +9945,25 @@ Thank you for keeping your application up to date!"""
                 has_conflicts = True
             elif start or end:  # Only check times if they're selected
                 try:
-                    avail_start = datetime.strptime(availability[0], TIME_FMT)
-                    avail_end = datetime.strptime(availability[1], TIME_FMT)
+                    avail_start_min = parse_minutes(availability[0])
+                    avail_end_min = parse_minutes(availability[1])
                     
                     if start:
-                        s_dt = datetime.strptime(start, TIME_FMT)
-                        if s_dt < avail_start:
+                        s_min = parse_minutes(start)
+                        if s_min < avail_start_min:
                             start_status.config(text="⚠ Before availability start")
                             start_cb.configure(style="Invalid.TCombobox")
                             has_conflicts = True
                             
                     if end:
-                        e_dt = datetime.strptime(end, TIME_FMT)
-                        if e_dt > avail_end:
+                        e_min = parse_minutes(end)
+                        if e_min > avail_end_min:
                             end_status.config(text="⚠ After availability end")
                             end_cb.configure(style="Invalid.TCombobox")
                             has_conflicts = True
                         
                         # Check if start and end are both selected and if end is before or equal to start
-                        if start and e_dt <= datetime.strptime(start, TIME_FMT):
+                        if start and e_min <= parse_minutes(start):
                             end_status.config(text="⚠ Must be after start time")
                             end_cb.configure(style="Invalid.TCombobox")
                             has_conflicts = True
@@ -6766,20 +9974,11 @@ Thank you for keeping your application up to date!"""
             # Check for overlapping shifts if we have both start and end times
             if start and end and emp_name:
                 try:
-                    s_dt = datetime.strptime(start, TIME_FMT)
-                    e_dt = datetime.strptime(end, TIME_FMT)
-                    month_key = f"{day_dt.year}-{day_dt.month:02d}"
-                    shifts = self.data.get("schedule", {}).get(month_key, {}).get(day_str, [])
-                    
-                    for shift in shifts:
-                        if shift["employee"] == emp_name:
-                            shift_start = datetime.strptime(shift["start"], TIME_FMT)
-                            shift_end = datetime.strptime(shift["end"], TIME_FMT)
-                            if not (e_dt <= shift_start or s_dt >= shift_end):
-                                emp_status.config(text="⚠ Overlaps with existing shift")
-                                start_cb.configure(style="Invalid.TCombobox")
-                                end_cb.configure(style="Invalid.TCombobox")
-                                has_conflicts = True
+                    if day_intervals.overlapping(emp_data["id"], parse_minutes(start), parse_minutes(end)):
+                        emp_status.config(text="⚠ Overlaps with existing shift")
+                        start_cb.configure(style="Invalid.TCombobox")
+                        end_cb.configure(style="Invalid.TCombobox")
+                        has_conflicts = True
                 except Exception:
                     pass
 
@@ -6787,6 +9986,9 @@ Thank you for keeping your application up to date!"""
         emp_var.trace_add("write", check_conflicts)
         start_var.trace_add("write", check_conflicts)
         end_var.trace_add("write", check_conflicts)
+        start_var.trace_add("write", refresh_staff_picker)
+        end_var.trace_add("write", refresh_staff_picker)
+        free_only_var.trace_add("write", refresh_staff_picker)
 
         def add_shift():
             emp_name = emp_var.get()
@@ -6810,12 +10012,8 @@ Thank you for keeping your application up to date!"""
                 self.data["schedule"] = {}
             if month_key not in self.data["schedule"]:
                 self.data["schedule"][month_key] = {}
-            self.data["schedule"][month_key].setdefault(day_str, []).append({
-                "employee": emp_name,
-                "start": start,
-                "end": end
-            })
-            save_data(self.data)
+            self.data["schedule"][month_key].setdefault(day_str, []).append(self.make_shift(emp_name, start, end))
+            save_data(self.data, touched=[("schedule", month_key, day_str)])
             # refresh UI
             shifts_listbox.insert(tk.END, f"{emp_name} | {start} - {end}")
             self.draw_calendar()
@@ -6840,17 +10038,120 @@ Thank you for keeping your application up to date!"""
                 if not self.data["schedule"][month_key][day_str]:
                     # remove empty day entry
                     del self.data["schedule"][month_key][day_str]
-                save_data(self.data)
+                save_data(self.data, touched=[("schedule", month_key, day_str)])
                 shifts_listbox.delete(idx)
                 self.draw_calendar()
-                messagebox.showinfo("Removed", f"Removed shift for {removed['employee']}")
+                messagebox.showinfo("Removed", f"Removed shift for {self.shift_employee_name(removed)}")
+
+        def replace_selected_shift():
+            sel = shifts_listbox.curselection()
+            if not sel:
+                messagebox.showwarning("No Shift Selected", "Select the shift being called off.", parent=win)
+                return
+            
+            def update_listbox(idx, shift):
+                shifts_listbox.delete(idx)
+                if shift is not None:
+                    shifts_listbox.insert(idx, f"{self.shift_employee_name(shift)} | {shift['start']} - {shift['end']}")
+            self.show_call_off_dialog(day_str, sel[0], update_listbox, parent=win)
 
         # Buttons
         btn_frame = tk.Frame(win, pady=8)
         btn_frame.pack()
         tk.Button(btn_frame, text="Add Shift", command=add_shift).grid(row=0, column=0, padx=6)
         tk.Button(btn_frame, text="Remove Selected Shift", command=remove_selected_shift).grid(row=0, column=1, padx=6)
-        tk.Button(btn_frame, text="Close", command=on_close).grid(row=0, column=2, padx=6)
+        tk.Button(btn_frame, text="Call Off / Replace", command=replace_selected_shift).grid(row=0, column=2, padx=6)
+        tk.Button(btn_frame, text="Close", command=on_close).grid(row=0, column=3, padx=6)
+
+    def show_call_off_dialog(self, day_str, slot, on_change=None, parent=None):
+        """Offer ranked replacements for the shift at slot on day_str and reassign or remove it.
+        
+        on_change(slot, shift) is called after the change, with shift None when it was removed.
+        """
+        day_list = self.data.get("schedule", {}).get(day_str[:7], {}).get(day_str, [])
+        if slot >= len(day_list):
+            return
+        shift = day_list[slot]
+        try:
+            start, end = parse_minutes(shift["start"]), parse_minutes(shift["end"])
+        except (ValueError, KeyError, TypeError):
+            messagebox.showerror("Invalid Shift", "This shift's times can't be read, so no replacement can be found.",
+                                 parent=parent)
+            return
+        absent_emp = employee_index.find_by_id(self.data, shift.get("employee_id"))
+        absent = employee_display_name(absent_emp) if absent_emp else self.shift_employee_name(shift)
+        candidates = replacement_candidates(shared_views(self.data), day_str, start, end,
+                                            exclude=shift.get("employee_id"))
+        
+        dialog = tk.Toplevel(parent or self.root)
+        dialog.title("Call Off / Replace")
+        dialog.transient(parent or self.root)
+        dialog.grab_set()
+        self.center_dialog(dialog, width=560, height=420)
+        main_frame = ttk.Frame(dialog, padding="15")
+        main_frame.pack(fill="both", expand=True)
+        day_date = datetime.strptime(day_str, DATE_FMT).strftime("%A, %B %d")
+        ttk.Label(main_frame, text=f"Replacing {absent}, {shift['start']} - {shift['end']} on {day_date}",
+                  font=("Segoe UI", 11, "bold")).pack(anchor="w", pady=(0, 8))
+        
+        columns = ("employee", "week", "headroom", "note")
+        tree = ttk.Treeview(main_frame, columns=columns, show="headings", height=12, selectmode="browse")
+        for column, heading, width in zip(columns, ("Employee", "Hours this week", "Overtime headroom", "Note"),
+                                          (170, 110, 120, 120)):
+            tree.heading(column, text=heading)
+            tree.column(column, width=width, anchor="w")
+        tree.pack(fill="both", expand=True)
+        for i, candidate in enumerate(candidates):
+            headroom = "-" if candidate.headroom is None else f"{candidate.headroom / 60:.1f} h"
+            notes = []
+            if candidate.headroom is not None and candidate.headroom < 0:
+                notes.append("overtime")
+            if candidate.same_day:
+                notes.append("works today")
+            tree.insert("", tk.END, iid=str(i), values=(employee_display_name(candidate.employee),
+                                                        f"{candidate.week_minutes / 60:.1f} h", headroom,
+                                                        ", ".join(notes)))
+        if candidates:
+            tree.selection_set("0")
+        else:
+            ttk.Label(main_frame, text="Nobody else is free for these times.").pack(anchor="w", pady=4)
+        
+        def finish(new_shift):
+            if new_shift is None:
+                day_list.pop(slot)
+                if not day_list:
+                    del self.data["schedule"][day_str[:7]][day_str]
+            else:
+                day_list[slot] = new_shift
+            save_data(self.data, touched=[("schedule", day_str[:7], day_str)])
+            dialog.destroy()
+            self.draw_calendar()
+            if on_change is not None:
+                on_change(slot, new_shift)
+        
+        def assign(candidate):
+            name = employee_display_name(candidate.employee)
+            if candidate.headroom is not None and candidate.headroom < 0 and not messagebox.askyesno(
+                    "Overtime", f"{name} would go {-candidate.headroom / 60:.1f} hours over the overtime "
+                                "threshold this week. Assign anyway?", parent=dialog):
+                return
+            # The candidate's id is already known; a name lookup could pick a namesake
+            finish({"employee_id": candidate.employee["id"], "start": shift["start"], "end": shift["end"]})
+        
+        def assign_selected():
+            sel = tree.selection()
+            if sel:
+                assign(candidates[int(sel[0])])
+        
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill="x", pady=(10, 0))
+        state = "normal" if candidates else "disabled"
+        ttk.Button(button_frame, text="Assign Selected", command=assign_selected, state=state).pack(side="left")
+        ttk.Button(button_frame, text="Assign Best", state=state,
+                   command=lambda: assign(candidates[0])).pack(side="left", padx=6)
+        ttk.Button(button_frame, text="Remove Shift Only", command=lambda: finish(None)).pack(side="left")
+        ttk.Button(button_frame, text="Cancel", command=dialog.destroy).pack(side="right")
+        tree.bind("<Double-1>", lambda e: assign_selected())
 
     def generate_month_pdf(self):
         month_key = f"{self.current_year}-{self.current_month:02d}"
@@ -6867,6 +10168,12 @@ Thank you for keeping your application up to date!"""
         
         if not file_path:  # User cancelled
             return
+        
+        try:
+            canvas, letter = load_pdf_canvas()
+        except ImportError as e:
+            messagebox.showerror("Missing Component", f"PDF export requires reportlab:\n{e}")
+            return
             
         c = canvas.Canvas(file_path, pagesize=letter)
         width, height = letter
@@ -6917,21 +10224,18 @@ Thank you for keeping your application up to date!"""
                 # Check if store is closed on this day and for modifications
                 day_dt = date(self.current_year, self.current_month, day)
                 day_str = day_dt.strftime(DATE_FMT)
-                day_name = day_dt.strftime("%A").lower()
-                store_hours = self.data.get("store_hours", {})
-                is_closed = store_hours.get(day_name) is None
+                store_day = store_calendar.day(self.data, day_str)
+                is_closed = store_day.closed
                 
                 # Check for store modifications
-                store_modifications = self.data.get("store_modifications", {})
-                modification = store_modifications.get(day_str)
+                modification = store_day.modification
                 
-                if modification:
-                    if modification["type"] == "closure":
+                if modification in ("closure", "modified_hours"):
+                    if modification == "closure":
                         # Store closure - light red
                         c.setFillColorRGB(1.0, 0.9, 0.9)  # #FFE6E6
                         c.rect(x0, y0 - cell_h, cell_w, cell_h, stroke=1, fill=1)
                         c.setFillColorRGB(0, 0, 0)  # Reset to black for text
-                        is_closed = True
                     else:  # modified_hours
                         # Modified hours - light orange
                         c.setFillColorRGB(1.0, 0.94, 0.9)  # #FFF0E6
@@ -6952,8 +10256,8 @@ Thank you for keeping your application up to date!"""
                 
                 # Display store modification information if present
                 y_offset = 28  # Starting position for modification/shift text
-                if modification:
-                    if modification["type"] == "closure":
+                if modification in ("closure", "modified_hours"):
+                    if modification == "closure":
                         # Show closure information
                         c.setFont("Helvetica-Bold", 8)
                         c.setFillColorRGB(0.8, 0, 0)  # Red text
@@ -6963,7 +10267,7 @@ Thank you for keeping your application up to date!"""
                         # Show closure reason (truncated if needed)
                         c.setFont("Helvetica", 7)
                         c.setFillColorRGB(0.4, 0.4, 0.4)  # Grey text
-                        reason = modification.get("reason", "")
+                        reason = store_day.reason
                         max_width = cell_w - 8
                         if c.stringWidth(reason, "Helvetica", 7) > max_width:
                             # Simple truncation for PDF
@@ -6980,14 +10284,14 @@ Thank you for keeping your application up to date!"""
                         # Show modified hours
                         c.setFont("Helvetica-Bold", 7)
                         c.setFillColorRGB(1.0, 0.55, 0)  # Orange text
-                        hours_text = f"{modification['opening_time']} - {modification['closing_time']}"
+                        hours_text = f"{store_day.hours[0]} - {store_day.hours[1]}"
                         c.drawString(x0 + 4, y0 - y_offset, hours_text)
                         y_offset += 10
                         
                         # Show reason (truncated if needed)
                         c.setFont("Helvetica", 6)
                         c.setFillColorRGB(0.4, 0.4, 0.4)  # Grey text
-                        reason = modification.get("reason", "")
+                        reason = store_day.reason
                         max_width = cell_w - 8
                         if c.stringWidth(reason, "Helvetica", 6) > max_width:
                             char_width = c.stringWidth("A", "Helvetica", 6)
@@ -7050,7 +10354,7 @@ Thank you for keeping your application up to date!"""
                     # Build shift entries as (name, times) so we can render name then indented times
                     shift_entries = []
                     for s in shifts:
-                        emp_display = s.get('employee', '')
+                        emp_display = self.shift_employee_name(s)
                         # try to find matching employee record
                         matched = self.find_employee_by_display(emp_display)
                         if matched:
@@ -7241,6 +10545,18 @@ Thank you for keeping your application up to date!"""
 
 
 if __name__ == "__main__":
+    if getattr(sys, "frozen", False):
+        # Lets the packaged executable start schedule optimizer workers
+        import multiprocessing
+        multiprocessing.freeze_support()
+    
+    if "--migrate-to-sqlite" in sys.argv:
+        # One-shot migration of the JSON data into employees.db
+        migrate_json_to_sqlite()
+        print(f"Migrated {DATA_FILE} to {DB_FILE} (previous JSON kept as {DATA_FILE}.bak)")
+        sys.exit(0)
+    
+    startup_profile.mark("module setup")
     root = tk.Tk()
     root.title("Work Scheduler")
     
@@ -7252,6 +10568,9 @@ if __name__ == "__main__":
     if "clam" in style.theme_names():
         style.theme_use("clam")
     
+    startup_profile.mark("Tk root")
+    
     # Create app - splash screen will be handled by the app itself
     app = WorkSchedulerApp(root)
+    root.after_idle(startup_profile.finish)
     root.mainloop()
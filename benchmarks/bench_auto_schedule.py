@@ -0,0 +1,72 @@
+"""Time the auto-scheduler filling a month, plus the batch validation pass over its proposal.
+
+Starts from generated employees with an empty schedule for the month, so every
+open slot has to be filled. With --candidates above 1 it also times the
+multi-start optimizer at 1, 2, 4, ... process-pool workers up to the core
+count. Runs without a display.
+
+Usage: python benchmarks/bench_auto_schedule.py [--month 2025-10] [--employees 100] [--min-staff 6]
+                                                [--candidates 32] [--seed 0]
+"""
+import argparse
+import calendar
+import os
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import WorkScheduler as ws  # noqa: E402
+from sample_data import generate_dataset  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--month", default="2025-10")
+    parser.add_argument("--employees", type=int, default=100)
+    parser.add_argument("--min-staff", type=int, default=6)
+    parser.add_argument("--candidates", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    year, month = (int(part) for part in args.month.split("-"))
+    data = generate_dataset(years=1, employee_count=args.employees, shifts_per_day=0, start=date(year, month, 1))
+    data["settings"].update({"overtime_threshold": 40, "default_break_time": 30, "default_shift_length": 8})
+    days = [date(year, month, day).strftime(ws.DATE_FMT) for day in range(1, calendar.monthrange(year, month)[1] + 1)]
+    app = object.__new__(ws.WorkSchedulerApp)
+    app.data = data
+
+    start = time.perf_counter()
+    proposal = ws.ScheduleGenerator(ws.shared_views(data), min_staff=args.min_staff).run(days)
+    generate_time = time.perf_counter() - start
+    start = time.perf_counter()
+    conflicts = app.validate_shifts_batch(proposal.shifts)
+    validate_time = time.perf_counter() - start
+
+    print(f"Month {args.month}: {args.employees} employees, {args.min_staff} on shift\n")
+    print(f"{'generate':<12}{generate_time * 1000:>10.1f}ms   {proposal.shift_count} shifts, "
+          f"{proposal.short_slots} short person-slots")
+    print(f"{'validate':<12}{validate_time * 1000:>10.1f}ms   {len(conflicts)} conflicts")
+    print(f"{'score':<12}{str(ws.proposal_score(ws.shared_views(data), proposal, days)):>10}")
+
+    if args.candidates <= 1:
+        return
+    print(f"\n{args.candidates} candidates, seed {args.seed}:")
+    workers = 1
+    while True:
+        optimizer = ws.ScheduleOptimizer(data, days, min_staff=args.min_staff, seed=args.seed,
+                                         candidates=args.candidates, time_budget=600, workers=workers)
+        start = time.perf_counter()
+        best = optimizer.run()
+        elapsed = time.perf_counter() - start
+        print(f"{workers:>3} worker{'s' if workers != 1 else ' '}{elapsed * 1000:>10.1f}ms   "
+              f"best #{optimizer.best_index + 1}, score {ws.proposal_score(ws.shared_views(data), best, days)}")
+        if workers >= (os.cpu_count() or 1):
+            break
+        workers = min(workers * 2, os.cpu_count() or 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Time the data work of a full-month calendar redraw with and without the time codec memo.
+
+Covers what draw_calendar() computes for each cell (store status, shift sort,
+names, colors and the short "7-3:30" time labels) but not the Tk widgets, so it
+runs without a display. The typed shift views and store calendar are dropped
+before each redraw, as after an edit, so every shift time is parsed again.
+
+Usage: python benchmarks/bench_month_redraw.py [--month 2025-10] [--employees 40] [--repeat 20]
+"""
+import argparse
+import calendar
+import os
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import WorkScheduler as ws  # noqa: E402
+from sample_data import generate_dataset  # noqa: E402
+
+
+class UncachedTimeCodec(ws.TimeCodec):
+    """TimeCodec that computes every conversion, i.e. the cost before the memo."""
+
+    def _lookup(self, key, compute, *args):
+        self.misses += 1
+        return compute(*args)
+
+
+def redraw_month(data, year, month):
+    """Build the text and colors of every calendar cell in the month."""
+    month_key = f"{year}-{month:02d}"
+    ws.data_model.invalidate([("schedule", month_key)])
+    ws.store_calendar.invalidate()
+    cells = []
+    for week in calendar.monthcalendar(year, month):
+        for day in week:
+            if day == 0:
+                continue
+            day_str = date(year, month, day).strftime(ws.DATE_FMT)
+            store_day = ws.store_calendar.day(data, day_str)
+            shifts = [] if store_day.modification == "closure" else \
+                data.get("schedule", {}).get(month_key, {}).get(day_str, [])
+            shift_models = ws.data_model.day_shifts(data, day_str, shifts)
+            order = sorted(range(len(shifts)), key=lambda i: shift_models[i].sort_key)
+            labels = []
+            for i in order:
+                name = ws.employee_index.shift_name(data, shifts[i])
+                labels.append((f"{name} ({ws.format_time_simple(shifts[i]['start'])}-"
+                               f"{ws.format_time_simple(shifts[i]['end'])})",
+                               ws.employee_index.color(data, name)))
+            cells.append((day_str, store_day.closed, labels))
+    return cells
+
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--month", default="2025-10")
+    parser.add_argument("--employees", type=int, default=40)
+    parser.add_argument("--shifts-per-day", type=int, default=24)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    year, month = (int(part) for part in args.month.split("-"))
+    data = generate_dataset(years=1, employee_count=args.employees, shifts_per_day=args.shifts_per_day,
+                            start=date(year, month, 1))
+    shift_count = sum(len(shifts) for shifts in data["schedule"].get(args.month, {}).values())
+    print(f"Month {args.month}: {shift_count} shifts, {args.employees} employees\n")
+
+    cached = ws.time_codec
+    ws.time_codec = UncachedTimeCodec()
+    uncached_time = best_of(args.repeat, lambda: redraw_month(data, year, month))
+    ws.time_codec = cached
+    redraw_month(data, year, month)  # warm the memo, as any earlier redraw would
+    cached.hits = cached.misses = 0
+    cached_time = best_of(args.repeat, lambda: redraw_month(data, year, month))
+
+    print(f"{'time codec':<12}{'redraw':>10}")
+    print(f"{'uncached':<12}{uncached_time * 1000:>8.2f}ms")
+    print(f"{'memoized':<12}{cached_time * 1000:>8.2f}ms   ({uncached_time / cached_time:.1f}x)")
+    print(f"\nMemo hit rate: {cached.hit_rate:.1%} ({cached.hits} hits, {cached.misses} misses)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Compare save/load time and file size of the pretty, compact and gzip storage formats.
+
+Usage: python benchmarks/bench_storage_formats.py [--years 5] [--employees 40] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import WorkScheduler as ws  # noqa: E402
+from sample_data import generate_dataset  # noqa: E402
+
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--employees", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    data = generate_dataset(years=args.years, employee_count=args.employees)
+    shift_count = sum(len(s) for month in data["schedule"].values() for s in month.values())
+    print(f"Dataset: {args.years} years, {args.employees} employees, {shift_count} shifts\n")
+    print(f"{'format':<10}{'size':>12}{'save':>12}{'load':>12}")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        for storage_format in ws.STORAGE_FORMATS:
+            data["settings"]["storage_format"] = storage_format
+            # touched=None forces a full re-encode, i.e. the cost without the section cache
+            save_time = best_of(args.repeat, lambda: ws.write_data(data))
+            size = os.path.getsize(ws.snapshot_file_for(storage_format))
+            load_time = best_of(args.repeat, ws.load_data)
+            print(f"{storage_format:<10}{size / 1024:>10.0f}KB{save_time * 1000:>10.0f}ms{load_time * 1000:>10.0f}ms")
+        os.chdir(os.path.dirname(workdir))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Synthetic scheduler data for the benchmark scripts."""
+import random
+from datetime import date, timedelta
+
+FIRST_NAMES = ["Alex", "Blake", "Casey", "Dana", "Emery", "Finley", "Gray", "Harper", "Indy", "Jordan",
+               "Kai", "Logan", "Morgan", "Noel", "Oakley", "Parker", "Quinn", "Riley", "Sage", "Taylor"]
+LAST_NAMES = ["Smith", "Jones", "Brown", "Garcia", "Miller", "Davis", "Wilson", "Moore", "Clark", "Lewis"]
+DAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+SHIFT_TIMES = [("8:30 AM", "1:00 PM"), ("9:00 AM", "5:00 PM"), ("10:00 AM", "4:00 PM"),
+               ("12:00 PM", "7:00 PM"), ("1:00 PM", "7:00 PM"), ("9:00 AM", "3:00 PM")]
+
+
+def generate_dataset(years=5, employee_count=40, shifts_per_day=10, start=date(2021, 1, 1), seed=42):
+    """Return a data dict shaped like employees.json covering `years` years of schedules."""
+    rng = random.Random(seed)
+    employees = []
+    for emp_id in range(1, employee_count + 1):
+        first = FIRST_NAMES[emp_id % len(FIRST_NAMES)]
+        last = f"{LAST_NAMES[emp_id % len(LAST_NAMES)]}{emp_id}"
+        availability = {day: ["8:30 AM", "7:00 PM"] if rng.random() < 0.8 else ["off"] for day in DAYS[:6]}
+        availability["sunday"] = ["off"]
+        employees.append({
+            "id": emp_id,
+            "name": f"{first} {last}",
+            "firstName": first,
+            "lastName": last,
+            "position": "",
+            "color": f"#{rng.randrange(0x1000000):06x}",
+            "availability": availability,
+            "requested_days_off": [],
+        })
+
+    schedule = {}
+    end = date(start.year + years, start.month, start.day)
+    day = start
+    while day < end:
+        if day.weekday() != 6:  # closed on Sundays
+            day_str = day.strftime("%Y-%m-%d")
+            month = schedule.setdefault(day_str[:7], {})
+            month[day_str] = [
+                {"employee_id": emp["id"], "start": times[0], "end": times[1]}
+                for emp, times in zip(rng.sample(employees, shifts_per_day),
+                                      (rng.choice(SHIFT_TIMES) for _ in range(shifts_per_day)))
+            ]
+            if rng.random() < 0.02:
+                emp = rng.choice(employees)
+                emp["requested_days_off"].append({"date": day_str, "type": "full"})
+        day += timedelta(days=1)
+
+    return {
+        "employees": employees,
+        "schedule": schedule,
+        "store_hours": {
+            "monday": ["8:30 AM", "7:00 PM"],
+            "tuesday": ["8:30 AM", "7:00 PM"],
+            "wednesday": ["8:30 AM", "7:00 PM"],
+            "thursday": ["8:30 AM", "7:00 PM"],
+            "friday": ["8:30 AM", "7:00 PM"],
+            "saturday": ["9:00 AM", "3:00 PM"],
+            "sunday": None,
+        },
+        "settings": {},
+        "schema_version": 2,  # WorkScheduler.SCHEMA_VERSION, so loading doesn't migrate
+    }
@@ -0,0 +1,46 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import WorkScheduler as ws  # noqa: E402
+
+WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+
+def make_employee(emp_id, name, hours=("8:00 AM", "8:00 PM"), days=WEEKDAYS, time_off=()):
+    first, _, last = name.partition(" ")
+    return {"id": emp_id, "name": name, "firstName": first, "lastName": last, "color": "#000000",
+            "availability": {day: list(hours) if day in days else ["off"] for day in WEEKDAYS},
+            "requested_days_off": list(time_off)}
+
+
+def make_data(employees, schedule=None, **settings):
+    return {"employees": employees, "schedule": schedule or {},
+            "store_hours": {day: ["8:00 AM", "8:00 PM"] for day in WEEKDAYS},
+            "settings": settings, "schema_version": ws.SCHEMA_VERSION}
+
+
+def make_app(data):
+    """A WorkSchedulerApp carrying data, without a window."""
+    app = object.__new__(ws.WorkSchedulerApp)
+    app.data = data
+    return app
+
+
+@pytest.fixture
+def store_dir(tmp_path, monkeypatch):
+    """Run in an empty directory with fresh storage singletons."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(ws, "change_journal", ws.ChangeJournal(ws.JOURNAL_FILE))
+    monkeypatch.setattr(ws, "month_shards", ws.MonthShardStore(ws.SHARD_DIR))
+    monkeypatch.setattr(ws, "sqlite_store", ws.SqliteStore(ws.DB_FILE))
+    monkeypatch.setattr(ws, "section_cache", ws.SectionCache())
+    monkeypatch.setattr(ws, "data_writer", ws.BackgroundWriter(ws.write_data, interval_ms=10))
+    monkeypatch.setattr(ws, "schedule_conflicts", ws.ConflictSet())
+    monkeypatch.setattr(ws, "conflict_audit", ws.ConflictAudit())
+    yield tmp_path
+    ws.data_writer.flush(10)
+    ws.sqlite_store.detach()
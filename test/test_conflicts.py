@@ -0,0 +1,40 @@
+from conftest import make_data, make_employee, ws
+
+MONDAY = "2025-10-06"
+
+
+def _data_with_conflict():
+    # Available from noon only, so the 9:00 AM shift conflicts
+    emp = make_employee(1, "Alex Smith", hours=("12:00 PM", "8:00 PM"))
+    return make_data([emp], {"2025-10": {MONDAY: [{"employee_id": 1, "start": "09:00 AM", "end": "05:00 PM"}]}})
+
+
+def test_saving_a_day_records_its_conflicts(store_dir):
+    data = _data_with_conflict()
+    ws.save_data(data, touched=[("schedule", "2025-10", MONDAY)])
+    assert [c.kind for c in ws.schedule_conflicts.day(MONDAY)] == ["availability"]
+
+
+def test_full_save_keeps_findings_instead_of_clearing(store_dir):
+    data = _data_with_conflict()
+    ws.save_data(data, touched=[("schedule", "2025-10", MONDAY)])
+    ws.save_data(data)
+    assert ws.schedule_conflicts.day(MONDAY)
+
+
+def test_employee_rename_rewords_findings(store_dir):
+    data = _data_with_conflict()
+    ws.save_data(data, touched=[("schedule", "2025-10", MONDAY)])
+    data["employees"][0]["name"] = "Alex Jones"
+    ws.save_data(data, touched=[("employees",)])
+    assert "Alex Jones" in ws.schedule_conflicts.day(MONDAY)[0].message
+
+
+def test_failing_revalidation_still_queues_the_write(store_dir, monkeypatch):
+    def broken(*args, **kwargs):
+        raise RuntimeError("validation bug")
+    monkeypatch.setattr(ws, "stored_shift_conflicts", broken)
+    data = _data_with_conflict()
+    ws.save_data(data, touched=[("schedule", "2025-10", MONDAY)])
+    assert ws.flush_data(10)
+    assert ws.load_data()["schedule"]["2025-10"][MONDAY] == data["schedule"]["2025-10"][MONDAY]
@@ -0,0 +1,282 @@
+"""The schedule indexes against brute-force scans of the same data."""
+import random
+
+import pytest
+
+from conftest import ws
+
+EMPLOYEES = (1, 2, 3, "Former Hire")
+
+
+def _time(rng, step=5):
+    """A stored time string; now and then a malformed one."""
+    if rng.random() < 0.05:
+        return "25:99 XM"
+    return ws.format_minutes(rng.randrange(0, ws.MINUTES_PER_DAY, step))
+
+
+def _reaches(start, end):
+    """End minute of a stored span; one ending at or before its start runs to midnight."""
+    return end if end > start else ws.MINUTES_PER_DAY
+
+
+# ANCHOR DayIntervals
+def _overlapping(shifts, employee, start, end, exclude_slot):
+    found = []
+    for slot, shift in enumerate(shifts):
+        if shift.employee != employee or not shift.valid or slot == exclude_slot:
+            continue
+        if start < _reaches(shift.start, shift.end) and shift.start < end:
+            found.append(slot)
+    return found
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_day_intervals_match_a_linear_scan(seed):
+    rng = random.Random(seed)
+    shifts = [ws.Shift.from_dict("2025-10-06", {"employee_id": rng.choice(EMPLOYEES), "start": _time(rng),
+                                                "end": _time(rng)})
+              for _ in range(rng.randint(0, 25))]
+    intervals = ws.DayIntervals()
+    for slot in rng.sample(range(len(shifts)), len(shifts)):  # insertion order must not matter
+        intervals.add(shifts[slot], slot)
+
+    for _ in range(200):
+        employee = rng.choice(EMPLOYEES)
+        start = rng.randrange(0, ws.MINUTES_PER_DAY, 5)
+        end = rng.randrange(start + 5, ws.MINUTES_PER_DAY + 5, 5)
+        exclude_slot = rng.choice([None] + list(range(len(shifts))))
+        assert intervals.overlapping(employee, start, end, exclude_slot) == \
+            _overlapping(shifts, employee, start, end, exclude_slot)
+        assert intervals.has(employee) == any(shift.employee == employee for shift in shifts)
+        assert sorted(intervals.invalid.get(employee, [])) == \
+            [slot for slot, shift in enumerate(shifts) if shift.employee == employee and not shift.valid]
+
+
+def test_an_overnight_shift_blocks_the_rest_of_its_day():
+    intervals = ws.DayIntervals([ws.Shift(1, None, 22 * 60, 2 * 60), ws.Shift(1, None, 9 * 60, 12 * 60)])
+    assert intervals.overlapping(1, 23 * 60, 23 * 60 + 30) == [0]
+    assert intervals.overlapping(1, 60, 3 * 60) == []
+    assert intervals.overlapping(1, 11 * 60, 23 * 60) == [0, 1]
+    assert intervals.overlapping(1, 11 * 60, 23 * 60, exclude_slot=0) == [1]
+
+
+# ANCHOR TimeOffIndex
+def _time_off_entry(rng):
+    day = f"2025-10-{rng.randint(1, 10):02d}"
+    kind = rng.random()
+    if kind < 0.4:
+        return {"date": day, "type": "full"}
+    if kind < 0.9:
+        return {"date": day, "type": "partial", "times": f"{_time(rng, 15)} - {_time(rng, 15)}"}
+    if kind < 0.95:
+        return {"date": day, "type": "unpaid"}  # never blocks a shift
+    return {"date": "October 3rd", "type": "full"}  # unreadable date
+
+
+def _requests(emp, day):
+    found = []
+    for entry in emp.get("requested_days_off", []):
+        try:
+            request = ws.TimeOffRequest.from_dict(entry)
+        except (ValueError, KeyError, TypeError):
+            continue
+        if request is not None and request.day == day:
+            found.append(request)
+    return found
+
+
+def _as_tuples(requests):
+    return [(r.day, r.full, r.start, r.end, r.times) for r in requests]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_time_off_index_matches_a_scan_through_edits(seed):
+    rng = random.Random(seed)
+    employees = [{"id": emp_id, "requested_days_off": [_time_off_entry(rng) for _ in range(rng.randint(0, 6))]}
+                 for emp_id in range(1, 6)]
+    data = {"employees": employees}
+    index = ws.TimeOffIndex()
+    days = [ws.date_ordinal(f"2025-10-{day:02d}") for day in range(1, 11)]
+
+    for _ in range(150):
+        emp = rng.choice(data["employees"])
+        edit = rng.randrange(6)
+        if edit == 0:
+            emp["requested_days_off"].append(_time_off_entry(rng))
+        elif edit == 1 and emp["requested_days_off"]:
+            emp["requested_days_off"].pop(rng.randrange(len(emp["requested_days_off"])))
+        elif edit == 2:
+            emp["requested_days_off"] = [_time_off_entry(rng)]
+        elif edit == 3 and emp["requested_days_off"]:
+            # Same length: only noticed through updated(), as save_employee_changes() calls it
+            emp["requested_days_off"][0] = _time_off_entry(rng)
+            index.updated(emp)
+        elif edit == 4:
+            data["employees"] = [dict(e, requested_days_off=list(e["requested_days_off"]))
+                                 for e in data["employees"]]
+        elif edit == 5 and len(data["employees"]) > 1:
+            # As remove_employee() does
+            data["employees"].remove(emp)
+            index.removed(emp)
+        for other in data["employees"]:
+            for day in days:
+                assert _as_tuples(index.requests(data, other, day)) == _as_tuples(_requests(other, day))
+
+
+def test_partial_time_off_ending_before_it_starts_blocks_the_day():
+    request = ws.TimeOffRequest.from_dict({"date": "2025-10-06", "type": "partial",
+                                           "times": "10:00 PM - 02:00 AM"})
+    assert not request.full and request.start is None
+    assert request.times == ("10:00 PM", "02:00 AM")
+
+
+# ANCHOR AvailabilityIndex
+DAYS = [f"2025-10-{day:02d}" for day in range(6, 13)]  # one week, Monday to Sunday
+
+
+def _availability(rng):
+    kind = rng.random()
+    if kind < 0.15:
+        return ["off"]
+    if kind < 0.2:
+        return ["whenever", "5:00 PM"]
+    start = rng.randrange(0, ws.MINUTES_PER_DAY, 15)
+    end = ws.MINUTES_PER_DAY - 1 if kind < 0.35 else rng.randrange(0, ws.MINUTES_PER_DAY, 15)
+    return [ws.format_minutes(start), ws.format_minutes(end)]  # end before start now and then
+
+
+def _random_schedule(rng):
+    schedule = {}
+    for _ in range(rng.randint(5, 30)):
+        day = rng.choice(DAYS)
+        schedule.setdefault("2025-10", {}).setdefault(day, []).append(
+            {"employee_id": rng.choice(EMPLOYEES[:3]), "start": _time(rng, 15), "end": _time(rng, 15)})
+    return schedule
+
+
+def _free(data, emp, day_str, start, end):
+    """Whether emp could work start..end on day_str, straight from the stored data."""
+    end = _reaches(start, end)
+    day = ws.date_ordinal(day_str)
+    hours = ws.Employee.from_dict(emp).availability[(day - ws.date_ordinal(DAYS[0])) % 7]
+    if not hours:
+        return False
+    if not (hours[0] <= start and end <= (ws.MINUTES_PER_DAY if hours[1] == ws.MINUTES_PER_DAY - 1 else hours[1])):
+        return False
+    for request in _requests(emp, day):
+        if request.full or request.start is None or (start < request.end and request.start < end):
+            return False
+    for stored in data["schedule"].get("2025-10", {}).get(day_str, []):
+        shift = ws.Shift.from_dict(day_str, stored)
+        if shift.employee != emp["id"]:
+            continue
+        if not shift.valid or (start < _reaches(shift.start, shift.end) and shift.start < end):
+            return False
+    return True
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_free_matches_a_scan_and_shift_conflicts(seed):
+    rng = random.Random(seed)
+    employees = []
+    for emp_id in EMPLOYEES[:3]:
+        emp = {"id": emp_id, "name": f"Employee {emp_id}",
+               "availability": {day: _availability(rng) for day in ws.Employee.WEEKDAYS},
+               "requested_days_off": [_time_off_entry(rng) for _ in range(rng.randint(0, 4))]}
+        employees.append(emp)
+    data = {"employees": employees, "schedule": _random_schedule(rng), "settings": {}}
+    views = ws.ScheduleViews(data)
+
+    for step in range(300):
+        if step % 50 == 49:
+            # A save of some shifts, or of the employees, between queries
+            day = rng.choice(DAYS)
+            data["schedule"].setdefault("2025-10", {})[day] = _random_schedule(rng).get("2025-10", {}).get(day, [])
+            emp = rng.choice(employees)
+            emp["availability"][rng.choice(ws.Employee.WEEKDAYS)] = _availability(rng)
+            touched = [("schedule", "2025-10", day), ("employees",)]
+            views.model.invalidate(touched)
+            views.availability.invalidate(touched)
+        day_str = rng.choice(DAYS)
+        start = rng.randrange(0, ws.MINUTES_PER_DAY, 15)
+        # Mostly shift-length spans; an end at or before start runs to midnight
+        end = (start + rng.randrange(15, 6 * 60, 15)) % ws.MINUTES_PER_DAY if rng.random() < 0.7 \
+            else rng.randrange(0, ws.MINUTES_PER_DAY, 15)
+        free = [emp["id"] for emp in views.availability.free(data, day_str, start, end)]
+        assert free == [emp["id"] for emp in employees if _free(data, emp, day_str, start, end)]
+        if end > start:
+            for emp in employees:
+                conflicts, _ = ws.shift_conflicts(views, emp["id"], day_str, ws.format_minutes(start),
+                                                  ws.format_minutes(end))
+                assert (emp["id"] in free) == (not conflicts), conflicts
+
+
+# ANCHOR CoverageMatrix
+def _store_hours(rng):
+    if rng.random() < 0.15:
+        return None
+    opening = rng.randrange(5 * 60, 11 * 60, 15)
+    return [ws.format_minutes(opening), ws.format_minutes(rng.randrange(opening + 60, ws.MINUTES_PER_DAY, 15))]
+
+
+def _requirement_row(rng):
+    return [rng.choice([0, 0, 1, 2, 3, -1, "2"]) for _ in range(rng.randint(0, ws.COVERAGE_SLOTS + 4))]
+
+
+def _opening_hours(data, day_str):
+    """(opening, closing) minutes of day_str, or None when closed or unreadable."""
+    modification = data["store_modifications"].get(day_str, {})
+    if modification.get("type") == "closure":
+        return None
+    if modification.get("type") == "modified_hours":
+        hours = [modification["opening_time"], modification["closing_time"]]
+    else:
+        hours = data["store_hours"][ws.Employee.WEEKDAYS[(ws.date_ordinal(day_str) - ws.date_ordinal(DAYS[0])) % 7]]
+    try:
+        opening, closing = ws.parse_minutes(hours[0]), ws.parse_minutes(hours[1])
+    except (TypeError, ValueError):
+        return None
+    return (opening, closing) if closing > opening else None
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_coverage_matrix_matches_a_per_slot_count(seed):
+    rng = random.Random(seed)
+    data = {"employees": [], "schedule": _random_schedule(rng),
+            "store_hours": {day: _store_hours(rng) for day in ws.Employee.WEEKDAYS},
+            "store_modifications": {
+                DAYS[1]: {"type": "closure"},
+                DAYS[2]: {"type": "modified_hours", "opening_time": "10:10 AM", "closing_time": "03:50 PM"},
+                DAYS[3]: {"type": "modified_hours", "opening_time": "later", "closing_time": "05:00 PM"}},
+            "coverage_requirements": {
+                "weekly": {day: _requirement_row(rng) for day in ws.Employee.WEEKDAYS if rng.random() < 0.8},
+                "overrides": {rng.choice(DAYS): _requirement_row(rng)}}}
+    matrix = ws.CoverageMatrix(ws.ScheduleViews(data), DAYS)
+    width = ws.COVERAGE_SLOT_MINUTES
+
+    for row, day_str in enumerate(DAYS):
+        shifts = [ws.Shift.from_dict(day_str, s) for s in data["schedule"].get("2025-10", {}).get(day_str, [])]
+        headcount = [sum(1 for s in shifts if s.valid and s.start <= k * width and (k + 1) * width <= _reaches(s.start, s.end))
+                     for k in range(ws.COVERAGE_SLOTS)]
+        assert matrix.headcount[row] == headcount
+
+        wanted = data["coverage_requirements"]["overrides"].get(day_str)
+        if wanted is None:
+            day_name = ws.Employee.WEEKDAYS[row]
+            wanted = data["coverage_requirements"]["weekly"].get(day_name, [])
+        hours = _opening_hours(data, day_str)
+        required = [max(int(wanted[k]), 0) if hours and k < len(wanted)
+                    and hours[0] <= k * width and (k + 1) * width <= hours[1] else 0
+                    for k in range(ws.COVERAGE_SLOTS)]
+        assert matrix.required[row] == required
+        assert matrix.balance(row) == [have - need for have, need in zip(headcount, required)]
+
+        # runs() merges adjacent slots only while both numbers stay the same
+        short = [(k * width, (k + 1) * width, headcount[k], required[k])
+                 for k in range(ws.COVERAGE_SLOTS) if required[k] and headcount[k] != required[k]]
+        expanded = [(start, start + width, have, need) for start, end, have, need in matrix.runs(row)
+                    for start in range(start, end, width)]
+        assert expanded == short
+        runs = matrix.runs(row)
+        assert all(a[1] != b[0] or a[2:] != b[2:] for a, b in zip(runs, runs[1:]))
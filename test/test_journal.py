@@ -0,0 +1,94 @@
+import os
+
+from conftest import make_data, make_employee, ws
+
+DAY = "2025-10-06"
+
+
+def _saved(**settings):
+    """Journal-mode data whose snapshot is on disk."""
+    data = make_data([make_employee(1, "Alex Smith")], {"2025-10": {}}, storage_mode="journal", **settings)
+    ws.save_data(data)
+    assert ws.flush_data(5)
+    return data
+
+
+def _add_shift(data, day, start):
+    month = data["schedule"].setdefault(day[:7], {})
+    month.setdefault(day, []).append({"employee_id": 1, "start": start, "end": "05:00 PM"})
+    ws.save_data(data, [("schedule", day[:7], day)])
+    assert ws.flush_data(5)
+
+
+def _reload(monkeypatch):
+    """load_data() as a fresh start of the app would run it."""
+    monkeypatch.setattr(ws, "change_journal", ws.ChangeJournal(ws.JOURNAL_FILE))
+    data = ws.load_data()
+    compactor = ws.change_journal._compactor
+    if compactor is not None:
+        compactor.join(5)
+    return data
+
+
+def test_edits_are_journaled_and_replayed(store_dir, monkeypatch):
+    data = _saved()
+    _add_shift(data, DAY, "09:00 AM")
+    _add_shift(data, "2025-11-03", "10:00 AM")
+    data["schedule"]["2025-10"].pop(DAY)
+    ws.save_data(data, [("schedule", "2025-10", DAY)])
+    assert ws.flush_data(5)
+
+    assert DAY not in ws.read_json_file(ws.DATA_FILE)["schedule"]["2025-10"]
+    assert os.path.getsize(ws.JOURNAL_FILE) > 0
+    assert _reload(monkeypatch)["schedule"] == {"2025-10": {}, "2025-11": {"2025-11-03": data["schedule"]["2025-11"]["2025-11-03"]}}
+
+
+def test_torn_last_line_is_ignored(store_dir, monkeypatch):
+    data = _saved()
+    _add_shift(data, DAY, "09:00 AM")
+    with open(ws.JOURNAL_FILE, "a") as f:
+        f.write('{"seq":99,"op":"set","path":["schedule","2025-10","2025-10-07"],"val')
+
+    loaded = _reload(monkeypatch)
+    assert loaded["schedule"]["2025-10"] == {DAY: data["schedule"]["2025-10"][DAY]}
+    assert ws.change_journal.seq == 1
+
+
+def test_interrupted_compaction_is_finished_on_load(store_dir, monkeypatch):
+    data = _saved()
+    _add_shift(data, DAY, "09:00 AM")
+    # Crash right after the journal was moved aside for compaction...
+    os.replace(ws.JOURNAL_FILE, ws.change_journal.compacting_path)
+    # ...and after one more edit went to the fresh journal
+    _add_shift(data, "2025-10-07", "10:00 AM")
+
+    loaded = _reload(monkeypatch)
+    assert loaded["schedule"] == data["schedule"]
+    assert not os.path.exists(ws.change_journal.compacting_path)
+    snapshot = ws.read_json_file(ws.DATA_FILE)
+    assert snapshot["journal_seq"] == 1
+    assert snapshot["schedule"]["2025-10"] == {DAY: data["schedule"]["2025-10"][DAY]}
+    # The newer edit stays in the journal and still replays over the compacted snapshot
+    assert _reload(monkeypatch)["schedule"] == data["schedule"]
+
+
+def test_records_already_in_the_snapshot_are_not_replayed(store_dir, monkeypatch):
+    data = _saved()
+    _add_shift(data, DAY, "09:00 AM")
+    ws.save_data(data)  # a full save folds the journal into the snapshot
+    assert ws.flush_data(5)
+    assert not os.path.exists(ws.JOURNAL_FILE)
+    with open(ws.JOURNAL_FILE, "w") as f:
+        f.write('{"seq":1,"op":"del","path":["schedule","2025-10","%s"]}\n' % DAY)
+
+    assert _reload(monkeypatch)["schedule"]["2025-10"] == {DAY: data["schedule"]["2025-10"][DAY]}
+
+
+def test_compaction_past_the_size_limit(store_dir, monkeypatch):
+    data = _saved()
+    monkeypatch.setattr(ws.change_journal, "compact_bytes", 1)
+    _add_shift(data, DAY, "09:00 AM")
+    ws.change_journal._compactor.join(5)
+
+    assert not os.path.exists(ws.change_journal.compacting_path)
+    assert ws.read_json_file(ws.DATA_FILE)["schedule"] == data["schedule"]
@@ -0,0 +1,45 @@
+import calendar
+import multiprocessing
+import os
+import sys
+from datetime import date
+
+from conftest import ws
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "benchmarks"))
+
+from sample_data import generate_dataset  # noqa: E402
+
+
+def tight_month(employee_count=15):
+    """A month with barely enough staff, where the greedy pick leaves hours uneven."""
+    data = generate_dataset(years=1, employee_count=employee_count, shifts_per_day=0, start=date(2025, 10, 1))
+    data["settings"].update({"overtime_threshold": 40, "default_break_time": 30, "default_shift_length": 8})
+    days = [date(2025, 10, day).strftime(ws.DATE_FMT) for day in range(1, calendar.monthrange(2025, 10)[1] + 1)]
+    return data, days
+
+
+def test_multi_start_beats_greedy_on_a_tight_roster():
+    data, days = tight_month()
+    views = ws.ScheduleViews(ws.snapshot_for_audit(data, days))
+    greedy_score, _ = ws.schedule_candidate(views, days, 4, None)
+    optimizer = ws.ScheduleOptimizer(data, days, min_staff=4, seed=0, candidates=32, time_budget=600, workers=1)
+    best = optimizer.run()
+    assert optimizer.evaluated == 32
+    assert optimizer.best_index != 0
+    assert ws.proposal_score(views, best, days) < greedy_score
+
+
+def test_same_seed_gives_same_schedule():
+    data, days = tight_month()
+    first = ws.ScheduleOptimizer(data, days, min_staff=4, seed=7, candidates=8, time_budget=600, workers=1).run()
+    second = ws.ScheduleOptimizer(data, days, min_staff=4, seed=7, candidates=8, time_budget=600, workers=1).run()
+    assert first.shifts == second.shifts
+
+
+def test_pool_workers_are_stopped_at_the_time_budget():
+    data, days = tight_month(employee_count=60)
+    optimizer = ws.ScheduleOptimizer(data, days, min_staff=6, seed=0, candidates=64, time_budget=0.5, workers=2)
+    assert optimizer.run() is not None
+    assert optimizer.evaluated < 64
+    assert not multiprocessing.active_children()
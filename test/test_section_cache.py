@@ -0,0 +1,114 @@
+import json
+import random
+
+import pytest
+
+from conftest import make_data, make_employee, ws
+
+
+def _data():
+    alex = make_employee(1, "Zoë \"Z\" Smith")
+    alex["notes"] = "line one\nline two\ttabbed"
+    schedule = {"2025-09": {"2025-09-29": [{"employee_id": 1, "start": "09:00 AM", "end": "05:00 PM"}]},
+                "2025-10": {"2025-10-06": [], "2025-10-07": [{"employee_id": 1, "start": "10:00 AM",
+                                                              "end": "02:00 PM"}]},
+                "2025-11": {}}
+    data = make_data([alex], schedule, overtime_threshold=40)
+    data["store_modifications"] = {}
+    return data
+
+
+def _expected(data, compact):
+    if compact:
+        return json.dumps(data, separators=(",", ":"))
+    return json.dumps(data, indent=4)
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_output_matches_json_dumps(compact):
+    cache = ws.SectionCache()
+    data = _data()
+    assert cache.encode(data, compact) == _expected(data, compact)
+    assert cache.encode(data, compact) == _expected(data, compact)
+    assert cache.hits > 0
+    assert cache.encode({}, compact) == _expected({}, compact)
+    assert cache.encode({"schedule": {}}, compact) == _expected({"schedule": {}}, compact)
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_random_edits_with_their_touched_paths(compact):
+    rng = random.Random(5)
+    cache = ws.SectionCache()
+    data = _data()
+    cache.encode(data, compact)
+    for _ in range(300):
+        choice = rng.randrange(6)
+        month_key = f"2025-{rng.randint(8, 12):02d}"
+        day = f"{month_key}-{rng.randint(1, 28):02d}"
+        if choice == 0:
+            month = data["schedule"].setdefault(month_key, {})
+            month.setdefault(day, []).append({"employee_id": 1, "start": "09:00 AM", "end": "05:00 PM"})
+            touched = [("schedule", month_key, day)]
+        elif choice == 1:
+            found = data["schedule"].pop(month_key, None) is not None
+            touched = [("schedule", month_key)] if found else []
+        elif choice == 2:
+            data["employees"][0]["color"] = f"#{rng.randrange(16 ** 6):06x}"
+            touched = [("employees",)]
+        elif choice == 3:
+            data["settings"] = {"overtime_threshold": rng.randint(30, 50)}  # replaced outright
+            touched = []
+        elif choice == 4:
+            data["store_modifications"][day] = {"type": "closed", "reason": "Holiday"}
+            touched = [("store_modifications", day)]
+        else:
+            data["schedule"] = {key: dict(month) for key, month in data["schedule"].items()}
+            touched = [("schedule",)]
+        cache.invalidate(touched)
+        assert cache.encode(data, compact) == _expected(data, compact)
+    assert cache.hit_rate > 0.5
+
+
+def test_switching_layout_drops_the_cached_text():
+    cache = ws.SectionCache()
+    data = _data()
+    cache.encode(data, compact=False)
+    assert cache.encode(data, compact=True) == _expected(data, True)
+    assert cache.encode(data, compact=False) == _expected(data, False)
+
+
+@pytest.mark.parametrize("storage_format", ["pretty", "compact", "gzip"])
+def test_snapshots_read_back(store_dir, storage_format):
+    data = _data()
+    data["settings"]["storage_format"] = storage_format
+    ws.save_data(data)
+    assert ws.flush_data(5)
+    data["schedule"]["2025-10"]["2025-10-06"].append({"employee_id": 1, "start": "01:00 PM", "end": "03:00 PM"})
+    ws.save_data(data, [("schedule", "2025-10", "2025-10-06")])
+    assert ws.flush_data(5)
+
+    path = ws.snapshot_file_for(storage_format)
+    assert ws.read_json_file(path) == data
+    if storage_format != "gzip":
+        with open(path, "rb") as f:
+            assert f.read() == ws.encode_json(data, storage_format)
+
+
+def test_an_interrupted_snapshot_write_keeps_the_old_file(store_dir, monkeypatch):
+    data = _data()
+    ws.change_journal.write_snapshot(data)
+    before = ws.read_json_file(ws.DATA_FILE)
+    data["schedule"]["2025-10"]["2025-10-06"].append({"employee_id": 1, "start": "01:00 PM", "end": "03:00 PM"})
+
+    def crash(fd):
+        raise OSError("no space left on device")
+    with monkeypatch.context() as patch:
+        patch.setattr(ws.os, "fsync", crash)
+        with pytest.raises(OSError):
+            ws.change_journal.write_snapshot(data, [("schedule", "2025-10", "2025-10-06")])
+
+    assert ws.read_json_file(ws.DATA_FILE) == before
+    assert [p.name for p in store_dir.iterdir()] == [ws.DATA_FILE]
+    ws.change_journal.write_snapshot(data, [("schedule", "2025-10", "2025-10-06")])
+    with open(ws.DATA_FILE, "rb") as f:
+        assert f.read() == ws.encode_json(data)
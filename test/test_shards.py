@@ -0,0 +1,124 @@
+import json
+import os
+
+from conftest import make_data, make_employee, ws
+
+
+def _shift(start="09:00 AM"):
+    return {"employee_id": 1, "start": start, "end": "05:00 PM"}
+
+
+def _saved():
+    """Sharded data for three months, written to disk."""
+    schedule = {"2025-09": {"2025-09-29": [_shift()]},
+                "2025-10": {"2025-10-06": [_shift(), _shift("10:00 AM")], "2025-10-07": [_shift()]},
+                "2025-11": {"2025-11-03": [_shift()]}}
+    data = make_data([make_employee(1, "Alex Smith")], schedule, storage_mode="sharded")
+    ws.save_data(data)
+    assert ws.flush_data(5)
+    return data
+
+
+def _reload(monkeypatch):
+    monkeypatch.setattr(ws, "change_journal", ws.ChangeJournal(ws.JOURNAL_FILE))
+    monkeypatch.setattr(ws, "month_shards", ws.MonthShardStore(ws.SHARD_DIR))
+    return ws.load_data()
+
+
+def _written(monkeypatch):
+    """Record the paths _atomic_write is called with."""
+    paths = []
+    atomic_write = ws._atomic_write
+
+    def record(path, payload):
+        paths.append(os.path.relpath(path))
+        atomic_write(path, payload)
+    monkeypatch.setattr(ws, "_atomic_write", record)
+    return paths
+
+
+def test_months_are_split_into_shards(store_dir):
+    _saved()
+    with open(ws.month_shards.manifest_path) as f:
+        manifest = json.load(f)
+    assert manifest["months"] == {"2025-09": {"days": 1, "shifts": 1},
+                                  "2025-10": {"days": 2, "shifts": 3},
+                                  "2025-11": {"days": 1, "shifts": 1}}
+    assert "schedule" not in ws.read_json_file(ws.DATA_FILE)
+    assert ws.read_json_file(ws.month_shards.month_path("2025-10"))["2025-10-07"] == [_shift()]
+
+
+def test_months_load_on_first_access(store_dir, monkeypatch):
+    data = _saved()
+    schedule = _reload(monkeypatch)["schedule"]
+    assert isinstance(schedule, ws.LazySchedule)
+    assert schedule.loaded_months() == []
+    assert list(schedule) == ["2025-09", "2025-10", "2025-11"]
+    assert "2025-10" in schedule and len(schedule) == 3
+    assert schedule["2025-10"] == data["schedule"]["2025-10"]
+    assert schedule.loaded_months() == ["2025-10"]
+    assert schedule.get("2025-12") is None
+    assert schedule.copy() == data["schedule"]
+
+
+def test_touched_saves_rewrite_only_their_month(store_dir, monkeypatch):
+    _saved()
+    data = _reload(monkeypatch)
+    written = _written(monkeypatch)
+    data["schedule"]["2025-10"]["2025-10-06"].pop()
+    ws.save_data(data, [("schedule", "2025-10", "2025-10-06")])
+    assert ws.flush_data(5)
+
+    assert written == [os.path.join(ws.SHARD_DIR, "2025-10.json"), ws.month_shards.manifest_path]
+    assert data["schedule"].loaded_months() == ["2025-10"]
+    assert _reload(monkeypatch)["schedule"]["2025-10"]["2025-10-06"] == [_shift()]
+
+
+def test_removed_months_drop_their_shard(store_dir, monkeypatch):
+    _saved()
+    data = _reload(monkeypatch)
+    del data["schedule"]["2025-09"]
+    ws.save_data(data, [("schedule", "2025-09")])
+    assert ws.flush_data(5)
+
+    assert not os.path.exists(ws.month_shards.month_path("2025-09"))
+    assert list(_reload(monkeypatch)["schedule"]) == ["2025-10", "2025-11"]
+
+
+def test_a_damaged_shard_leaves_the_other_months(store_dir, monkeypatch, capsys):
+    data = _saved()
+    with open(ws.month_shards.month_path("2025-11"), "w") as f:
+        f.write('{"2025-11-03": [{"employee_id": 1, "sta')
+    # A temp file left by an interrupted write is not a month
+    with open(os.path.join(ws.SHARD_DIR, "2025-10.json.abc.tmp"), "w") as f:
+        f.write("{")
+
+    schedule = _reload(monkeypatch)["schedule"]
+    assert schedule["2025-11"] == {}
+    assert "Could not read schedule shard 2025-11" in capsys.readouterr().out
+    assert schedule["2025-10"] == data["schedule"]["2025-10"]
+
+
+def test_leaving_the_sharded_layout_folds_the_months_back(store_dir, monkeypatch):
+    data = _saved()
+    loaded = _reload(monkeypatch)
+    loaded["settings"]["storage_mode"] = "snapshot"
+    ws.save_data(loaded, [("settings",)])
+    assert ws.flush_data(5)
+
+    assert not os.path.exists(ws.SHARD_DIR)
+    assert ws.read_json_file(ws.DATA_FILE)["schedule"] == data["schedule"]
+
+
+def test_switching_to_sqlite_pulls_in_every_month(store_dir, monkeypatch):
+    data = _saved()
+    loaded = _reload(monkeypatch)
+    assert loaded["schedule"].store_mode == "sharded"
+    loaded["settings"]["storage_mode"] = "sqlite"
+    ws.save_data(loaded, [("settings",)])
+    assert ws.flush_data(5)
+
+    assert not isinstance(loaded["schedule"], ws.LazySchedule)
+    assert loaded["schedule"] == data["schedule"]
+    assert ws.sqlite_store.read_month("2025-09") == data["schedule"]["2025-09"]
+    ws.sqlite_store.detach()
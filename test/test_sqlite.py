@@ -0,0 +1,122 @@
+import os
+import sqlite3
+
+import pytest
+
+from conftest import make_data, make_employee, ws
+
+
+def _data():
+    alex = make_employee(1, "Alex Smith", time_off=[{"date": "2025-10-08", "type": "full"},
+                                                    {"date": "2025-10-09", "type": "partial",
+                                                     "times": "09:00 AM-12:00 PM", "note": "dentist"}])
+    alex["position"] = "Lead"
+    alex["phone"] = "555-0100"
+    sam = make_employee(2, "Sam Lee", days=("monday", "friday"))
+    schedule = {"2025-09": {"2025-09-29": [{"employee_id": 2, "start": "09:00 AM", "end": "05:00 PM"}]},
+                "2025-10": {"2025-10-06": [{"employee_id": 1, "start": "09:00 AM", "end": "05:00 PM"},
+                                           {"employee": "Former Hire", "start": "10:00 AM", "end": "02:00 PM"}],
+                            "2025-10-10": [{"employee_id": 2, "start": "12:00 PM", "end": "08:00 PM"}]}}
+    data = make_data([alex, sam], schedule, storage_mode="sqlite", overtime_threshold=40)
+    data["store_hours"]["sunday"] = None
+    data["store_modifications"] = {"2025-10-13": {"type": "closed", "reason": "Inventory",
+                                                  "added_date": "2025-10-01"},
+                                   "2025-10-24": {"type": "modified_hours", "opening_time": "10:00 AM",
+                                                  "closing_time": "04:00 PM", "added_date": "2025-10-01"}}
+    return data
+
+
+def _saved(data):
+    ws.save_data(data)
+    assert ws.flush_data(5)
+    return data
+
+
+def _reload(monkeypatch):
+    if ws.sqlite_store._conn is not None:
+        ws.sqlite_store._conn.close()
+    monkeypatch.setattr(ws, "sqlite_store", ws.SqliteStore(ws.DB_FILE))
+    monkeypatch.setattr(ws, "change_journal", ws.ChangeJournal(ws.JOURNAL_FILE))
+    monkeypatch.setattr(ws, "month_shards", ws.MonthShardStore(ws.SHARD_DIR))
+    return ws.load_data()
+
+
+def _plain(data):
+    return dict(data, schedule=data["schedule"].copy())
+
+
+def test_round_trip(store_dir, monkeypatch):
+    expected = _plain(_data())
+    _saved(_data())
+    loaded = _reload(monkeypatch)
+    assert isinstance(loaded["schedule"], ws.LazySchedule)
+    assert loaded["schedule"].loaded_months() == []
+    assert _plain(loaded) == expected
+
+
+def test_json_files_are_kept_as_a_backup(store_dir):
+    data = _data()
+    data["settings"]["storage_mode"] = "snapshot"
+    _saved(data)
+    data["settings"]["storage_mode"] = "sqlite"
+    _saved(data)
+
+    assert not os.path.exists(ws.DATA_FILE)
+    assert ws.read_json_file(ws.DATA_FILE + ".bak")["schedule"] == data["schedule"]
+
+
+def test_touched_saves_rewrite_only_their_rows(store_dir, monkeypatch):
+    _saved(_data())
+    data = _reload(monkeypatch)
+    data["schedule"]["2025-10"]["2025-10-10"].append({"employee_id": 1, "start": "01:00 PM", "end": "05:00 PM"})
+    data["store_modifications"].pop("2025-10-13")
+    data["employees"][1]["color"] = "#ff0000"
+    ws.save_data(data, [("schedule", "2025-10", "2025-10-10"), ("store_modifications", "2025-10-13"),
+                        ("employees",)])
+    assert ws.flush_data(5)
+
+    assert data["schedule"].loaded_months() == ["2025-10"]
+    expected = _plain(data)
+    assert _plain(_reload(monkeypatch)) == expected
+
+
+def test_a_failed_transaction_leaves_the_rows(store_dir, monkeypatch):
+    _saved(_data())
+    data = _reload(monkeypatch)
+    data["schedule"]["2025-10"].pop("2025-10-06")
+    data["employees"].pop()
+
+    def crash(*args, **kwargs):
+        raise sqlite3.OperationalError("disk I/O error")
+    with monkeypatch.context() as patch:
+        patch.setattr(ws.sqlite_store, "_write_schedule", crash)
+        with pytest.raises(sqlite3.OperationalError):
+            ws.sqlite_store.save(data, [("employees",), ("schedule", "2025-10", "2025-10-06")])
+
+    assert _plain(_reload(monkeypatch)) == _plain(_data())
+
+
+def test_indexed_queries_match_the_schedule(store_dir, monkeypatch):
+    _saved(_data())
+    _reload(monkeypatch)
+    store = ws.sqlite_store
+    assert store.indexes_ready()
+    assert store.employee_shift_days(2) == [("2025-09", "2025-09-29", 1), ("2025-10", "2025-10-10", 1)]
+    assert store.employee_shifts_on(1, ["2025-10-06", "2025-10-07"]) == [("2025-10-06", 0, "09:00 AM", "05:00 PM")]
+    assert set(store.month_shifts("2025-10")) == {(1, "2025-10-06", "09:00 AM", "05:00 PM"),
+                                                   (2, "2025-10-10", "12:00 PM", "08:00 PM"),
+                                                   ("Former Hire", "2025-10-06", "10:00 AM", "02:00 PM")}
+
+
+def test_leaving_sqlite_writes_a_snapshot(store_dir, monkeypatch):
+    expected = _plain(_data())
+    _saved(_data())
+    data = _reload(monkeypatch)
+    data["settings"]["storage_mode"] = "snapshot"
+    ws.save_data(data, [("settings",)])
+    assert ws.flush_data(5)
+
+    assert os.path.exists(ws.DB_FILE + ".bak") and not os.path.exists(ws.DB_FILE)
+    on_disk = ws.read_json_file(ws.DATA_FILE)
+    assert on_disk["schedule"] == expected["schedule"]
+    assert on_disk["employees"] == expected["employees"]
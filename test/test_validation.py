@@ -0,0 +1,56 @@
+from conftest import make_app, make_data, make_employee, ws
+
+MONDAY = "2025-10-06"
+
+
+def test_shift_is_checked_against_its_own_employee_when_names_repeat():
+    early = make_employee(1, "Alex Smith", hours=("6:00 AM", "12:00 PM"))
+    late = make_employee(2, "Alex Smith", hours=("12:00 PM", "10:00 PM"))
+    shift = {"employee_id": 2, "start": "02:00 PM", "end": "08:00 PM"}
+    data = make_data([early, late], {"2025-10": {MONDAY: [shift]}})
+    views = ws.ScheduleViews(data)
+
+    assert ws.stored_shift_conflicts(views, MONDAY, 0, shift) == []
+    found, _ = ws.shift_conflicts(views, 1, MONDAY, "02:00 PM", "08:00 PM")
+    assert [kind for kind, _ in found] == ["availability"]
+
+
+def test_batch_validation_resolves_employees_by_id():
+    first = make_employee(1, "Alex Smith", days=("tuesday",))
+    second = make_employee(2, "Alex Smith")
+    app = make_app(make_data([first, second]))
+
+    records = app.validate_shifts_batch([{"employee_id": 2, "start": "09:00 AM", "end": "05:00 PM"}], [MONDAY])
+    assert records == []
+
+
+def test_unmatched_legacy_shift_reports_missing_employee():
+    data = make_data([make_employee(1, "Alex Smith")])
+    found, interval = ws.shift_conflicts(ws.ScheduleViews(data), "Gone Person", MONDAY, "09:00 AM", "10:00 AM")
+    assert found == [("employee", "Employee not found")] and interval is None
+
+
+def test_batch_overtime_counts_earlier_batch_shifts_in_the_same_week():
+    app = make_app(make_data([make_employee(1, "Alex Smith")], overtime_threshold=40, default_break_time=0))
+    shift = {"employee_id": 1, "start": "08:00 AM", "end": "05:00 PM"}  # 9 paid hours
+    week = ["2025-10-06", "2025-10-07", "2025-10-08", "2025-10-09", "2025-10-10"]
+
+    records = app.validate_shifts_batch([shift], week)
+    # 36 hours after four days is fine; the fifth day makes 45
+    assert [(r.day, r.kind) for r in records] == [("2025-10-10", "overtime")]
+    assert "45.0 hours" in records[0].message
+
+
+def test_batch_overtime_resets_each_iso_week():
+    app = make_app(make_data([make_employee(1, "Alex Smith")], overtime_threshold=40, default_break_time=0))
+    proposal = {day: [{"employee_id": 1, "start": "08:00 AM", "end": "05:00 PM"}]
+                for day in ["2025-10-09", "2025-10-10", "2025-10-11", "2025-10-13", "2025-10-14"]}
+    assert app.validate_shifts_batch(proposal) == []
+
+
+def test_regular_store_hours_do_not_flag_shifts():
+    # Only closures and modified hours on the date limit a shift, as before the conflict set
+    data = make_data([make_employee(1, "Alex Smith", hours=("6:00 AM", "11:00 PM"))])
+    data["store_hours"]["monday"] = None
+    found, _ = ws.shift_conflicts(ws.ScheduleViews(data), 1, MONDAY, "07:00 AM", "10:00 PM")
+    assert found == []
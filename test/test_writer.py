@@ -0,0 +1,92 @@
+import json
+import time
+
+import pytest
+
+from conftest import make_data, make_employee, ws
+
+DAY = "2025-10-06"
+
+
+def _data():
+    shift = {"employee_id": 1, "start": "09:00 AM", "end": "05:00 PM"}
+    return make_data([make_employee(1, "Alex Smith")],
+                     {"2025-09": {"2025-09-30": [dict(shift)]}, "2025-10": {DAY: [dict(shift)]}})
+
+
+def _on_disk():
+    with open(ws.DATA_FILE) as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def verified(store_dir, monkeypatch):
+    monkeypatch.setattr(ws.data_writer, "verify", True)
+    return ws.data_writer
+
+
+@pytest.mark.parametrize("edit, touched", [
+    (lambda d: d["schedule"]["2025-10"][DAY].append({"employee_id": 1, "start": "06:00 PM", "end": "07:00 PM"}),
+     [("schedule", "2025-10", DAY)]),
+    (lambda d: d["schedule"]["2025-10"].pop(DAY), [("schedule", "2025-10", DAY)]),
+    (lambda d: d["schedule"].__setitem__("2025-11", {"2025-11-03": []}), [("schedule", "2025-11")]),
+    (lambda d: d["employees"][0].__setitem__("color", "#ff0000"), [("employees",)]),
+    (lambda d: d.__setitem__("settings", {"overtime_threshold": 30}), [("settings",)]),
+    (lambda d: d["schedule"].clear(), [("schedule",)]),
+])
+def test_touched_paths_reach_the_disk(verified, edit, touched):
+    data = _data()
+    ws.save_data(data)
+    edit(data)
+    ws.save_data(data, touched=touched)
+    assert ws.flush_data(10)
+    assert verified.stale_paths == []
+    assert {k: v for k, v in _on_disk().items() if k != "journal_seq"} == data
+
+
+def test_verify_catches_an_under_reported_save(verified):
+    data = _data()
+    ws.save_data(data)
+    data["schedule"]["2025-09"]["2025-09-30"][0]["end"] = "06:00 PM"
+    ws.save_data(data, touched=[("schedule", "2025-10", DAY)])  # wrong day
+    assert ws.flush_data(10)
+    assert verified.stale_paths == [("schedule", "2025-09", "2025-09-30")]
+    assert _on_disk()["schedule"]["2025-09"]["2025-09-30"][0]["end"] == "06:00 PM"
+
+
+def test_edits_after_submit_are_not_written(store_dir):
+    data = _data()
+    ws.save_data(data)
+    data["schedule"]["2025-10"][DAY][0]["end"] = "04:00 PM"
+    ws.save_data(data, touched=[("schedule", "2025-10", DAY)])
+    data["schedule"]["2025-10"][DAY][0]["end"] = "11:00 PM"  # not saved
+    assert ws.flush_data(10)
+    assert _on_disk()["schedule"]["2025-10"][DAY][0]["end"] == "04:00 PM"
+
+
+def test_failing_writes_are_retried_then_abandoned():
+    calls = []
+
+    def fail(data, touched):
+        calls.append(touched)
+        raise OSError("disk full")
+
+    writer = ws.BackgroundWriter(fail, interval_ms=10, retries=2)
+    writer.submit({"settings": {}}, [("settings",)])
+    started = time.monotonic()
+    assert writer.flush(5) is False
+    assert time.monotonic() - started < 2
+    assert len(calls) == 3 and isinstance(writer.last_error, OSError)
+    # The next edit retries everything and clears the error
+    writer.write_func = lambda data, touched: calls.append(touched)
+    writer.submit({"settings": {"a": 1}}, [("settings",)])
+    assert writer.flush(5) and writer.last_error is None and calls[-1] is None
+
+
+def test_new_data_file_is_written_atomically(store_dir, monkeypatch):
+    written = []
+    real = ws._atomic_write
+    monkeypatch.setattr(ws, "_atomic_write", lambda path, payload: (written.append(path), real(path, payload)))
+    ws.ensure_data_file()
+    assert written == [ws.DATA_FILE]
+    assert _on_disk()["schema_version"] == ws.SCHEMA_VERSION